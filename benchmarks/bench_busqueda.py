@@ -0,0 +1,92 @@
+# ==========================================
+# BENCHMARK: BUSCADOR DE COLABORADORES
+# ==========================================
+# Antes: en cada recarga se armaba la lista completa "dni - nombre" para el selectbox de Consulta
+# (y viajaba entera al navegador) y la Nómina hacía str.contains sobre tres columnas.
+# Ahora: mod_busqueda.IndiceBusqueda se arma una vez por versión de PERSONAL y cada búsqueda
+# devuelve solo las mejores coincidencias. La Nómina filtra igual que antes (contiene, orden de la pestaña)
+# sobre los textos ya preparados del índice; se comprueba que devuelva las mismas filas.
+#
+# Uso:  python benchmarks/bench_busqueda.py [--personas 10000] [--busquedas 200]
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+
+import mod_busqueda
+
+APELLIDOS = ["GARCÍA", "RODRÍGUEZ", "QUISPE", "FLORES", "HUAMÁN", "SÁNCHEZ", "RAMÍREZ", "TORRES", "MENDOZA",
+             "CHÁVEZ", "GONZÁLEZ", "NÚÑEZ", "VARGAS", "CASTILLO", "ROJAS", "MAMANI", "ESPINOZA", "LÓPEZ"]
+NOMBRES = ["José", "María", "Luis", "Rosa", "Juan", "Ana", "Carlos", "Lucía", "Jorge", "Carmen", "Víctor", "Elena"]
+
+
+def personal_sintetico(n):
+    r = random.Random(7)
+    return pd.DataFrame({
+        "dni": [f"{r.randint(10000000, 79999999)}" for _ in range(n)],
+        "apellidos": [f"{r.choice(APELLIDOS)} {r.choice(APELLIDOS)}" for _ in range(n)],
+        "nombres": [f"{r.choice(NOMBRES)} {r.choice(NOMBRES)}" for _ in range(n)],
+    })
+
+
+def recarga_antigua(df, busqueda):
+    """Lista del selectbox de Consulta + filtro str.contains de la Nómina."""
+    dni_str = df["dni"].astype(str).str.strip()
+    nom_str = (df["apellidos"].fillna("").astype(str).str.strip() + " " + df["nombres"].fillna("").astype(str).str.strip()).str.strip()
+    opciones = [""] + [x for x in (dni_str + " - " + nom_str).tolist() if x != " - "]
+    b = busqueda.lower()
+    mask = (df["apellidos"].fillna("").astype(str).str.lower().str.contains(b, na=False)
+            | df["nombres"].fillna("").astype(str).str.lower().str.contains(b, na=False)
+            | dni_str.str.contains(b, na=False))
+    return opciones, df[mask]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--personas", type=int, default=10000)
+    parser.add_argument("--busquedas", type=int, default=200)
+    args = parser.parse_args()
+
+    df = personal_sintetico(args.personas)
+    r = random.Random(3)
+    consultas = [r.choice([df["dni"].iloc[r.randrange(len(df))][:4], "garc", "gonzales", "nunez jose", "quispe maria"])
+                 for _ in range(args.busquedas)]
+
+    t0 = time.perf_counter()
+    for q in consultas:
+        recarga_antigua(df, q)
+    t_antiguo = (time.perf_counter() - t0) / args.busquedas
+
+    t0 = time.perf_counter()
+    indice = mod_busqueda.IndiceBusqueda.desde_personal(df)
+    t_armado = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    for q in consultas:
+        indice.buscar(q)
+    t_nuevo = (time.perf_counter() - t0) / args.busquedas
+
+    t0 = time.perf_counter()
+    for q in consultas:
+        indice.contiene(q)
+    t_nomina = (time.perf_counter() - t0) / args.busquedas
+    mismas = all(indice.contiene(q) == [df.index.get_loc(i) for i in recarga_antigua(df, q)[1].index] for q in set(consultas))
+
+    print(f"{args.personas} personas, {args.busquedas} búsquedas")
+    print(f"{'método':<44}{'ms por recarga':>16}")
+    print(f"{'lista completa + str.contains':<44}{t_antiguo * 1000:>16.2f}")
+    print(f"{'índice (top ' + str(mod_busqueda.LIMITE_RESULTADOS) + ')':<44}{t_nuevo * 1000:>16.2f}")
+    print(f"{'Nómina: contiene sobre el índice':<44}{t_nomina * 1000:>16.2f}")
+    print(f"armado del índice (una vez por versión): {t_armado * 1000:.0f} ms | "
+          f"opciones enviadas al navegador: {args.personas + 1} -> {mod_busqueda.LIMITE_RESULTADOS}")
+    print(f"Nómina con las mismas filas y orden que str.contains: {mismas}")
+    print("ejemplo 'gonzales':", [indice.etiqueta(i) for i in indice.buscar("gonzales", limite=3)])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+# ==========================================
+# BENCHMARK: CARGA DEL LIBRO (BUCLE POR HOJA vs BATCH)
+# ==========================================
+# Compara el bucle antiguo de load_data() (una llamada get_all_records() por pestaña
+# + pausa de 0.6 s) contra mod_datos.cargar_libro_batch(), usando un doble local de
+# gspread que simula la latencia de red de cada petición HTTP.
+#
+# Uso:  python benchmarks/bench_carga_libro.py [--hojas 16] [--filas 400] [--latencia 0.25]
+import argparse
+import os
+import sys
+import time
+from collections import Counter
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+from gspread.utils import numericise_all
+
+import mod_datos
+
+
+class HojaLocal:
+    """Doble de gspread.Worksheet: guarda la matriz en memoria y cobra latencia por llamada."""
+
+    def __init__(self, libro, title, valores):
+        self.libro = libro
+        self.title = title
+        self.valores = valores
+
+    def get_all_records(self):
+        self.libro.peticion()
+        if not self.valores:
+            return []
+        ancho = max(len(f) for f in self.valores)
+        filas = [list(f) + [""] * (ancho - len(f)) for f in self.valores]
+        claves = filas[0]
+        if [c for c, n in Counter(claves).items() if n > 1]:
+            raise Exception("the header row in the worksheet contains duplicates")
+        return [dict(zip(claves, numericise_all(f, default_blank=""))) for f in filas[1:]]
+
+
+class LibroLocal:
+    """Doble de gspread.Spreadsheet con worksheets() y values_batch_get()."""
+
+    def __init__(self, hojas, latencia):
+        self.latencia = latencia
+        self.peticiones = 0
+        self._hojas = [HojaLocal(self, t, v) for t, v in hojas.items()]
+
+    def peticion(self):
+        self.peticiones += 1
+        time.sleep(self.latencia)
+
+    def worksheets(self):
+        self.peticion()
+        return list(self._hojas)
+
+    def values_batch_get(self, ranges, params=None):
+        self.peticion()
+        por_rango = {mod_datos.rango_hoja(h.title): h for h in self._hojas}
+        return {"valueRanges": [{"range": r, "values": [list(f) for f in por_rango[r].valores]} for r in ranges]}
+
+
+def libro_sintetico(n_hojas, n_filas):
+    hojas = {
+        "CONTRATOS": [["ID", "DNI", "Cargo", "F_Inicio", "F_Fin", "Tipo Contrato", "Estado"]] + [
+            [str(i), str(40000000 + i), "Docente", "2023-03-01", "2024-02-28", "Planilla completo", "ACTIVO"]
+            for i in range(n_filas)],
+        "DATOS GENERALES": [["DNI", "Sede", "Sexo", "Fecha de Nacimiento"]] + [
+            [str(40000000 + i), "Local Giraldez", "Femenino", f"{1 + i % 28:02d}/0{1 + i % 9}/19{60 + i % 40}"]
+            for i in range(n_filas)],
+    }
+    for k in range(n_hojas - len(hojas)):
+        hojas[f"HOJA_{k:02d}"] = [["DNI", "Periodo", "Detalle", "Link"]] + [
+            [str(40000000 + i), "2024-2025", f"registro {i}", ""] for i in range(n_filas)]
+    return hojas
+
+
+def cargar_bucle_antiguo(spreadsheet, pausa):
+    """Réplica del load_data() original: una petición por pestaña y pausa fija antes de cada una."""
+    dfs = {}
+    for worksheet in spreadsheet.worksheets():
+        try:
+            time.sleep(pausa)
+            df = pd.DataFrame(worksheet.get_all_records())
+            dfs[worksheet.title] = mod_datos.normalizar_hoja(worksheet.title, df)
+        except Exception:
+            dfs[worksheet.title] = pd.DataFrame()
+            time.sleep(2)
+    return dfs
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--hojas", type=int, default=16)
+    parser.add_argument("--filas", type=int, default=400)
+    parser.add_argument("--latencia", type=float, default=0.25, help="segundos por petición HTTP simulada")
+    parser.add_argument("--pausa", type=float, default=0.6, help="pausa fija del bucle antiguo")
+    args = parser.parse_args()
+
+    hojas = libro_sintetico(args.hojas, args.filas)
+
+    libro = LibroLocal(hojas, args.latencia)
+    t0 = time.perf_counter()
+    antiguo = cargar_bucle_antiguo(libro, args.pausa)
+    t_antiguo, p_antiguo = time.perf_counter() - t0, libro.peticiones
+
+    libro = LibroLocal(hojas, args.latencia)
+    t0 = time.perf_counter()
+    nuevo, errores = mod_datos.cargar_libro_batch(libro)
+    t_nuevo, p_nuevo = time.perf_counter() - t0, libro.peticiones
+
+    iguales = all(antiguo[t].equals(nuevo[t]) for t in antiguo) and not errores
+
+    print(f"{args.hojas} pestañas x {args.filas} filas, latencia simulada {args.latencia:.2f} s/petición")
+    print(f"{'método':<28}{'peticiones':>12}{'segundos':>12}")
+    print(f"{'bucle get_all_records':<28}{p_antiguo:>12}{t_antiguo:>12.2f}")
+    print(f"{'values_batch_get':<28}{p_nuevo:>12}{t_nuevo:>12.2f}")
+    print(f"aceleración: x{t_antiguo / t_nuevo:.1f} | resultados idénticos: {iguales}")
+
+
+if __name__ == "__main__":
+    main()
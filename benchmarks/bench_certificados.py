@@ -0,0 +1,65 @@
+# ==========================================
+# BENCHMARK: CERTIFICADOS EN LOTE
+# ==========================================
+# Antes: un certificado a la vez desde Consulta (gen_word con la fusión de contratos de esa persona).
+# Ahora: mod_certificados.lote_zip() reparte los documentos en tandas entre procesos de trabajo
+# y los escribe en un ZIP a medida que terminan. Compara el lote en un solo proceso con el lote en paralelo.
+#
+# Uso:  python benchmarks/bench_certificados.py [--personas 300] [--procesos 4]
+import argparse
+import os
+import random
+import sys
+import time
+import zipfile
+from io import BytesIO
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+
+import mod_certificados
+
+
+def libro_sintetico(personas):
+    r = random.Random(9)
+    personal, contratos = [], []
+    for p in range(personas):
+        dni = f"{40000000 + p:08d}"
+        personal.append({"dni": dni, "apellidos y nombres": f"APELLIDO{p} NOMBRE{p}"})
+        inicio = pd.Timestamp("2015-01-01") + pd.Timedelta(days=r.randint(0, 1500))
+        for _ in range(r.randint(1, 5)):
+            fin = inicio + pd.Timedelta(days=r.randint(90, 700))
+            contratos.append({"dni": dni, "f_inicio": inicio, "f_fin": fin, "cargo": "ANALISTA",
+                              "tipo contrato": r.choice(["Planilla", "Locación"]),
+                              "tipo de trabajador": r.choice(["Administrativo", "Docente"])})
+            inicio = fin + pd.Timedelta(days=r.choice([1, 1, 30]))
+    return {"PERSONAL": pd.DataFrame(personal), "CONTRATOS": pd.DataFrame(contratos)}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--personas", type=int, default=300)
+    parser.add_argument("--procesos", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    dfs = libro_sintetico(args.personas)
+    tareas = mod_certificados.tareas_lote(dfs, mod_certificados.cohorte(dfs))
+
+    tiempos = {}
+    for procesos in sorted({1, args.procesos}):
+        destino = BytesIO()
+        t0 = time.perf_counter()
+        mod_certificados.lote_zip(tareas, destino, procesos=procesos)
+        tiempos[procesos] = time.perf_counter() - t0
+        with zipfile.ZipFile(destino) as zf:
+            documentos = len(zf.namelist())
+
+    print(f"{len(tareas)} certificados ({documentos} en el ZIP), {os.cpu_count()} CPU disponibles")
+    print(f"{'procesos':<12}{'tiempo':>10}{'docs/s':>10}")
+    for procesos, t in tiempos.items():
+        print(f"{procesos:<12}{t:>8.2f} s{len(tareas) / t:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+# ==========================================
+# BENCHMARK: VISTA CONTRATO VIGENTE
+# ==========================================
+# Antes: Reporte General y Vencimientos ordenaban CONTRATOS y tomaban el último por DNI en cada recarga
+# (y Vacaciones lo hacía por posición en la pestaña).
+# Ahora: mod_contratos.construir_vigente() una vez por versión y, al guardar, actualizar_vigente()
+# rearma solo los DNI cuyas filas cambiaron.
+#
+# Uso:  python benchmarks/bench_contrato_vigente.py [--contratos 100000] [--personas 30000]
+import argparse
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+
+import mod_contratos
+import mod_esquema
+
+
+def pestanas_sinteticas(contratos, personas):
+    r = np.random.default_rng(0)
+    dnis = np.char.zfill(r.integers(0, personas, contratos).astype(str), 8)
+    fin = pd.Series(pd.Timestamp("2015-01-01") + pd.to_timedelta(r.integers(0, 4000, contratos), unit="D")).dt.strftime("%Y-%m-%d")
+    fin[r.random(contratos) < 0.05] = ""
+    c = pd.DataFrame({"dni": dnis, "cargo": r.choice(["ANALISTA", "DOCENTE", "ASISTENTE"], contratos), "f_fin": fin,
+                      "area": r.choice(["TI", "RRHH", "ACADEMICO"], contratos), "estado": "ACTIVO"})
+    g = pd.DataFrame({"dni": np.char.zfill(np.arange(personas).astype(str), 8),
+                      "sede": r.choice(["Local Giraldez", "Local Lince"], personas), "sexo": "F", "estado civil": "SOLTERO"})
+    return c, g
+
+
+def ultimo_antiguo(c):
+    """Lo que hacía cada reporte en cada recarga (con f_fin ya tipada)."""
+    return c.assign(f_fin_dt=mod_esquema.parsear_fechas(c["f_fin"])).sort_values("f_fin_dt").groupby("dni").tail(1)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--contratos", type=int, default=100_000)
+    parser.add_argument("--personas", type=int, default=30_000)
+    args = parser.parse_args()
+    c, g = pestanas_sinteticas(args.contratos, args.personas)
+
+    t0 = time.perf_counter()
+    ultimo_antiguo(c)
+    t_antiguo = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    vista = mod_contratos.construir_vigente(c, g)
+    t_vista = time.perf_counter() - t0
+
+    nuevo = pd.concat([c, c.iloc[:5].assign(cargo="RENOVADO", f_fin="2031-01-01")], ignore_index=True)
+    t0 = time.perf_counter()
+    agregado = mod_contratos.actualizar_vigente(vista, (c, g), (nuevo, g))
+    t_agregar = time.perf_counter() - t0
+
+    editado = c.copy()
+    editado.loc[10, "cargo"] = "EDITADO"
+    t0 = time.perf_counter()
+    corregido = mod_contratos.actualizar_vigente(vista, (c, g), (editado, g))
+    t_editar = time.perf_counter() - t0
+
+    iguales = (agregado.equals(mod_contratos.construir_vigente(nuevo, g))
+               and corregido.equals(mod_contratos.construir_vigente(editado, g)))
+    print(f"{len(c)} contratos de {args.personas} personas -> {int(vista['tiene_contrato'].sum())} vigentes")
+    print(f"{'operación':<48}{'tiempo':>10}")
+    print(f"{'último contrato por reporte y recarga (antes)':<48}{t_antiguo * 1000:>7.0f} ms")
+    print(f"{'vista completa (una vez por versión)':<48}{t_vista * 1000:>7.0f} ms")
+    print(f"{'guardado con 5 contratos nuevos':<48}{t_agregar * 1000:>7.0f} ms")
+    print(f"{'guardado con una fila corregida':<48}{t_editar * 1000:>7.0f} ms")
+    print(f"incremental igual a recalcular todo: {iguales}")
+
+
+if __name__ == "__main__":
+    main()
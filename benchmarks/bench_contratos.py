@@ -0,0 +1,98 @@
+# ==========================================
+# BENCHMARK: CONTRATOS CONSOLIDADOS
+# ==========================================
+# Antes: get_consolidated_contracts fusionaba con iterrows() los contratos de una persona cada vez
+# que se abría su ficha o se generaba su certificado.
+# Ahora: mod_contratos.consolidar() fusiona los de todos los DNI de una vez (máximo acumulado por DNI)
+# y la vista CONTRATOS_CONSOLIDADOS entrega los tramos de un DNI por búsqueda binaria.
+#
+# Uso:  python benchmarks/bench_contratos.py [--personas 10000] [--contratos-por-persona 4] [--fichas 200]
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+
+import mod_contratos
+
+
+def contratos_sinteticos(personas, por_persona):
+    """Renovaciones encadenadas (a veces con huecos, a veces sin fecha de fin) por persona."""
+    r = random.Random(5)
+    filas = []
+    for p in range(personas):
+        dni = f"{40000000 + p:08d}"
+        inicio = pd.Timestamp("2012-01-01") + pd.Timedelta(days=r.randint(0, 2000))
+        for c in range(por_persona):
+            fin = inicio + pd.Timedelta(days=r.randint(90, 720))
+            sin_fin = r.random() < 0.08
+            filas.append({"dni": dni, "f_inicio": inicio, "f_fin": pd.NaT if sin_fin else fin,
+                          "cargo": f"CARGO {c}", "tipo contrato": r.choice(["Planilla", "Locación"])})
+            inicio = fin + pd.Timedelta(days=1 if r.random() < 0.7 else r.randint(2, 200))
+    df = pd.DataFrame(filas)
+    return df.sample(frac=1, random_state=3).reset_index(drop=True)
+
+
+def consolidacion_antigua(df_c):
+    """get_consolidated_contracts tal como estaba (orden estable para que los empates sean comparables)."""
+    if df_c.empty: return df_c
+    df_c = df_c.copy()
+    df_c['f_inicio'] = pd.to_datetime(df_c['f_inicio'], errors='coerce')
+    df_c['f_fin'] = pd.to_datetime(df_c['f_fin'], errors='coerce')
+    df_c = df_c.sort_values('f_inicio', kind="stable").dropna(subset=['f_inicio'])
+    merged = []
+    for _, row in df_c.iterrows():
+        if not merged:
+            merged.append(row.to_dict())
+        else:
+            last = merged[-1]
+            if pd.notnull(last['f_fin']) and row['f_inicio'] <= last['f_fin'] + pd.Timedelta(days=1):
+                last['f_fin'] = max(last['f_fin'], row['f_fin']) if pd.notnull(row['f_fin']) else row['f_fin']
+                last['cargo'] = row['cargo']
+            else:
+                merged.append(row.to_dict())
+    return pd.DataFrame(merged)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--personas", type=int, default=10000)
+    parser.add_argument("--contratos-por-persona", type=int, default=4)
+    parser.add_argument("--fichas", type=int, default=200)
+    args = parser.parse_args()
+
+    df = contratos_sinteticos(args.personas, args.contratos_por_persona)
+    buscados = random.Random(1).sample(sorted(set(df["dni"])), args.fichas)
+    por_dni = dict(tuple(df.groupby("dni")))
+
+    t0 = time.perf_counter()
+    antiguos = {dni: consolidacion_antigua(por_dni[dni]) for dni in buscados}
+    t_ficha_antigua = (time.perf_counter() - t0) / args.fichas
+
+    t0 = time.perf_counter()
+    vista = mod_contratos.VistaConsolidada(mod_contratos.consolidar(df))
+    t_vista = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    nuevos = {dni: vista.de(dni) for dni in buscados}
+    t_ficha_nueva = (time.perf_counter() - t0) / args.fichas
+
+    cols = ["dni", "f_inicio", "f_fin", "cargo"]
+    iguales = all(antiguos[d][cols].astype(str).reset_index(drop=True).equals(nuevos[d][cols].astype(str).reset_index(drop=True))
+                  for d in buscados)
+
+    print(f"{len(df)} contratos de {args.personas} personas -> {len(vista)} tramos")
+    print(f"{'operación':<46}{'tiempo':>12}")
+    print(f"{'fusión con iterrows (una ficha)':<46}{t_ficha_antigua * 1000:>9.2f} ms")
+    print(f"{'  ... para toda la pestaña (estimado)':<46}{t_ficha_antigua * args.personas:>10.1f} s")
+    print(f"{'consolidar() toda la pestaña':<46}{t_vista * 1000:>9.0f} ms")
+    print(f"{'tramos de una ficha desde la vista':<46}{t_ficha_nueva * 1e6:>9.1f} µs")
+    print(f"mismos tramos que antes: {iguales}")
+
+
+if __name__ == "__main__":
+    main()
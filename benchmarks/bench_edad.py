@@ -0,0 +1,83 @@
+# ==========================================
+# BENCHMARK: EDAD FILA POR FILA vs MOTOR VECTORIZADO
+# ==========================================
+# Compara el antiguo df[col].apply(calcular_edad_viva) de la carga de pestañas
+# (pd.to_datetime + try/except por cada fila) contra mod_edad.edades(),
+# que parsea la columna una vez y calcula todas las edades con aritmética de arreglos.
+#
+# Uso:  python benchmarks/bench_edad.py [--filas 50000]
+import argparse
+import os
+import sys
+import time
+import warnings
+from datetime import date
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+
+import mod_edad
+
+
+def calcular_edad_viva(fecha_str):
+    """Réplica de la función fila por fila que usaba normalizar_hoja()."""
+    if pd.isna(fecha_str) or str(fecha_str).strip() == "": return 0
+    try:
+        if isinstance(fecha_str, str):
+            fnac_date = pd.to_datetime(fecha_str, dayfirst=True).date()
+        else:
+            fnac_date = fecha_str.date() if hasattr(fecha_str, 'date') else fecha_str
+        hoy = date.today()
+        return hoy.year - fnac_date.year - ((hoy.month, hoy.day) < (fnac_date.month, fnac_date.day))
+    except:
+        return 0
+
+
+def columna_sintetica(n):
+    """Fechas de nacimiento como llegan de Sheets: dd/mm/aaaa, ISO, vacías y texto suelto."""
+    valores = []
+    for i in range(n):
+        if i % 40 == 0:
+            valores.append("")
+        elif i % 97 == 0:
+            valores.append("NO REGISTRA")
+        elif i % 3 == 0:
+            valores.append(f"19{60 + i % 40}-{1 + i % 12:02d}-{1 + i % 28:02d}")
+        else:
+            valores.append(f"{1 + i % 28:02d}/{1 + i % 12:02d}/19{60 + i % 40}")
+    return pd.Series(valores)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--filas", type=int, default=50000)
+    args = parser.parse_args()
+
+    fechas = columna_sintetica(args.filas)
+
+    t0 = time.perf_counter()
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        antiguo = fechas.apply(calcular_edad_viva)
+    t_antiguo = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    nuevo = mod_edad.edades(fechas)
+    t_nuevo = time.perf_counter() - t0
+
+    print(f"{args.filas} fechas de nacimiento")
+    print(f"{'método':<30}{'segundos':>10}")
+    print(f"{'apply(calcular_edad_viva)':<30}{t_antiguo:>10.3f}")
+    print(f"{'mod_edad.edades':<30}{t_nuevo:>10.3f}")
+    # dayfirst=True también invertía las fechas ISO con día <= 12 (1999-04-12 => 4 de diciembre):
+    # ahí el motor nuevo corrige la edad; en el resto ambos deben coincidir
+    iso = fechas.str.match(r"\d{4}-")
+    distintas = antiguo.astype(int) != nuevo
+    print(f"aceleración: x{t_antiguo / t_nuevo:.0f} | "
+          f"distintas fuera de ISO: {int((distintas & ~iso).sum())} | "
+          f"ISO corregidas: {int((distintas & iso).sum())}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+# ==========================================
+# BENCHMARK: CONVERSIONES REPETIDAS vs VISTA TIPADA EN CACHÉ
+# ==========================================
+# Antes, cada recarga de los reportes volvía a convertir las mismas columnas de texto:
+# pd.to_datetime(f_fin) en Reporte General y dos veces en Vencimientos, la fecha de nacimiento
+# en Cumpleaños y la limpieza de DNI + to_numeric/to_datetime en Vacaciones.
+# Ahora mod_esquema las convierte una vez por versión de la pestaña (CacheHojas.tipada)
+# y las recargas siguientes solo copian la vista ya tipada.
+#
+# Uso:  python benchmarks/bench_esquema.py [--filas 50000] [--recargas 20]
+import argparse
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+
+import mod_cache_hojas
+
+
+class OrigenLocal:
+    """Doble de CacheDisco: entrega las pestañas ya normalizadas, sin red ni disco."""
+
+    def __init__(self, dfs):
+        self.dfs = dfs
+
+    def titulos(self):
+        return list(self.dfs)
+
+    def cargar(self, titulos):
+        return {t: self.dfs[t] for t in titulos}, {}
+
+    def vencida(self):
+        return False
+
+    def revalidar_en_segundo_plano(self):
+        pass
+
+
+def libro_sintetico(n):
+    dni = [str(40000000 + i) for i in range(n)]
+    return {
+        "CONTRATOS": pd.DataFrame({
+            "dni": dni,
+            "f_inicio": [f"20{10 + i % 14}-03-01" for i in range(n)],
+            # Mezcla real del libro: ISO, dd/mm/aaaa escrito a mano y texto libre
+            "f_fin": [("INDETERMINADO" if i % 50 == 0 else
+                       f"{1 + i % 28:02d}/{1 + i % 12:02d}/20{25 + i % 3}" if i % 7 == 0 else
+                       f"20{25 + i % 3}-{1 + i % 12:02d}-{1 + i % 28:02d}") for i in range(n)],
+            "tipo contrato": "Planilla completo",
+        }),
+        "DATOS GENERALES": pd.DataFrame({
+            "dni": dni,
+            "fecha de nacimiento": [f"{1 + i % 28:02d}/{1 + i % 12:02d}/19{60 + i % 40}" for i in range(n)],
+            "edad": [str(20 + i % 45) for i in range(n)],
+        }),
+        "VACACIONES": pd.DataFrame({
+            "dni": dni,
+            "fecha de inicio": "2024-02-01",
+            "fecha de fin": "2024-02-15",
+            "dias gozados": [str(i % 30) for i in range(n)],
+        }),
+    }
+
+
+def recarga_antigua(dfs):
+    """Las conversiones que los reportes repetían en cada recarga."""
+    cont, gen, vac = dfs["CONTRATOS"], dfs["DATOS GENERALES"], dfs["VACACIONES"]
+    pd.to_datetime(cont["f_fin"], errors="coerce")                      # reportegeneral
+    pd.to_datetime(cont["f_fin"], errors="coerce")                      # repvencimientos (orden)
+    pd.to_datetime(cont["f_fin"], errors="coerce")                      # repvencimientos (mes)
+    pd.to_datetime(gen["fecha de nacimiento"], errors="coerce")         # repcumpleanos
+    for df in (gen, cont, vac):                                         # repvacaciones (DNI)
+        df["dni"].astype(str).str.strip().str.replace(".0", "", regex=False).str.zfill(8)
+    pd.to_numeric(vac["dias gozados"], errors="coerce")
+    pd.to_datetime(cont["f_inicio"], errors="coerce")
+
+
+def recarga_nueva(cache):
+    for titulo in ("CONTRATOS", "DATOS GENERALES", "VACACIONES"):
+        cache.tipada(titulo)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--filas", type=int, default=50000)
+    parser.add_argument("--recargas", type=int, default=20)
+    args = parser.parse_args()
+
+    dfs = libro_sintetico(args.filas)
+
+    t0 = time.perf_counter()
+    for _ in range(args.recargas):
+        recarga_antigua(dfs)
+    t_antiguo = time.perf_counter() - t0
+
+    cache = mod_cache_hojas.CacheHojas(OrigenLocal(dfs))
+    t0 = time.perf_counter()
+    recarga_nueva(cache)
+    t_primera = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    for _ in range(args.recargas - 1):
+        recarga_nueva(cache)
+    t_resto = time.perf_counter() - t0
+
+    fechas = cache.tipada("CONTRATOS")["f_fin"]
+    print(f"{args.filas} filas por pestaña, {args.recargas} recargas")
+    print(f"{'método':<34}{'segundos':>10}{'ms/recarga':>12}")
+    print(f"{'conversiones en cada recarga':<34}{t_antiguo:>10.2f}{t_antiguo / args.recargas * 1000:>12.1f}")
+    print(f"{'vista tipada: primera recarga':<34}{t_primera:>10.2f}{t_primera * 1000:>12.1f}")
+    print(f"{'vista tipada: recargas siguientes':<34}{t_resto:>10.2f}{t_resto / max(args.recargas - 1, 1) * 1000:>12.1f}")
+    print(f"aceleración: x{t_antiguo / (t_primera + t_resto):.1f} | f_fin legibles: {fechas.notna().sum()} de {len(fechas)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+# ==========================================
+# BENCHMARK: EXPORTACIÓN DE REPORTES
+# ==========================================
+# Antes: cada recarga del reporte armaba el Excel con pd.ExcelWriter (openpyxl con el libro entero en memoria).
+# Ahora: mod_exportar lo arma solo al pulsar "Exportar", en modo write_only, y lo guarda en caché.
+#
+# Uso:  python benchmarks/bench_exportar.py [--filas 30000]
+import argparse
+import os
+import sys
+import time
+from io import BytesIO
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+
+import mod_exportar
+
+
+def tabla_sintetica(filas):
+    r = np.random.default_rng(2)
+    return pd.DataFrame({
+        "DNI": np.char.zfill(np.arange(filas).astype(str), 8),
+        "Trabajador": [f"APELLIDO{i} NOMBRE{i}" for i in range(filas)],
+        "Sede": r.choice(["Local Giraldez", "Local Lince", None], filas),
+        "Puesto Laboral": r.choice(["ANALISTA", "DOCENTE"], filas),
+        "Inicio Contrato": pd.Timestamp("2020-01-01") + pd.to_timedelta(r.integers(0, 2000, filas), unit="D"),
+        "Fin Contrato": pd.Timestamp("2026-01-01") + pd.to_timedelta(r.integers(0, 900, filas), unit="D"),
+        "Saldo": np.round(r.random(filas) * 60, 2),
+    })
+
+
+def excel_antiguo(df):
+    buf = BytesIO()
+    with pd.ExcelWriter(buf, engine="openpyxl") as writer:
+        df.to_excel(writer, index=False, sheet_name="General")
+    return buf.getvalue()
+
+
+def medir(funcion):
+    t0 = time.perf_counter()
+    resultado = funcion()
+    return time.perf_counter() - t0, resultado
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--filas", type=int, default=30_000)
+    args = parser.parse_args()
+    df = tabla_sintetica(args.filas)
+
+    t_antiguo, antiguo = medir(lambda: excel_antiguo(df))
+    t_excel, nuevo = medir(lambda: mod_exportar.archivo("bench", {}, (1,), "Excel", lambda: df, "General"))
+    t_cache, _ = medir(lambda: mod_exportar.archivo("bench", {}, (1,), "Excel", lambda: df, "General"))
+    t_csv, _ = medir(lambda: mod_exportar.a_csv(df))
+    t_parquet, _ = medir(lambda: mod_exportar.a_parquet(df))
+
+    iguales = pd.read_excel(BytesIO(antiguo)).equals(pd.read_excel(BytesIO(nuevo)))
+    print(f"{args.filas} filas x {len(df.columns)} columnas")
+    print(f"{'operación':<44}{'tiempo':>12}")
+    print(f"{'pd.ExcelWriter en cada recarga (antes)':<44}{t_antiguo * 1000:>9.0f} ms")
+    print(f"{'recarga sin pulsar Exportar (ahora)':<44}{0:>9.0f} ms")
+    print(f"{'Excel write_only al pulsar':<44}{t_excel * 1000:>9.0f} ms")
+    print(f"{'Excel desde la caché':<44}{t_cache * 1000:>9.3f} ms")
+    print(f"{'CSV':<44}{t_csv * 1000:>9.0f} ms")
+    print(f"{'Parquet':<44}{t_parquet * 1000:>9.0f} ms")
+    print(f"mismo contenido que antes: {iguales}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+# ==========================================
+# BENCHMARK: FILTROS DEL REPORTE GENERAL
+# ==========================================
+# Antes: copia de la tabla maestra + hasta ocho isin() seguidos en cada cambio de un multiselect.
+# Ahora: mod_filtros.MotorFiltros (mapas de bits por valor, AND/OR) y conteos por opción.
+#
+# Uso:  python benchmarks/bench_filtros.py [--filas 100000] [--repeticiones 50]
+import argparse
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+
+import mod_filtros
+
+VALORES = {
+    "estado": ["ACTIVO", "CESADO"],
+    "sede": ["Local Giraldez", "Local San Carlos", "Local Abancay", "Local Lince", "Local Pueblo Libre"],
+    "tipo de trabajador": ["Docente", "Administrativo"],
+    "sexo": ["F", "M"],
+    "modalidad": ["Presencial", "Remoto", "Mixto"],
+    "estado civil": ["Soltero", "Casado", "Viudo", "Divorciado"],
+    "temporalidad": ["Plazo fijo", "Indeterminado"],
+    "tipo contrato": ["Planilla", "Locación", "Honorarios"],
+}
+
+SELECCION = {"estado": ["ACTIVO"], "sede": ["Local Lince", "Local Abancay"], "tipo de trabajador": ["Docente"],
+             "sexo": [], "modalidad": ["Remoto", "Mixto"], "estado civil": [], "temporalidad": [],
+             "tipo contrato": ["Planilla", "Locación"]}
+
+
+def filtrado_antiguo(master_df, seleccion):
+    df_filtrado = master_df.copy()
+    for col, elegidos in seleccion.items():
+        if elegidos:
+            df_filtrado = df_filtrado[df_filtrado[col].isin(elegidos)]
+    return df_filtrado
+
+
+def medir(funcion, repeticiones):
+    t0 = time.perf_counter()
+    for _ in range(repeticiones):
+        resultado = funcion()
+    return (time.perf_counter() - t0) / repeticiones, resultado
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--filas", type=int, default=100_000)
+    parser.add_argument("--repeticiones", type=int, default=50)
+    args = parser.parse_args()
+
+    r = np.random.default_rng(3)
+    master_df = pd.DataFrame({c: r.choice(v, args.filas) for c, v in VALORES.items()}).astype("string")
+    master_df["dni"] = np.char.zfill(np.arange(args.filas).astype(str), 8)
+
+    t_motor, motor = medir(lambda: mod_filtros.MotorFiltros(master_df, list(VALORES)), 1)
+    t_antiguo, antiguo = medir(lambda: filtrado_antiguo(master_df, SELECCION), args.repeticiones)
+    t_filtrar, filas = medir(lambda: motor.filtrar(SELECCION), args.repeticiones)
+    t_conteos, _ = medir(lambda: {c: motor.conteos(c, SELECCION) for c in VALORES}, args.repeticiones)
+
+    print(f"{args.filas} filas, {sum(1 for v in SELECCION.values() if v)} filtros activos -> {len(filas)} filas")
+    print(f"{'operación':<44}{'tiempo':>12}")
+    print(f"{'copia + isin encadenados (antes)':<44}{t_antiguo * 1000:>9.2f} ms")
+    print(f"{'armar mapas de bits (una vez por versión)':<44}{t_motor * 1000:>9.2f} ms")
+    print(f"{'filtrar con mapas de bits':<44}{t_filtrar * 1000:>9.2f} ms")
+    print(f"{'conteos de las 8 listas de opciones':<44}{t_conteos * 1000:>9.2f} ms")
+    print(f"mismas filas que antes: {np.array_equal(antiguo.index.to_numpy(), filas)}")
+
+
+if __name__ == "__main__":
+    main()
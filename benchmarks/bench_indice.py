@@ -0,0 +1,119 @@
+# ==========================================
+# BENCHMARK: FICHA DEL COLABORADOR (BARRIDO POR PESTAÑA vs ÍNDICE POR DNI)
+# ==========================================
+# Antes, la Consulta filtraba las 11 pestañas con dfs[h][dfs[h]["dni"] == dni] en cada recarga.
+# Ahora LibroDatos.get_employee() toma las posiciones del índice por DNI de la caché.
+# También mide cuánto cuesta poner el índice al día cuando un guardado agrega una fila.
+#
+# Uso:  python benchmarks/bench_indice.py [--personas 20000] [--filas-por-persona 3] [--consultas 200]
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+
+import mod_cache_hojas
+import mod_indice
+
+HOJAS = ["DATOS GENERALES", "EXP. LABORAL", "FORM. ACADEMICA", "INVESTIGACION", "DATOS FAMILIARES", "CONTRATOS",
+         "VACACIONES", "OTROS BENEFICIOS", "MERITOS Y DEMERITOS", "EVALUACION DEL DESEMPEÑO", "LIQUIDACIONES"]
+
+
+class OrigenLocal:
+    """Doble de CacheDisco: entrega las pestañas ya normalizadas, sin red ni disco."""
+
+    def __init__(self, dfs):
+        self.dfs = dfs
+
+    def titulos(self):
+        return list(self.dfs)
+
+    def cargar(self, titulos):
+        return {t: self.dfs[t] for t in titulos}, {}
+
+    def vencida(self):
+        return False
+
+    def revalidar_en_segundo_plano(self):
+        pass
+
+    def actualizar_hojas(self, hojas):
+        self.dfs.update(hojas)
+
+
+def libro_sintetico(personas, por_persona):
+    dnis = [f"{40000000 + i}" for i in range(personas)]
+    libro = {}
+    for h in HOJAS:
+        n = personas * por_persona
+        libro[h] = pd.DataFrame({
+            "dni": [dnis[(i * 7919) % personas] for i in range(n)],
+            "periodo": [f"20{10 + i % 15}" for i in range(n)],
+            "detalle": [f"registro {i}" for i in range(n)],
+        })
+    return libro, dnis
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--personas", type=int, default=20000)
+    parser.add_argument("--filas-por-persona", type=int, default=3)
+    parser.add_argument("--consultas", type=int, default=200)
+    args = parser.parse_args()
+
+    libro, dnis = libro_sintetico(args.personas, args.filas_por_persona)
+    buscados = random.Random(1).sample(dnis, args.consultas)
+
+    cache = mod_cache_hojas.CacheHojas(OrigenLocal(libro))
+    dfs = cache.libro()
+    dfs.precargar(HOJAS)
+
+    t0 = time.perf_counter()
+    for dni in buscados:
+        antiguo = {h: dfs[h][dfs[h]["dni"] == dni] for h in HOJAS}
+    t_barrido = (time.perf_counter() - t0) / args.consultas
+
+    t0 = time.perf_counter()
+    dfs.get_employee(buscados[0], HOJAS)
+    t_armado = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    for dni in buscados:
+        nuevo = dfs.get_employee(dni, HOJAS)
+    t_indice = (time.perf_counter() - t0) / args.consultas
+
+    t0 = time.perf_counter()
+    for dni in buscados:
+        for h in HOJAS:
+            cache.indice(h).posiciones(dni)
+    t_posiciones = (time.perf_counter() - t0) / (args.consultas * len(HOJAS))
+
+    iguales = all(antiguo[h].equals(nuevo[h]) for h in HOJAS)
+
+    # Guardado que agrega una fila: el índice se extiende en vez de rehacerse
+    dfs["CONTRATOS"] = pd.concat([dfs["CONTRATOS"], pd.DataFrame([{"dni": dnis[0], "periodo": "2026", "detalle": "nuevo"}])],
+                                 ignore_index=True)
+    antes = cache.indice("CONTRATOS")
+    t0 = time.perf_counter()
+    extendido = antes.actualizado(mod_indice.dnis_de(dfs["CONTRATOS"]))
+    t_extension = time.perf_counter() - t0
+    cache.registrar_guardado(dfs, "CONTRATOS")
+    nueva_fila = len(dfs["CONTRATOS"]) - 1
+    extendido_ok = extendido is antes and nueva_fila in cache.indice("CONTRATOS").posiciones(dnis[0])
+
+    filas = args.personas * args.filas_por_persona
+    print(f"{len(HOJAS)} pestañas x {filas} filas ({args.personas} personas), {args.consultas} consultas")
+    print(f"{'operación':<42}{'por consulta':>14}")
+    print(f"{'barrido de las 11 pestañas':<42}{t_barrido * 1000:>11.2f} ms")
+    print(f"{'get_employee (índice ya armado)':<42}{t_indice * 1000:>11.2f} ms")
+    print(f"{'posiciones de un DNI en una pestaña':<42}{t_posiciones * 1e6:>11.1f} µs")
+    print(f"armado inicial de los 11 índices: {t_armado * 1000:.0f} ms | "
+          f"extender el índice tras agregar una fila: {t_extension * 1000:.1f} ms ({extendido_ok}) | mismas filas: {iguales}")
+
+
+if __name__ == "__main__":
+    main()
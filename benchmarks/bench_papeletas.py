@@ -0,0 +1,77 @@
+# ==========================================
+# BENCHMARK: PAPELETAS DE VACACIONES
+# ==========================================
+# Antes: gen_papeleta_vac abría Template_Papeleta.docx y recorría todos los runs buscando las 11 claves.
+# Ahora: mod_papeletas compila la plantilla una vez y cada papeleta es intercalar valores en el XML ya cortado.
+#
+# Uso:  python benchmarks/bench_papeletas.py [--papeletas 200]
+import argparse
+import os
+import sys
+import time
+from datetime import date
+from io import BytesIO
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.chdir(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from docx import Document
+
+import mod_papeletas
+
+ARGS = ("Pérez Rojas", "Ana María", "40000001", "Analista", date(2019, 3, 1), "2025-2026",
+        date(2026, 2, 2), date(2026, 2, 15), 14)
+
+
+def papeleta_antigua(*args):
+    """gen_papeleta_vac tal como estaba: plantilla desde disco y reemplazo run por run."""
+    doc = Document(mod_papeletas.PLANTILLA)
+    reps = {"{{" + k + "}}": v for k, v in mod_papeletas.valores_papeleta(*args).items()}
+
+    def replace_in_element(element):
+        for run in element.runs:
+            for key, value in reps.items():
+                if key in run.text:
+                    run.text = run.text.replace(key, value)
+
+    for p in doc.paragraphs:
+        replace_in_element(p)
+    for table in doc.tables:
+        for row in table.rows:
+            for cell in row.cells:
+                for p in cell.paragraphs:
+                    replace_in_element(p)
+    buf = BytesIO()
+    doc.save(buf)
+    return buf
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--papeletas", type=int, default=200)
+    args = parser.parse_args()
+
+    t0 = time.perf_counter()
+    for _ in range(args.papeletas):
+        antigua = papeleta_antigua(*ARGS)
+    t_antigua = (time.perf_counter() - t0) / args.papeletas
+
+    t0 = time.perf_counter()
+    mod_papeletas.plantilla()
+    t_compilar = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    for _ in range(args.papeletas):
+        nueva = mod_papeletas.gen_papeleta_vac(*ARGS)
+    t_nueva = (time.perf_counter() - t0) / args.papeletas
+
+    textos = [[p.text for p in mod_papeletas._parrafos(Document(b))] for b in (antigua, nueva)]
+    print(f"{'operación':<40}{'tiempo':>12}")
+    print(f"{'plantilla desde disco + runs':<40}{t_antigua * 1000:>9.1f} ms")
+    print(f"{'compilar plantilla (una vez)':<40}{t_compilar * 1000:>9.1f} ms")
+    print(f"{'llenar plantilla compilada':<40}{t_nueva * 1000:>9.1f} ms")
+    print(f"mismo texto que antes: {textos[0] == textos[1]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+# ==========================================
+# BENCHMARK: PAQUETE MENSUAL
+# ==========================================
+# Antes: para el paquete de Gerencia se exportaban los cuatro reportes por separado; cada uno tipaba
+# sus pestañas y armaba su propio contrato vigente, y salían cuatro archivos.
+# Ahora: mod_paquete.libro_mensual() arma las cuatro tablas sobre un solo libro (vistas compartidas)
+# y las escribe como hojas de un solo .xlsx.
+#
+# Uso:  python benchmarks/bench_paquete.py [--personas 20000] [--contratos 3]
+import argparse
+import os
+import sys
+import time
+from datetime import date
+from io import BytesIO
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+
+import mod_cache_hojas
+import mod_exportar
+import mod_paquete
+import repcumpleanos
+import reportegeneral
+import repvacaciones
+import repvencimientos
+
+
+def _fechas(r, desde, dias, n):
+    return pd.Series(pd.Timestamp(desde) + pd.to_timedelta(r.integers(0, dias, n), unit="D")).dt.strftime("%d/%m/%Y")
+
+
+def libro_sintetico(personas, por_persona):
+    r = np.random.default_rng(4)
+    dnis = np.char.zfill(np.arange(personas).astype(str), 8)
+    n = personas * por_persona
+    c_dni = np.repeat(dnis, por_persona)
+    contratos = pd.DataFrame({
+        "dni": c_dni, "cargo": r.choice(["ANALISTA", "DOCENTE", "ASISTENTE"], n),
+        "f_inicio": _fechas(r, "2015-01-01", 2500, n), "f_fin": _fechas(r, "2022-01-01", 2000, n),
+        "tipo contrato": r.choice(["Planilla", "Locación"], n), "tipo de trabajador": r.choice(["Administrativo", "Docente"], n),
+        "area": r.choice(["TI", "RRHH", "ACADEMICO"], n), "estado": r.choice(["ACTIVO", "CESADO"], n),
+        "modalidad": "PRESENCIAL", "temporalidad": "PLAZO FIJO",
+    })
+    return {
+        "PERSONAL": pd.DataFrame({"dni": dnis, "apellidos y nombres": [f"APELLIDO{i} NOMBRE{i}" for i in range(personas)]}),
+        "CONTRATOS": contratos,
+        "DATOS GENERALES": pd.DataFrame({
+            "dni": dnis, "sede": r.choice(["Local Giraldez", "Local Lince"], personas), "sexo": r.choice(["F", "M"], personas),
+            "estado civil": "SOLTERO", "fecha de nacimiento": _fechas(r, "1965-01-01", 14000, personas),
+        }),
+        "VACACIONES": pd.DataFrame({
+            "dni": r.choice(dnis, personas), "periodo": "2024-2025",
+            "fecha de inicio": _fechas(r, "2025-01-01", 200, personas), "fecha de fin": _fechas(r, "2025-08-01", 100, personas),
+            "dias gozados": r.integers(1, 15, personas),
+        }),
+    }
+
+
+def por_separado(dfs, hoy):
+    """Cada reporte sobre su propia copia de las pestañas, un archivo por reporte."""
+    archivos = [
+        mod_exportar.a_excel(reportegeneral.tabla_reporte(reportegeneral.tabla_maestra(dict(dfs))), "General"),
+        mod_exportar.a_excel(repvencimientos.tabla_reporte(repvencimientos.tabla_vencimientos(dict(dfs))), "Vencimientos"),
+        mod_exportar.a_excel(repvacaciones.tabla_saldos(dict(dfs), hoy), "Saldos_Vacaciones"),
+        mod_exportar.a_excel(repcumpleanos.tabla_cumpleanos(dict(dfs), hoy.year)[repcumpleanos.COLUMNAS_REPORTE], "Cumpleañeros"),
+    ]
+    return sum(len(a) for a in archivos)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--personas", type=int, default=20_000)
+    parser.add_argument("--contratos", type=int, default=3)
+    args = parser.parse_args()
+    dfs = libro_sintetico(args.personas, args.contratos)
+    hoy = date.today()
+
+    t0 = time.perf_counter()
+    por_separado(dfs, hoy)
+    t_antes = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    hojas = mod_paquete.tablas(mod_cache_hojas.libro_directo(dfs), hoy)
+    t_tablas = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    datos = mod_exportar.hojas_excel(hojas)
+    t_excel = time.perf_counter() - t0
+
+    leidas = pd.read_excel(BytesIO(datos), sheet_name=None)
+    print(f"{args.personas} personas, {len(dfs['CONTRATOS'])} contratos")
+    print("hojas: " + ", ".join(f"{k} ({len(v)})" for k, v in leidas.items()))
+    print(f"{'operación':<44}{'tiempo':>12}")
+    print(f"{'cuatro reportes por separado (antes)':<44}{t_antes * 1000:>9.0f} ms")
+    print(f"{'paquete: cuatro tablas en una pasada':<44}{t_tablas * 1000:>9.0f} ms")
+    print(f"{'paquete: un solo .xlsx de cuatro hojas':<44}{t_excel * 1000:>9.0f} ms")
+    print(f"{'paquete total':<44}{(t_tablas + t_excel) * 1000:>9.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
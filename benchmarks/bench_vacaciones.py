@@ -0,0 +1,108 @@
+# ==========================================
+# BENCHMARK: ACUMULACIÓN DE VACACIONES
+# ==========================================
+# Antes: repvacaciones (y la pestaña VACACIONES de Consulta) recorrían año por año con un while
+# y, dentro de cada año, todos los contratos del trabajador con iterrows(), un DNI a la vez.
+# Ahora: mod_vacaciones.calcular() arma los periodos aniversario de todos y los cruza con los contratos
+# con aritmética de intervalos. Comprueba además que cada periodo dé los mismos días generados.
+#
+# Uso:  python benchmarks/bench_vacaciones.py [--trabajadores 5000] [--anios 10]
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import date
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+
+import mod_vacaciones
+
+HOY = date(2026, 10, 18)
+
+
+def datos_sinteticos(trabajadores, anios):
+    """Cada trabajador encadena contratos de 6 a 18 meses (a veces con huecos) durante ~anios años."""
+    r = random.Random(11)
+    contratos, vacaciones = [], []
+    for i in range(trabajadores):
+        dni = f"{40000000 + i:08d}"
+        inicio = pd.Timestamp(HOY) - pd.Timedelta(days=int(anios * 365.25) + r.randint(-200, 200))
+        while inicio < pd.Timestamp(HOY):
+            fin = inicio + pd.Timedelta(days=r.randint(180, 540))
+            sin_fin = fin >= pd.Timestamp(HOY) and r.random() < 0.5
+            contratos.append({"dni": dni, "f_inicio": inicio, "f_fin": pd.NaT if sin_fin else fin,
+                              "tipo contrato": "Planilla" if r.random() < 0.85 else "Locación"})
+            inicio = fin + pd.Timedelta(days=1 if r.random() < 0.8 else r.randint(2, 120))
+        for k in range(anios):
+            anio = HOY.year - anios + k
+            vacaciones.append({"dni": dni, "periodo": f"{anio}-{anio + 1}", "dias gozados": r.choice([0, 7, 15, 30])})
+    return pd.DataFrame(contratos), pd.DataFrame(vacaciones)
+
+
+def acumulado_antiguo(c_df, v_df):
+    """El cálculo de repvacaciones.mostrar(): un while por año y un iterrows por contrato, DNI por DNI."""
+    gozados_por_dni = v_df.groupby("dni")["dias gozados"].sum()
+    planilla = c_df[c_df["tipo contrato"].astype(str).str.upper().str.contains("PLANILLA", na=False)]
+    contratos_por_dni = dict(tuple(planilla.groupby("dni")))
+    periodos, saldos = {}, {}
+    for dni in sorted(set(c_df["dni"]) | set(v_df["dni"])):
+        dias_generados_totales = 0
+        df_tc = contratos_por_dni.get(dni)
+        if df_tc is not None:
+            start_global = df_tc['f_inicio'].min()
+            if pd.notnull(start_global):
+                curr_start = start_global.date()
+                while curr_start <= HOY:
+                    curr_end = (pd.to_datetime(curr_start) + pd.DateOffset(years=1) - pd.Timedelta(days=1)).date()
+                    days_in_p = 0
+                    for _, r in df_tc.iterrows():
+                        c_s = r['f_inicio'].date() if pd.notnull(r['f_inicio']) else None
+                        c_e = r['f_fin'].date() if pd.notnull(r.get('f_fin')) else HOY
+                        if c_s:
+                            o_s, o_e = max(curr_start, c_s), min(curr_end, c_e, HOY)
+                            if o_s <= o_e: days_in_p += (o_e - o_s).days + 1
+                    total_days = (curr_end - curr_start).days + 1
+                    gen_p = (days_in_p / total_days) * 30
+                    periodos[(dni, f"{curr_start.year}-{curr_start.year + 1}")] = gen_p
+                    dias_generados_totales += gen_p
+                    curr_start = (pd.to_datetime(curr_start) + pd.DateOffset(years=1)).date()
+        saldos[dni] = round(dias_generados_totales - gozados_por_dni.get(dni, 0), 2)
+    return periodos, saldos
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--trabajadores", type=int, default=5000)
+    parser.add_argument("--anios", type=int, default=10)
+    args = parser.parse_args()
+
+    c_df, v_df = datos_sinteticos(args.trabajadores, args.anios)
+
+    t0 = time.perf_counter()
+    periodos_antiguos, saldos_antiguos = acumulado_antiguo(c_df, v_df)
+    t_antiguo = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    detalle, totales = mod_vacaciones.calcular(c_df, v_df, HOY)
+    t_nuevo = time.perf_counter() - t0
+
+    # Mismos periodos y, en cada uno, los mismos días generados (el motor redondea a 2 decimales por periodo)
+    nuevos = dict(zip(zip(detalle["dni"], detalle["periodo"]), detalle["generados"]))
+    mismos_periodos = nuevos.keys() == periodos_antiguos.keys()
+    distintos = sum(round(g, 2) != nuevos.get(k) for k, g in periodos_antiguos.items())
+    # El saldo total suma los periodos sin redondear, en el mismo orden: tiene que salir idéntico
+    saldos_distintos = sum(totales["saldo"].get(d, 0) != s for d, s in saldos_antiguos.items())
+
+    print(f"{args.trabajadores} trabajadores x {args.anios} años: {len(c_df)} contratos, {len(detalle)} periodos")
+    print(f"{'método':<40}{'tiempo':>12}")
+    print(f"{'while + iterrows por DNI':<40}{t_antiguo:>10.2f} s")
+    print(f"{'mod_vacaciones.calcular (todos)':<40}{t_nuevo * 1000:>9.0f} ms")
+    print(f"mismos periodos: {mismos_periodos} | periodos con otros días generados: {distintos} | "
+          f"saldos distintos: {saldos_distintos}")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,6 +4,9 @@
 import streamlit as st
 import pandas as pd
 
+# Pestañas que usa este módulo (app.py las descarga juntas antes de mostrarlo)
+HOJAS_REQUERIDAS = ["ESTRUCTURA_PUESTOS"]
+
 def mostrar(dfs):
     st.markdown("<h2 style='color: #FFD700; text-align: center; margin-bottom: 20px;'>🏢 Directorio de Perfiles y Puestos (MOF)</h2>", unsafe_allow_html=True)
     
@@ -2,6 +2,9 @@ import streamlit as st
 import pandas as pd
 import io
 
+# Pestañas que usa este módulo (app.py las descarga juntas antes de mostrarlo)
+HOJAS_REQUERIDAS = ["PERSONAL", "EVALUACIONES"]
+
 def mostrar(dfs, save_data): # Añadimos save_data aquí
     st.markdown("<h2 style='color: #4A0000;'>📋 Gestión de Evaluaciones de Desempeño</h2>", unsafe_allow_html=True)
     
@@ -0,0 +1,350 @@
+# ==========================================
+# MÓDULO: BACKENDS DE ALMACENAMIENTO
+# ==========================================
+# load_data() y save_data() de app.py hablan con un backend intercambiable:
+#   - "sheets": Google Sheets (producción, vía gspread)
+#   - "xlsx":   el libro local DB_SISTEMA_GTH.xlsx (openpyxl)
+#   - "sqlite": una base SQLite local, una tabla por pestaña
+# Todos devuelven el mismo diccionario {pestaña: DataFrame} ya normalizado por mod_datos,
+# así que los módulos mostrar(dfs, save_data) no se enteran de dónde vienen los datos.
+from abc import ABC, abstractmethod
+from contextlib import closing, contextmanager
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from datetime import date, datetime
+
+import gspread
+from gspread.exceptions import APIError
+import openpyxl
+from oauth2client.service_account import ServiceAccountCredentials
+import pandas as pd
+
+import mod_cuota
+import mod_datos
+
+BACKEND_POR_DEFECTO = "sheets"
+RUTA_XLSX = "DB_SISTEMA_GTH.xlsx"
+RUTA_SQLITE = "DB_SISTEMA_GTH.sqlite"
+# Libro de producción en Google Sheets y permisos de la cuenta de servicio
+NOMBRE_LIBRO = "DB_SISTEMA_GTH"
+SCOPE = ["https://spreadsheets.google.com/feeds", "https://www.googleapis.com/auth/drive"]
+RUTA_CREDENCIALES = "credenciales.json"
+# Cada cuánto renovamos por completo la conexión a Sheets (el token de Google dura 1 hora)
+VIDA_CONEXION = 45 * 60
+
+
+class BackendAlmacenamiento(ABC):
+    """Interfaz común: cargar() -> (dfs, errores) y guardar(dfs, pestana_especifica=None)."""
+
+    nombre = ""
+
+    @abstractmethod
+    def hojas(self):
+        ...
+
+    @abstractmethod
+    def cargar(self, titulos=None):
+        ...
+
+    @abstractmethod
+    def guardar(self, dfs, pestana_especifica=None):
+        ...
+
+    def _armar_dfs(self, valores_por_hoja):
+        dfs, errores = {}, {}
+        for titulo, valores in valores_por_hoja.items():
+            try:
+                dfs[titulo] = mod_datos.normalizar_hoja(titulo, mod_datos.df_desde_valores(valores))
+            except Exception as e:
+                errores[titulo] = str(e)
+                dfs[titulo] = pd.DataFrame()
+        return dfs, errores
+
+
+# ==========================================
+# 1. GOOGLE SHEETS
+# ==========================================
+class ConexionSheets:
+    """
+    Cliente gspread, libro abierto y mapa {pestaña: worksheet} compartidos por todo el proceso.
+    Se crean la primera vez que se usan y se renuevan solos al vencer o si Google rechaza el token.
+    """
+
+    def __init__(self, obtener_credenciales, nombre_libro, vida_maxima=VIDA_CONEXION):
+        self.obtener_credenciales = obtener_credenciales
+        self.nombre_libro = nombre_libro
+        self.vida_maxima = vida_maxima
+        self._lock = threading.Lock()
+        self._client = None
+        self._spreadsheet = None
+        self._hojas = {}
+        self._abierto_en = 0
+        self.contadores = {
+            "autorizaciones": 0, "autorizaciones_evitadas": 0,
+            "aperturas": 0, "aperturas_evitadas": 0,
+            "mapas_pestanas": 0, "mapas_reutilizados": 0,
+        }
+
+    def _conectar(self):
+        # Todas las peticiones del cliente pasan por el planificador de cuota
+        self._client = gspread.authorize(self.obtener_credenciales(), http_client=mod_cuota.HTTPClientConCuota)
+        self.contadores["autorizaciones"] += 1
+        self._spreadsheet = self._client.open(self.nombre_libro)
+        self.contadores["aperturas"] += 1
+        self._abierto_en = time.monotonic()
+        self._mapear_pestanas()
+
+    def _mapear_pestanas(self):
+        self._hojas = {ws.title: ws for ws in self._spreadsheet.worksheets()}
+        self.contadores["mapas_pestanas"] += 1
+
+    def _asegurar(self):
+        # Devuelve True si hubo que conectar de nuevo
+        if self._spreadsheet is None or time.monotonic() - self._abierto_en > self.vida_maxima:
+            self._conectar()
+            return True
+        return False
+
+    def libro(self):
+        with self._lock:
+            if not self._asegurar():
+                self.contadores["autorizaciones_evitadas"] += 1
+                self.contadores["aperturas_evitadas"] += 1
+            return self._spreadsheet
+
+    def pestanas(self):
+        """Mapa {titulo: worksheet} (copia). Cada uso evita volver a pedir los metadatos del libro."""
+        with self._lock:
+            if not self._asegurar():
+                self.contadores["mapas_reutilizados"] += 1
+            return dict(self._hojas)
+
+    def refrescar_pestanas(self):
+        with self._lock:
+            if not self._asegurar():
+                self._mapear_pestanas()
+            return dict(self._hojas)
+
+    def invalidar(self):
+        with self._lock:
+            self._client = None
+            self._spreadsheet = None
+            self._hojas = {}
+
+    def estadisticas(self):
+        with self._lock:
+            return dict(self.contadores)
+
+
+def _es_error_de_sesion(error):
+    return isinstance(error, APIError) and getattr(error, "code", None) in (401, 403)
+
+
+class BackendGoogleSheets(BackendAlmacenamiento):
+    nombre = "sheets"
+
+    def __init__(self, obtener_credenciales, nombre_libro):
+        self.conexion = ConexionSheets(obtener_credenciales, nombre_libro)
+
+    def _con_reconexion(self, operacion):
+        # Si el token o el libro quedaron inválidos, reconectamos una sola vez y repetimos
+        try:
+            return operacion()
+        except Exception as e:
+            if not _es_error_de_sesion(e):
+                raise
+            self.conexion.invalidar()
+            return operacion()
+
+    def hojas(self):
+        return list(self._con_reconexion(self.conexion.pestanas))
+
+    def cargar(self, titulos=None):
+        def operacion():
+            libro = self.conexion.libro()
+            return mod_datos.cargar_libro_batch(libro, titulos if titulos is not None else list(self.conexion.pestanas()))
+        return self._con_reconexion(operacion)
+
+    def guardar(self, dfs, pestana_especifica=None):
+        def operacion():
+            libro = self.conexion.libro()
+            hojas = self.conexion.pestanas()
+            # Una pestaña nueva (creada a mano en Sheets) obliga a releer el mapa
+            if any(h not in hojas for h in mod_datos.pestanas_a_guardar(dfs, pestana_especifica)):
+                hojas = self.conexion.refrescar_pestanas()
+            mod_datos.guardar_libro(libro, dfs, pestana_especifica, hojas=hojas)
+        self._con_reconexion(operacion)
+
+
+# ==========================================
+# 2. LIBRO EXCEL LOCAL
+# ==========================================
+def _texto_celda(valor):
+    """Convierte una celda de openpyxl al texto que devolvería la API de Sheets."""
+    if valor is None:
+        return ""
+    if isinstance(valor, bool):
+        return "TRUE" if valor else "FALSE"
+    if isinstance(valor, datetime):
+        return valor.date().isoformat() if valor.time() == datetime.min.time() else valor.isoformat(sep=" ")
+    if isinstance(valor, date):
+        return valor.isoformat()
+    if isinstance(valor, float) and valor.is_integer():
+        return str(int(valor))
+    return str(valor)
+
+
+def _recortar(filas):
+    # Como la API de Sheets: sin celdas vacías al final de cada fila ni filas vacías al final
+    filas = [list(f) for f in filas]
+    for f in filas:
+        while f and f[-1] == "":
+            f.pop()
+    while filas and not filas[-1]:
+        filas.pop()
+    return filas
+
+
+class BackendXlsx(BackendAlmacenamiento):
+    nombre = "xlsx"
+
+    def __init__(self, ruta=RUTA_XLSX):
+        self.ruta = ruta
+        self._lock = threading.Lock()
+
+    def _leer(self, titulos=None):
+        # Modo solo lectura: openpyxl recorre las filas en streaming sin armar el modelo completo
+        wb = openpyxl.load_workbook(self.ruta, read_only=True, data_only=True)
+        try:
+            valores = {}
+            for ws in wb.worksheets:
+                if titulos is not None and ws.title not in titulos:
+                    continue
+                valores[ws.title] = _recortar([_texto_celda(v) for v in fila] for fila in ws.iter_rows(values_only=True))
+            return valores
+        finally:
+            wb.close()
+
+    def hojas(self):
+        wb = openpyxl.load_workbook(self.ruta, read_only=True)
+        try:
+            return list(wb.sheetnames)
+        finally:
+            wb.close()
+
+    def cargar(self, titulos=None):
+        with self._lock:
+            return self._armar_dfs(self._leer(titulos))
+
+    def guardar(self, dfs, pestana_especifica=None):
+        pestanas = mod_datos.pestanas_a_guardar(dfs, pestana_especifica)
+        if not pestanas:
+            return
+        with self._lock:
+            wb = openpyxl.load_workbook(self.ruta)
+            for h in pestanas:
+                if h in wb.sheetnames:
+                    ws = wb[h]
+                    ws.delete_rows(1, ws.max_row)
+                else:
+                    ws = wb.create_sheet(h)
+                for fila in mod_datos.matriz_para_guardar(dfs[h]):
+                    ws.append(fila)
+
+            # Escritura atómica: si algo falla no dejamos el libro a medias
+            carpeta = os.path.dirname(os.path.abspath(self.ruta))
+            fd, tmp = tempfile.mkstemp(suffix=".xlsx", dir=carpeta)
+            os.close(fd)
+            try:
+                wb.save(tmp)
+                os.replace(tmp, self.ruta)
+            finally:
+                if os.path.exists(tmp):
+                    os.remove(tmp)
+
+
+# ==========================================
+# 3. SQLITE LOCAL
+# ==========================================
+def _ident(nombre):
+    return '"' + str(nombre).replace('"', '""') + '"'
+
+
+class BackendSqlite(BackendAlmacenamiento):
+    """Una tabla por pestaña, columnas TEXT con los mismos textos que se suben a Sheets."""
+
+    nombre = "sqlite"
+
+    def __init__(self, ruta=RUTA_SQLITE, semilla=None):
+        self.ruta = ruta
+        self._lock = threading.Lock()
+        # Si la base está vacía la llenamos una vez desde otro backend (por defecto el Excel local)
+        if semilla is not None and not self.hojas():
+            migrar(semilla, self)
+
+    @contextmanager
+    def _conectar(self):
+        # El "with" de sqlite3 solo confirma o revierte la transacción; closing() además cierra la conexión
+        with closing(sqlite3.connect(self.ruta)) as con, con:
+            yield con
+
+    def hojas(self):
+        with self._conectar() as con:
+            filas = con.execute("SELECT name FROM sqlite_master WHERE type = 'table' ORDER BY rowid").fetchall()
+        return [f[0] for f in filas]
+
+    def cargar(self, titulos=None):
+        valores = {}
+        with self._lock, self._conectar() as con:
+            for titulo in (titulos if titulos is not None else self.hojas()):
+                try:
+                    cur = con.execute(f"SELECT * FROM {_ident(titulo)} ORDER BY rowid")
+                except sqlite3.OperationalError:
+                    valores[titulo] = []
+                    continue
+                encabezado = [d[0] for d in cur.description]
+                valores[titulo] = [encabezado] + [["" if v is None else str(v) for v in fila] for fila in cur.fetchall()]
+        return self._armar_dfs(valores)
+
+    def guardar(self, dfs, pestana_especifica=None):
+        pestanas = mod_datos.pestanas_a_guardar(dfs, pestana_especifica)
+        with self._lock, self._conectar() as con:
+            # Una sola transacción: o se guardan todas las pestañas o ninguna
+            for h in pestanas:
+                matriz = mod_datos.matriz_para_guardar(dfs[h])
+                columnas = ", ".join(f"{_ident(c)} TEXT" for c in matriz[0])
+                con.execute(f"DROP TABLE IF EXISTS {_ident(h)}")
+                con.execute(f"CREATE TABLE {_ident(h)} ({columnas})")
+                marcas = ", ".join("?" for _ in matriz[0])
+                con.executemany(f"INSERT INTO {_ident(h)} VALUES ({marcas})", matriz[1:])
+
+
+def migrar(origen, destino):
+    """Copia todas las pestañas de un backend a otro (por ejemplo de Sheets a SQLite)."""
+    dfs, _ = origen.cargar()
+    destino.guardar(dfs)
+    return dfs
+
+
+def credenciales_servicio(json_texto=None, ruta=RUTA_CREDENCIALES):
+    """Credenciales de la cuenta de servicio: del JSON en texto (secrets o variable de entorno) o del archivo."""
+    if json_texto:
+        return ServiceAccountCredentials.from_json_keyfile_dict(json.loads(json_texto), SCOPE)
+    return ServiceAccountCredentials.from_json_keyfile_name(ruta, SCOPE)
+
+
+def crear_backend(nombre=None, obtener_credenciales=None, nombre_libro=None, ruta_xlsx=RUTA_XLSX, ruta_sqlite=RUTA_SQLITE):
+    """Fábrica de backends según la configuración ("sheets", "xlsx" o "sqlite")."""
+    nombre = (nombre or BACKEND_POR_DEFECTO).strip().lower()
+    if nombre == "sheets":
+        return BackendGoogleSheets(obtener_credenciales, nombre_libro)
+    if nombre == "xlsx":
+        return BackendXlsx(ruta_xlsx)
+    if nombre == "sqlite":
+        semilla = BackendXlsx(ruta_xlsx) if os.path.exists(ruta_xlsx) else None
+        return BackendSqlite(ruta_sqlite, semilla=semilla)
+    raise ValueError(f"Backend de almacenamiento desconocido: '{nombre}'. Usa sheets, xlsx o sqlite.")
@@ -0,0 +1,150 @@
+# ==========================================
+# MÓDULO: BUSCADOR DE COLABORADORES (DNI, NOMBRES, TRIGRAMAS)
+# ==========================================
+# Antes la Consulta mandaba al navegador un selectbox con todas las personas ("dni - nombre")
+# y la Nómina hacía str.contains sobre tres columnas en cada recarga.
+# Ahora se arma un índice una vez por versión de PERSONAL y el servidor devuelve solo las mejores coincidencias:
+#   - DNI por prefijo ("4012" encuentra 40123456)
+#   - palabras del nombre por prefijo, sin tildes ni mayúsculas ("garc lop" encuentra "GARCÍA LÓPEZ")
+#   - trigramas para errores de tipeo ("gonzales" encuentra "GONZÁLEZ") o texto en medio de la palabra ("arci")
+# La Nómina conserva su filtro literal (contiene el texto, en el orden de la pestaña) sobre los textos ya
+# preparados del índice; solo si no hay ninguna coincidencia literal ofrece las parecidas.
+import unicodedata
+from bisect import bisect_left
+
+import numpy as np
+import pandas as pd
+
+# Cuántas coincidencias se muestran en el selector de Consulta
+LIMITE_RESULTADOS = 20
+# Parecido mínimo por trigramas (fracción de trigramas de la búsqueda presentes en el nombre)
+PARECIDO_MINIMO = 0.5
+
+_SIN_FILAS = np.array([], dtype=np.intp)
+
+
+def plegar(texto):
+    """Minúsculas, sin tildes y con espacios simples: 'Núñez  GARCÍA' -> 'nunez garcia'."""
+    texto = unicodedata.normalize("NFKD", str(texto))
+    texto = "".join(c for c in texto if not unicodedata.combining(c))
+    return " ".join(texto.lower().split())
+
+
+def trigramas(texto, relleno=True):
+    """Trigramas por palabra; con relleno al inicio y al final (como pg_trgm) o solo los interiores."""
+    tris = set()
+    for palabra in texto.split():
+        p = f"  {palabra} " if relleno else palabra
+        tris.update(p[i:i + 3] for i in range(len(p) - 2))
+    return tris
+
+
+class IndiceBusqueda:
+    def __init__(self, dnis, nombres, textos=None):
+        self.dnis = [str(d).strip() for d in dnis]
+        self.nombres = [str(n).strip() for n in nombres]
+        plegados = [plegar(n) for n in self.nombres]
+        # Campos en minúsculas de cada fila para la búsqueda literal (contiene), unidos por un salto de línea
+        # que ninguna búsqueda puede tener: así una coincidencia nunca cruza de un campo a otro
+        campos = textos if textos is not None else [(n.lower(), d) for n, d in zip(self.nombres, self.dnis)]
+        self._textos = ["\n".join(c) for c in campos]
+
+        # Posiciones válidas (sin fila en blanco) y DNI ordenados para buscar por prefijo
+        self._validas = np.array([bool(d or n) for d, n in zip(self.dnis, self.nombres)])
+        pares = sorted((d, i) for i, d in enumerate(self.dnis) if d)
+        self._dni_ord = [d for d, _ in pares]
+        self._dni_fila = np.array([i for _, i in pares], dtype=np.intp)
+
+        # Palabras del nombre ordenadas (prefijo con bisect) y trigramas -> filas
+        pares = sorted((tok, i) for i, nom in enumerate(plegados) for tok in set(nom.split()))
+        self._tok_ord = [t for t, _ in pares]
+        self._tok_fila = np.array([i for _, i in pares], dtype=np.intp)
+
+        por_tri = {}
+        for i, nom in enumerate(plegados):
+            for tri in trigramas(nom):
+                por_tri.setdefault(tri, []).append(i)
+        self._tri = {t: np.array(filas, dtype=np.intp) for t, filas in por_tri.items()}
+
+    @classmethod
+    def desde_personal(cls, df):
+        """Índice de la pestaña PERSONAL: 'apellidos nombres' como en la cabecera de Consulta."""
+        vacio = pd.Series([""] * len(df), index=df.index)
+        apellidos = df.get("apellidos", vacio).fillna("").astype(str)
+        nombres = df.get("nombres", vacio).fillna("").astype(str)
+        dnis = df.get("dni", vacio).fillna("").astype(str)
+        # Lo que comparaba la Nómina: apellidos y nombres en minúsculas, DNI sin espacios
+        textos = list(zip(apellidos.str.lower(), nombres.str.lower(), dnis.str.strip()))
+        return cls(dnis.tolist(), (apellidos.str.strip() + " " + nombres.str.strip()).str.strip().tolist(), textos)
+
+    def __len__(self):
+        return len(self.dnis)
+
+    def etiqueta(self, fila):
+        return f"{self.dnis[fila]} - {self.nombres[fila]}"
+
+    def _prefijo(self, ordenados, filas, prefijo):
+        desde = bisect_left(ordenados, prefijo)
+        hasta = bisect_left(ordenados, prefijo + "\uffff")
+        return filas[desde:hasta]
+
+    def _parecido(self, tris):
+        """Fracción de los trigramas dados que aparece en cada nombre."""
+        presentes = [self._tri[t] for t in tris if t in self._tri]
+        if not presentes:
+            return np.zeros(len(self.dnis))
+        return np.bincount(np.concatenate(presentes), minlength=len(self.dnis)) / len(tris)
+
+    def contiene(self, consulta):
+        """Posiciones de fila, en el orden de la pestaña, con algún campo que contiene el texto (str.contains)."""
+        consulta = str(consulta).strip().lower()
+        if not consulta:
+            return []
+        if "\n" in consulta:
+            return []
+        return [i for i, texto in enumerate(self._textos) if consulta in texto]
+
+    def buscar(self, consulta, limite=LIMITE_RESULTADOS, parecido_minimo=PARECIDO_MINIMO):
+        """Posiciones de fila de las mejores coincidencias, de mayor a menor puntaje (limite=None: todas)."""
+        consulta = plegar(consulta)
+        if not consulta or not len(self.dnis):
+            return []
+        puntaje = np.zeros(len(self.dnis))
+
+        palabras = consulta.split()
+        numeros = [p for p in palabras if p.isdigit()]
+        letras = [p for p in palabras if not p.isdigit()]
+
+        # 1. DNI: exacto pesa más que prefijo, y prefijo más que dígitos en medio
+        for num in numeros:
+            puntaje[[num in d for d in self.dnis]] += 5
+            filas = self._prefijo(self._dni_ord, self._dni_fila, num)
+            puntaje[filas] += 10
+            exactas = filas[[self.dnis[i] == num for i in filas]] if len(filas) else _SIN_FILAS
+            puntaje[exactas] += 10
+
+        # 2. Palabras del nombre por prefijo: cada palabra de la búsqueda suma una vez por persona
+        for palabra in letras:
+            aciertos = np.zeros(len(self.dnis), dtype=bool)
+            aciertos[self._prefijo(self._tok_ord, self._tok_fila, palabra)] = True
+            puntaje[aciertos] += 2
+
+        # 3. Trigramas: con relleno toleran errores de tipeo; los interiores, si están todos,
+        #    equivalen a encontrar el texto en medio de una palabra (lo que hacía str.contains)
+        texto = " ".join(letras)
+        parecido = np.maximum(self._parecido(trigramas(texto)),
+                              np.floor(self._parecido(trigramas(texto, relleno=False))))
+        puntaje += np.where(parecido >= parecido_minimo, parecido, 0)
+
+        puntaje[~self._validas] = 0
+        candidatas = np.flatnonzero(puntaje > 0)
+        # Mayor puntaje primero; a igual puntaje, el orden de la pestaña
+        orden = candidatas[np.argsort(-puntaje[candidatas], kind="stable")].tolist()
+        return orden if limite is None else orden[:limite]
+
+
+def indice_personal(dfs):
+    """Índice de búsqueda de PERSONAL: con el libro de la app se arma una sola vez por versión."""
+    if hasattr(dfs, "derivado"):
+        return dfs.derivado("PERSONAL", "busqueda", IndiceBusqueda.desde_personal)
+    return IndiceBusqueda.desde_personal(dfs.get("PERSONAL", pd.DataFrame()))
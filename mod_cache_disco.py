@@ -0,0 +1,224 @@
+# ==========================================
+# MÓDULO: FOTO DEL LIBRO EN DISCO (ARRANQUE EN CALIENTE)
+# ==========================================
+# Guardamos en disco el diccionario dfs ya normalizado (pickle) junto con un JSON de metadatos
+# (versión, fecha en que se tomó y filas por pestaña). Al arrancar se sirve la foto al instante
+# y, si está vieja, se revalida contra el backend en un hilo aparte.
+import json
+import os
+import pickle
+import tempfile
+import threading
+from datetime import datetime
+
+import mod_cuota
+
+FORMATO = 1
+CARPETA = ".cache_gth"
+
+
+def _rutas(nombre, carpeta=CARPETA):
+    return os.path.join(carpeta, f"{nombre}_libro.pkl"), os.path.join(carpeta, f"{nombre}_libro.json")
+
+
+def _escribir_atomico(ruta, datos):
+    carpeta = os.path.dirname(os.path.abspath(ruta))
+    os.makedirs(carpeta, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=carpeta)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(datos)
+        os.replace(tmp, ruta)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+
+def leer_foto(nombre, carpeta=CARPETA):
+    """Devuelve {"version", "tomado", "filas", "dfs"} o None si no hay foto válida."""
+    ruta_pkl, ruta_meta = _rutas(nombre, carpeta)
+    try:
+        with open(ruta_meta, encoding="utf-8") as f:
+            meta = json.load(f)
+        if meta.get("formato") != FORMATO:
+            return None
+        with open(ruta_pkl, "rb") as f:
+            foto = pickle.load(f)
+    except Exception:
+        # Foto inexistente, a medias o de otra versión de pandas: se descarga de nuevo
+        return None
+
+    # El pickle y el JSON deben ser de la misma versión y cuadrar fila por fila
+    if foto.get("version") != meta.get("version"):
+        return None
+    if {h: len(df) for h, df in foto["dfs"].items()} != meta.get("filas"):
+        return None
+
+    foto["tomado"] = datetime.fromisoformat(meta["tomado"])
+    foto["filas"] = meta["filas"]
+    foto["titulos"] = meta.get("titulos") or list(foto["dfs"])
+    return foto
+
+
+def escribir_foto(nombre, dfs, version, tomado=None, titulos=None, carpeta=CARPETA):
+    tomado = tomado or datetime.now()
+    ruta_pkl, ruta_meta = _rutas(nombre, carpeta)
+    meta = {
+        "formato": FORMATO,
+        "version": version,
+        "tomado": tomado.isoformat(timespec="seconds"),
+        # Todas las pestañas del libro, aunque la foto solo guarde las que se llegaron a abrir
+        "titulos": list(titulos) if titulos is not None else list(dfs),
+        "filas": {h: len(df) for h, df in dfs.items()},
+    }
+    # Primero el pickle y al final el JSON: si se corta a medias, leer_foto lo descarta
+    _escribir_atomico(ruta_pkl, pickle.dumps({"version": version, "dfs": dfs}, protocol=pickle.HIGHEST_PROTOCOL))
+    _escribir_atomico(ruta_meta, json.dumps(meta, ensure_ascii=False, indent=1).encode("utf-8"))
+    return meta
+
+
+class CacheDisco:
+    """
+    Sirve la foto de disco y la revalida contra el backend en segundo plano (stale-while-revalidate).
+    La foto puede ser parcial: cada pestaña se descarga la primera vez que alguien la pide.
+    """
+
+    def __init__(self, backend, frescura=240, carpeta=CARPETA, al_actualizar=None):
+        self.backend = backend
+        self.frescura = frescura
+        self.carpeta = carpeta
+        self.al_actualizar = al_actualizar
+        self.version = 0
+        self.tomado = None
+        self.filas = {}
+        self.revalidando = False
+        self.ultimo_error = None
+        self._titulos = None
+        self._lock = threading.RLock()
+        self._generacion = 0
+        self._forzar = False
+        # Gancho: mientras haya escrituras pendientes en la cola no tiene sentido descargar
+        self.escrituras_pendientes = lambda: False
+
+    # ---------- Lectura ----------
+    def titulos(self):
+        """Nombres de todas las pestañas del libro (de la foto si existe; si no, del backend)."""
+        with self._lock:
+            if self._titulos is None:
+                foto = leer_foto(self.backend.nombre, self.carpeta)
+                if foto is not None:
+                    self._titulos = foto["titulos"]
+        if self._titulos is None:
+            titulos = self.backend.hojas()
+            with self._lock:
+                self._titulos = titulos
+        return list(self._titulos)
+
+    def cargar(self, titulos):
+        """Devuelve (dfs, errores) de las pestañas pedidas: de la foto las que tenga, del backend las que falten."""
+        foto = leer_foto(self.backend.nombre, self.carpeta)
+        if foto is not None:
+            with self._lock:
+                self.version, self.tomado, self.filas = foto["version"], foto["tomado"], foto["filas"]
+        en_foto = foto["dfs"] if foto is not None else {}
+
+        faltan = [t for t in titulos if t not in en_foto]
+        nuevas, errores = self.backend.cargar(faltan) if faltan else ({}, {})
+        descargadas = {h: df for h, df in nuevas.items() if h not in errores}
+        if descargadas:
+            self._agregar_a_foto(descargadas)
+
+        if foto is not None and self.vencida():
+            self.revalidar_en_segundo_plano()
+
+        dfs = {t: en_foto[t] for t in titulos if t in en_foto}
+        dfs.update(nuevas)
+        return dfs, errores
+
+    def edad_segundos(self):
+        return (datetime.now() - self.tomado).total_seconds() if self.tomado else None
+
+    def vencida(self):
+        edad = self.edad_segundos()
+        return self._forzar or (edad is not None and edad > self.frescura)
+
+    # ---------- Revalidación ----------
+    def revalidar_en_segundo_plano(self):
+        if self.escrituras_pendientes():
+            return False
+        with self._lock:
+            if self.revalidando:
+                return False
+            self.revalidando = True
+            generacion = self._generacion
+        threading.Thread(target=self._revalidar, args=(generacion,), name="revalidar-libro", daemon=True).start()
+        return True
+
+    def _revalidar(self, generacion):
+        try:
+            # Solo se vuelven a descargar las pestañas que alguien ya abrió (las que están en la foto)
+            foto = leer_foto(self.backend.nombre, self.carpeta)
+            titulos = list(foto["dfs"]) if foto is not None else []
+            # Descarga de fondo: cede el paso a las lecturas interactivas
+            with mod_cuota.prioridad(mod_cuota.FONDO):
+                todos = self.backend.hojas()
+                dfs, errores = self.backend.cargar([t for t in titulos if t in todos])
+            if errores:
+                self.ultimo_error = "; ".join(f"{h}: {e}" for h, e in errores.items())
+                return
+            with self._lock:
+                # Si alguien guardó mientras descargábamos, esta descarga ya nació vieja y se descarta
+                if generacion != self._generacion:
+                    return
+                self._titulos = todos
+                # Sumamos lo que se haya abierto mientras tanto (descargas perezosas)
+                actual = leer_foto(self.backend.nombre, self.carpeta)
+                base = actual["dfs"] if actual is not None else {}
+                base.update(dfs)
+                self._registrar(base)
+                self._forzar = False
+                self.ultimo_error = None
+                # Se avisa dentro del candado: un guardado que llegue ahora espera y queda por encima
+                if self.al_actualizar:
+                    self.al_actualizar(dfs)
+        except Exception as e:
+            self.ultimo_error = str(e)
+        finally:
+            with self._lock:
+                self.revalidando = False
+
+    # ---------- Escritura ----------
+    def _registrar(self, dfs, tomado=None):
+        with self._lock:
+            self.version += 1
+            meta = escribir_foto(self.backend.nombre, dfs, self.version, tomado=tomado,
+                                 titulos=self._titulos, carpeta=self.carpeta)
+            self.tomado = datetime.fromisoformat(meta["tomado"])
+            self.filas = meta["filas"]
+
+    def _agregar_a_foto(self, hojas, reemplazar=False):
+        with self._lock:
+            foto = leer_foto(self.backend.nombre, self.carpeta)
+            if foto is None:
+                self._registrar(dict(hojas))
+                return
+            for titulo, df in hojas.items():
+                # Una descarga perezosa no pisa lo que un guardado dejó mientras tanto
+                if reemplazar or titulo not in foto["dfs"]:
+                    foto["dfs"][titulo] = df
+            # Conservamos la fecha de la foto: las demás pestañas siguen teniendo la misma antigüedad
+            self._registrar(foto["dfs"], tomado=foto["tomado"])
+
+    def marcar_escritura(self, fallida=False):
+        """La cola terminó de escribir: las descargas en curso quedan viejas; si falló, hay que volver a descargar."""
+        with self._lock:
+            self._generacion += 1
+            if fallida:
+                self._forzar = True
+
+    def actualizar_hojas(self, hojas):
+        """Tras un guardado: reemplaza en la foto solo las pestañas escritas (ya normalizadas), sin volver a descargar."""
+        with self._lock:
+            self._generacion += 1
+            if leer_foto(self.backend.nombre, self.carpeta) is not None:
+                self._agregar_a_foto(hojas, reemplazar=True)
@@ -0,0 +1,315 @@
+# ==========================================
+# MÓDULO: CACHÉ POR PESTAÑA CON VERSIONES
+# ==========================================
+# Reemplaza al st.cache_data + st.cache_data.clear(): el libro vive una sola vez por proceso,
+# cada pestaña tiene su número de versión y un guardado solo actualiza las pestañas que escribió.
+# Las demás sesiones ven la versión nueva en su siguiente recarga sin descargar nada.
+# Las pestañas se descargan recién cuando algún módulo las pide (libro perezoso).
+import threading
+from collections.abc import MutableMapping
+
+import pandas as pd
+
+import mod_datos
+import mod_esquema
+import mod_indice
+
+
+class LibroDatos(MutableMapping):
+    """
+    El 'dfs' que reciben los módulos: se comporta como un diccionario {pestaña: DataFrame},
+    pero cada pestaña se trae de la caché la primera vez que se lee (y es una copia propia de la sesión).
+    """
+
+    def __init__(self, cache, al_error=None):
+        self._cache = cache
+        self._al_error = al_error
+        self._locales = {}
+        self._borradas = set()
+        self.versiones = {}
+
+    def precargar(self, titulos):
+        """Trae de una sola vez (un batchGet en Sheets) todas las pestañas que el módulo va a usar."""
+        faltan = [t for t in titulos if t not in self._locales and t not in self._borradas]
+        if not faltan:
+            return
+        hojas, versiones, errores = self._cache.hojas(faltan)
+        self._locales.update(hojas)
+        self.versiones.update(versiones)
+        for titulo, error in errores.items():
+            self._locales[titulo] = pd.DataFrame()
+            if self._al_error:
+                self._al_error(titulo, error)
+
+    def cargadas(self):
+        """Pestañas que esta sesión ya tiene en memoria (las únicas que pudo modificar)."""
+        return list(self._locales)
+
+    def version(self, titulo):
+        return self.versiones.get(titulo, 0)
+
+    def tipada(self, titulo):
+        """
+        Vista tipada (fechas, DNI, números) de la versión guardada de la pestaña, alineada por índice con
+        la copia de la sesión. Si la sesión reemplazó la pestaña sin guardar, se tipa su copia local.
+        """
+        if titulo in self._locales and self._locales[titulo] is not None:
+            if self.versiones.get(titulo) != self._cache.version(titulo):
+                return mod_esquema.aplicar_esquema(titulo, self._locales[titulo])
+        return self._cache.tipada(titulo)
+
+    def derivado(self, titulo, nombre, construir, actualizar=None):
+        """
+        construir(pestaña) calculado una sola vez por versión (índices de búsqueda, vistas, etc.).
+        titulo puede ser una tupla de pestañas: construir recibe una por argumento.
+        Si la sesión cambió su copia de alguna pestaña, se calcula sobre esa copia.
+        """
+        titulos = titulo if isinstance(titulo, tuple) else (titulo,)
+        dfs = [self[t] if t in self else pd.DataFrame() for t in titulos]
+        if any(self.versiones.get(t) != self._cache.version(t) for t in titulos):
+            return construir(*dfs)
+        return self._cache.derivado(titulo, nombre, construir, actualizar)
+
+    def get_employee(self, dni, titulos):
+        """
+        {pestaña: filas del DNI} en todas las pestañas pedidas, sin barrer ninguna: las posiciones salen
+        del índice por DNI de la caché. Si la sesión ya cambió su copia de una pestaña, esa se filtra a mano.
+        """
+        self.precargar(titulos)
+        ficha = {}
+        for titulo in titulos:
+            df = self._locales.get(titulo)
+            if df is None:
+                ficha[titulo] = pd.DataFrame()
+                continue
+            indice = None
+            if self.versiones.get(titulo) == self._cache.version(titulo):
+                indice = self._cache.indice(titulo)
+            if indice is not None and len(indice) == len(df):
+                ficha[titulo] = df.iloc[indice.posiciones(dni)]
+            else:
+                ficha[titulo] = mod_indice.filas_de(df, dni)
+        return ficha
+
+    def __getitem__(self, titulo):
+        if titulo not in self._locales:
+            if titulo not in self:
+                raise KeyError(titulo)
+            self.precargar([titulo])
+        return self._locales[titulo]
+
+    def __setitem__(self, titulo, df):
+        self._locales[titulo] = df
+        self._borradas.discard(titulo)
+
+    def __delitem__(self, titulo):
+        if titulo not in self:
+            raise KeyError(titulo)
+        self._locales.pop(titulo, None)
+        self._borradas.add(titulo)
+
+    def __contains__(self, titulo):
+        if titulo in self._locales:
+            return True
+        return titulo not in self._borradas and titulo in self._cache.titulos()
+
+    def __iter__(self):
+        vistos = [t for t in self._cache.titulos() if t not in self._borradas]
+        return iter(vistos + [t for t in self._locales if t not in vistos])
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+
+class CacheHojas:
+    def __init__(self, origen):
+        # origen: CacheDisco (foto en disco + revalidación en segundo plano)
+        self.origen = origen
+        self._hojas = {}
+        self._versiones = {}
+        self._tipadas = {}
+        self._indices = {}
+        self._derivados = {}
+        self._lock = threading.Lock()
+        self._lock_carga = threading.Lock()
+
+    def _poner(self, titulo, df):
+        # Solo sube la versión si el contenido realmente cambió
+        actual = self._hojas.get(titulo)
+        if actual is not None and actual.equals(df) and list(actual.columns) == list(df.columns):
+            return False
+        self._hojas[titulo] = df
+        self._versiones[titulo] = self._versiones.get(titulo, 0) + 1
+        return True
+
+    def titulos(self):
+        return self.origen.titulos()
+
+    def libro(self, al_error=None):
+        return LibroDatos(self, al_error=al_error)
+
+    def hojas(self, titulos):
+        """Devuelve ({pestaña: copia}, versiones, errores). Descarga en un solo lote las que aún no estén."""
+        existentes = set(self.titulos())
+        titulos = [t for t in titulos if t in existentes]
+        errores = {}
+
+        with self._lock:
+            faltan = [t for t in titulos if t not in self._hojas]
+        if faltan:
+            with self._lock_carga:
+                with self._lock:
+                    faltan = [t for t in faltan if t not in self._hojas]
+                if faltan:
+                    dfs, errores = self.origen.cargar(faltan)
+                    with self._lock:
+                        for titulo, df in dfs.items():
+                            # Las que fallaron no se guardan: se reintentan en la próxima lectura
+                            # y si una revalidación ya trajo algo más nuevo, no lo pisamos
+                            if titulo not in errores and titulo not in self._hojas:
+                                self._poner(titulo, df)
+
+        # Fuera de los candados: la revalidación avisa de vuelta a reemplazar()
+        if self.origen.vencida():
+            self.origen.revalidar_en_segundo_plano()
+
+        with self._lock:
+            hojas = {t: self._hojas[t] for t in titulos if t in self._hojas}
+            versiones = {t: self._versiones.get(t, 0) for t in hojas}
+        return {t: df.copy() for t, df in hojas.items()}, versiones, errores
+
+    def version(self, titulo):
+        with self._lock:
+            return self._versiones.get(titulo, 0)
+
+    def tipada(self, titulo):
+        """Vista con fechas/DNI/números ya convertidos (mod_esquema). Se calcula una sola vez por versión."""
+        self.hojas([titulo])
+        with self._lock:
+            df = self._hojas.get(titulo)
+            version = self._versiones.get(titulo, 0)
+            guardada = self._tipadas.get(titulo)
+        if df is None:
+            return pd.DataFrame()
+        if guardada is not None and guardada[0] == version:
+            return guardada[1].copy()
+
+        vista = mod_esquema.aplicar_esquema(titulo, df)
+        with self._lock:
+            # Si mientras tanto llegó otra versión, esta vista ya nació vieja: no se guarda
+            if self._versiones.get(titulo, 0) == version:
+                self._tipadas[titulo] = (version, vista)
+        return vista.copy()
+
+    def indice(self, titulo):
+        """
+        IndiceDni de la versión actual de la pestaña (None si no tiene columna dni).
+        Al cambiar de versión se parte del índice anterior: si solo se agregaron filas, se extiende.
+        """
+        with self._lock:
+            df = self._hojas.get(titulo)
+            version = self._versiones.get(titulo, 0)
+            guardado = self._indices.get(titulo)
+        if guardado is not None and guardado[0] == version:
+            return guardado[1]
+        dnis = mod_indice.dnis_de(df)
+        if dnis is None:
+            return None
+
+        indice = guardado[1].actualizado(dnis) if guardado is not None and guardado[1] is not None else mod_indice.IndiceDni(dnis)
+        with self._lock:
+            if self._versiones.get(titulo, 0) == version:
+                self._indices[titulo] = (version, indice)
+        return indice
+
+    def derivado(self, titulo, nombre, construir, actualizar=None):
+        """
+        Resultado de construir(pestaña) guardado por (pestaña, nombre) mientras no cambie la versión.
+        titulo puede ser una tupla de pestañas (construir recibe una por argumento). Con actualizar,
+        una versión nueva parte del resultado anterior: actualizar(anterior, pestañas_previas, pestañas).
+        """
+        titulos = titulo if isinstance(titulo, tuple) else (titulo,)
+        self.hojas(list(titulos))
+        clave = (titulo, nombre)
+        with self._lock:
+            dfs = tuple(self._hojas.get(t, pd.DataFrame()) for t in titulos)
+            version = tuple(self._versiones.get(t, 0) for t in titulos)
+            guardado = self._derivados.get(clave)
+        if guardado is not None and guardado[0] == version:
+            return guardado[1]
+
+        if guardado is not None and actualizar is not None:
+            valor = actualizar(guardado[1], guardado[2], dfs)
+        else:
+            valor = construir(*dfs)
+        with self._lock:
+            if tuple(self._versiones.get(t, 0) for t in titulos) == version:
+                self._derivados[clave] = (version, valor, dfs, construir, actualizar)
+        return valor
+
+    def reemplazar(self, dfs):
+        """Llega una revalidación: solo cambian de versión las pestañas cuyo contenido es distinto."""
+        with self._lock:
+            for titulo, df in dfs.items():
+                self._poner(titulo, df)
+
+    def registrar_guardado(self, dfs, pestana_especifica=None):
+        """Después de save_data: actualiza en memoria (y en la foto de disco) solo las pestañas escritas."""
+        hojas = {h: mod_datos.releer_como_guardado(h, dfs[h]) for h in mod_datos.pestanas_a_guardar(dfs, pestana_especifica)}
+
+        with self._lock:
+            cambiadas = {h: df for h, df in hojas.items() if not (h in self._hojas and self._hojas[h].equals(df))}
+
+        # Primero la foto de disco: así cualquier revalidación en curso (ya vieja) queda descartada
+        if cambiadas:
+            self.origen.actualizar_hojas(cambiadas)
+        with self._lock:
+            for titulo, df in cambiadas.items():
+                self._poner(titulo, df)
+            indexadas = [t for t in cambiadas if t in self._indices]
+            incrementales = [(clave, g[3], g[4]) for clave, g in self._derivados.items()
+                             if g[4] is not None and set(cambiadas) & set(clave[0] if isinstance(clave[0], tuple) else (clave[0],))]
+        # El índice por DNI se pone al día enseguida (si solo se agregaron filas, se extiende en el lugar)
+        for titulo in indexadas:
+            self.indice(titulo)
+        # Igual las vistas que saben actualizarse por partes (solo se recalculan los DNI tocados)
+        for (titulo, nombre), construir, actualizar in incrementales:
+            self.derivado(titulo, nombre, construir, actualizar)
+        return list(cambiadas)
+
+
+# ==========================================
+# LIBRO SIN APP (SCRIPTS, CLI, PAQUETE MENSUAL)
+# ==========================================
+class OrigenDirecto:
+    """
+    Origen para CacheHojas fuera de Streamlit: un backend de mod_almacenamiento o un {pestaña: DataFrame}
+    ya cargado. Sin foto en disco ni revalidación; solo sirve para compartir vistas tipadas y derivadas.
+    """
+
+    def __init__(self, fuente):
+        self.fuente = fuente
+
+    def titulos(self):
+        return list(self.fuente) if isinstance(self.fuente, dict) else self.fuente.hojas()
+
+    def cargar(self, titulos):
+        if isinstance(self.fuente, dict):
+            return {t: self.fuente[t] for t in titulos if t in self.fuente}, {}
+        return self.fuente.cargar(titulos)
+
+    def vencida(self):
+        return False
+
+    def revalidar_en_segundo_plano(self):
+        pass
+
+    def actualizar_hojas(self, hojas):
+        pass
+
+
+def libro_directo(fuente, al_error=None):
+    """LibroDatos sobre un backend o un diccionario: las vistas (contrato vigente, tipadas) se calculan una vez."""
+    if isinstance(fuente, LibroDatos):
+        return fuente
+    return CacheHojas(OrigenDirecto(fuente)).libro(al_error=al_error)
@@ -0,0 +1,266 @@
+# ==========================================
+# MÓDULO: CERTIFICADOS DE TRABAJO Y CONSTANCIAS DE SERVICIOS
+# ==========================================
+# Antes app.py armaba el Word completo (con las imágenes de encabezado y pie) en cada recarga de la
+# pestaña CONTRATOS, solo para tener listo el botón de descarga. Ahora:
+#   - el documento se arma recién cuando se pulsa "Descargar" (st.download_button con data diferida)
+#   - los bytes quedan en DOCUMENTOS por (dni, huella de los contratos, tipo, fecha de emisión)
+#   - la hoja A4 con márgenes, encabezado y pie se prepara una sola vez por proceso (_documento_base)
+import hashlib
+import multiprocessing
+import os
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import date
+from functools import lru_cache
+from io import BytesIO
+
+import pandas as pd
+from docx import Document
+from docx.enum.text import WD_ALIGN_PARAGRAPH
+from docx.shared import Pt, Inches
+
+import mod_busqueda
+import mod_contratos
+import mod_esquema
+import mod_ficha
+import mod_memo
+
+# Firma de los certificados
+F_N = "MG. ARTURO JAVIER GALINDO MARTINEZ"
+F_C = "JEFE DE GESTIÓN DEL TALENTO HUMANO"
+
+ENCABEZADO = "header.png"
+PIE = "footer.png"
+
+
+@lru_cache(maxsize=1)
+def _documento_base():
+    """Hoja A4 con márgenes, encabezado y pie (imágenes cargadas una vez), guardada como bytes .docx."""
+    doc = Document()
+    section = doc.sections[0]
+    section.page_height, section.page_width = Inches(11.69), Inches(8.27)
+    section.top_margin, section.bottom_margin = Inches(1.6), Inches(1.2)
+
+    if os.path.exists(ENCABEZADO):
+        p_h = section.header.paragraphs[0]
+        p_h.paragraph_format.left_indent = Inches(-1.0)
+        p_h.add_run().add_picture(ENCABEZADO, width=Inches(8.27))
+
+    if os.path.exists(PIE):
+        p_f = section.footer.paragraphs[0]
+        p_f.paragraph_format.left_indent = Inches(-1.0)
+        p_f.add_run().add_picture(PIE, width=Inches(8.27))
+
+    buf = BytesIO()
+    doc.save(buf)
+    return buf.getvalue()
+
+
+def gen_word(nom, dni, df_c, tipo_seleccionado=mod_ficha.AUTOMATICO, legajo=None, fecha_emision=None):
+    doc = Document(BytesIO(_documento_base()))
+    fecha_emision = fecha_emision or date.today()
+
+    # =========================================================================
+    # 🎯 FILTRO DE TIPO DE TRABAJADOR Y MODALIDAD (PLANILLA / LOCACIÓN)
+    # =========================================================================
+    if legajo is None:
+        legajo = mod_ficha.HistorialContratos(mod_ficha.get_consolidated_contracts(df_c))
+    df_merged = legajo.contratos_consolidados
+    # Detección automática por el último contrato, o la opción forzada en el menú
+    es_docente, es_locacion = legajo.tipo_certificado(tipo_seleccionado)
+
+    # =========================================================================
+    # 📝 REDACCIÓN DINÁMICA SEGÚN LOS 4 TIPOS DE CERTIFICADO
+    # =========================================================================
+    titulo_certificado = "CERTIFICADO DE TRABAJO"
+    texto_introduccion = "La oficina de Gestión de Talento Humano De La Universidad Privada De Huancayo “Franklin Roosevelt”, certifica que:"
+    texto_cuerpo_identificacion = ""
+    columna_tabla_cargo = "CARGO / FUNCIÓN"
+
+    if not es_docente and not es_locacion:
+        titulo_certificado = "CERTIFICADO DE TRABAJO"
+        texto_cuerpo_identificacion = f"El(la) ex-servidor(a) administrativo(a) {nom.upper()}, identificado(a) con DNI N° {dni}, ha laborado en nuestra institución bajo el régimen laboral de la actividad privada, desempeñando funciones de manera subordinada de acuerdo al siguiente detalle:"
+        
+    elif not es_docente and es_locacion:
+        titulo_certificado = "CONSTANCIA DE PRESTACIÓN DE SERVICIOS"
+        texto_introduccion = "La oficina de Gestión de Talento Humano De La Universidad Privada De Huancayo “Franklin Roosevelt”, hace constar que:"
+        texto_cuerpo_identificacion = f"El(la) señor(a) {nom.upper()}, identificado(a) con DNI N° {dni}, ha prestado servicios autónomos e independientes de naturaleza civil bajo la modalidad de Locación de Servicios, realizando actividades de índole administrativa según el siguiente detalle:"
+        columna_tabla_cargo = "ACTIVIDAD / SERVICIO"
+        
+    elif es_docente and not es_locacion:
+        titulo_certificado = "CERTIFICADO DE TRABAJO"
+        texto_cuerpo_identificacion = f"El(la) docente {nom.upper()}, identificado(a) con DNI N° {dni}, ha laborado en nuestra casa de estudios superiores ejerciendo funciones pedagógicas y de cátedra universitaria, bajo el régimen laboral correspondiente, de acuerdo al siguiente detalle:"
+        
+    elif es_docente and es_locacion:
+        titulo_certificado = "CONSTANCIA DE LOCACIÓN DE SERVICIOS DOCENTES"
+        texto_introduccion = "La oficina de Gestión de Talento Humano De La Universidad Privada De Huancayo “Franklin Roosevelt”, hace constar que:"
+        texto_cuerpo_identificacion = f"El(la) profesional {nom.upper()}, identificado(a) con DNI N° {dni}, ha prestado servicios profesionales independientes de docencia universitaria bajo el régimen civil de Locación de Servicios, dictando asignaturas académicas de acuerdo al siguiente detalle:"
+        columna_tabla_cargo = "CÁTEDRA / ASIGNATURA"
+
+    # =========================================================================
+    # 🏢 CONSTRUCCIÓN DEL DOCUMENTO WORD
+    # =========================================================================
+    p_tit = doc.add_paragraph()
+    p_tit.alignment = WD_ALIGN_PARAGRAPH.CENTER
+    r_tit = p_tit.add_run(titulo_certificado)  # <-- Aquí ya tiene el nombre de variable correcto
+    r_tit.bold, r_tit.font.name, r_tit.font.size = True, 'Arial', Pt(18)
+
+    p_intro = doc.add_paragraph(f"\n{texto_introduccion}")
+    p_intro.alignment = WD_ALIGN_PARAGRAPH.JUSTIFY
+    p_intro.paragraph_format.line_spacing = 1.15
+
+    p_inf = doc.add_paragraph()
+    p_inf.alignment = WD_ALIGN_PARAGRAPH.JUSTIFY
+    p_inf.paragraph_format.line_spacing = 1.15
+    p_inf.add_run(texto_cuerpo_identificacion)
+
+    t = doc.add_table(rows=1, cols=3)
+    t.style = 'Table Grid'
+    
+    for i, h in enumerate([columna_tabla_cargo, "FECHA INICIO", "FECHA FIN"]):
+        celda = t.rows[0].cells[i]
+        celda.text = h
+        celda.paragraphs[0].runs[0].font.bold = True
+        celda.paragraphs[0].runs[0].font.name = 'Arial'
+
+    for _, fila in df_merged.iterrows():
+        celdas = t.add_row().cells
+        celdas[0].text = str(fila.get('cargo', fila.get('puesto', ''))).upper()
+        celdas[1].text = pd.to_datetime(fila['f_inicio']).strftime('%d/%m/%Y') if pd.notnull(fila['f_inicio']) else ""
+        celdas[2].text = pd.to_datetime(fila['f_fin']).strftime('%d/%m/%Y') if pd.notnull(fila['f_fin']) else "AL ACTUALIDAD"
+        
+        for celda in celdas:
+            if celda.paragraphs[0].runs:
+                celda.paragraphs[0].runs[0].font.name = 'Arial'
+                celda.paragraphs[0].runs[0].font.size = Pt(10)
+
+    p_cierre = doc.add_paragraph("\nSe expide el presente a solicitud del interesado para los fines que considere convenientes.")
+    p_cierre.alignment = WD_ALIGN_PARAGRAPH.JUSTIFY
+    
+    p_fecha = doc.add_paragraph(f"\nHuancayo, {fecha_emision.strftime('%d/%m/%Y')}")
+    p_fecha.alignment = WD_ALIGN_PARAGRAPH.RIGHT
+    p_fecha.runs[0].font.name = 'Arial'
+    
+    f = doc.add_paragraph()
+    f.alignment = WD_ALIGN_PARAGRAPH.CENTER
+    f_run = f.add_run("\n\n__________________________\n" + F_N + "\n" + F_C)
+    f_run.bold = True
+    f_run.font.name = 'Arial'
+
+    buf = BytesIO()
+    doc.save(buf)
+    buf.seek(0)
+    return buf
+
+
+# Documentos ya generados: se reutilizan mientras no cambien los contratos, el tipo ni la fecha de emisión
+DOCUMENTOS = mod_memo.MemoLRU(capacidad=64)
+
+
+def huella_contratos(nom, df_merged):
+    """Resumen (sha1) del nombre y los contratos fusionados que van impresos en el documento."""
+    h = hashlib.sha1(str(nom).encode("utf-8"))
+    if not df_merged.empty:
+        h.update(pd.util.hash_pandas_object(df_merged.astype(str), index=False).to_numpy().tobytes())
+    return h.hexdigest()
+
+
+def certificado(nom, dni, legajo, tipo_seleccionado, fecha_emision=None):
+    """Bytes del .docx desde DOCUMENTOS, o recién generados si cambió algo de lo que va impreso."""
+    fecha_emision = fecha_emision or date.today()
+    clave = (dni, huella_contratos(nom, legajo.contratos_consolidados), tipo_seleccionado, fecha_emision)
+    return DOCUMENTOS.obtener(
+        clave, lambda: gen_word(nom, dni, None, tipo_seleccionado, legajo=legajo, fecha_emision=fecha_emision).getvalue())
+
+
+# ==========================================
+# CERTIFICADOS EN LOTE (ZIP CON PROCESOS EN PARALELO)
+# ==========================================
+# Para emitir los certificados de toda una cohorte (por ejemplo, a quienes se les venció el contrato en
+# el semestre) sin buscarlos uno por uno en Consulta. Cada proceso de trabajo arma una tanda de documentos
+# con la misma lógica de 4 tipos (docente / locación) y el ZIP se va escribiendo a medida que llegan.
+
+# Documentos por tarea enviada a un proceso (reparte el costo de mandar y recibir datos)
+POR_TANDA = 16
+
+
+def _iguales(valores, dnis, buscado):
+    """Por DNI: el valor (sin espacios ni mayúsculas) coincide con el buscado; sin dato no coincide."""
+    valores = valores.astype(str).str.strip().str.upper().reindex(dnis)
+    return valores.eq(str(buscado).strip().upper()).fillna(False).to_numpy(dtype=bool)
+
+
+def cohorte(dfs, dnis=None, sede=None, area=None, fin_desde=None, fin_hasta=None):
+    """
+    DNI con contratos que cumplen todos los filtros indicados: lista de DNI, sede (DATOS GENERALES),
+    área del contrato vigente (mod_contratos) y rango de fin del último tramo de contratos (los vigentes sin fin no entran).
+    """
+    vista = mod_contratos.contratos_consolidados(dfs).df
+    if vista.empty:
+        return []
+    ultimos = vista.groupby("dni", sort=False).tail(1).set_index("dni")
+    sel = pd.Series(True, index=ultimos.index)
+
+    if dnis:
+        sel &= ultimos.index.isin(mod_esquema.normalizar_dni(pd.Series(list(dnis), dtype=object)))
+    if sede:
+        gen = mod_esquema.tipada(dfs, "DATOS GENERALES")
+        sedes = gen.drop_duplicates("dni").set_index("dni")["sede"] if "sede" in gen.columns else pd.Series(dtype=object)
+        sel &= _iguales(sedes, ultimos.index, sede)
+    if area:
+        # Área del contrato vigente: la misma regla de "último contrato" que los reportes
+        vigente = mod_contratos.contrato_vigente(dfs)
+        areas = vigente["area"] if "area" in vigente.columns else pd.Series(dtype=object)
+        sel &= _iguales(areas, ultimos.index, area)
+    if fin_desde:
+        sel &= ultimos["f_fin"] >= pd.Timestamp(fin_desde)
+    if fin_hasta:
+        sel &= ultimos["f_fin"] <= pd.Timestamp(fin_hasta)
+    return ultimos.index[sel.to_numpy(dtype=bool)].tolist()
+
+
+def tareas_lote(dfs, dnis, tipo_seleccionado=mod_ficha.AUTOMATICO, fecha_emision=None):
+    """Lo que necesita cada proceso de trabajo por documento: (nombre, dni, tramos, tipo, fecha de emisión)."""
+    vista = mod_contratos.contratos_consolidados(dfs)
+    indice = mod_busqueda.indice_personal(dfs)
+    nombres = dict(zip(indice.dnis, indice.nombres))
+    fecha_emision = fecha_emision or date.today()
+    return [(nombres.get(dni, ""), dni, vista.de(dni), tipo_seleccionado, fecha_emision)
+            for dni in dict.fromkeys(dnis)]
+
+
+def _generar_tanda(tanda):
+    """En el proceso de trabajo: arma los documentos de una tanda y devuelve [(dni, bytes)]."""
+    return [(dni, gen_word(nom, dni, None, tipo, legajo=mod_ficha.HistorialContratos(tramos), fecha_emision=fecha).getvalue())
+            for nom, dni, tramos, tipo, fecha in tanda]
+
+
+def _resultados(tandas, procesos):
+    if procesos <= 1 or len(tandas) <= 1:
+        yield from map(_generar_tanda, tandas)
+        return
+    # "spawn": los procesos nuevos no heredan los hilos ni candados del servidor (cola de escritura, cachés)
+    with ProcessPoolExecutor(max_workers=min(procesos, len(tandas)), mp_context=multiprocessing.get_context("spawn")) as pool:
+        futuros = [pool.submit(_generar_tanda, tanda) for tanda in tandas]
+        for futuro in as_completed(futuros):
+            yield futuro.result()
+
+
+def lote_zip(tareas, destino, procesos=None, al_avanzar=None):
+    """
+    Genera los documentos de tareas_lote() en procesos paralelos y los escribe en el ZIP destino
+    (ruta o BytesIO) a medida que terminan. al_avanzar(hechos, total) se llama después de cada tanda.
+    """
+    procesos = procesos or os.cpu_count() or 1
+    tandas = [tareas[i:i + POR_TANDA] for i in range(0, len(tareas), POR_TANDA)]
+    hechos = 0
+    # Los .docx ya vienen comprimidos: se guardan tal cual
+    with zipfile.ZipFile(destino, "w", zipfile.ZIP_STORED) as zf:
+        for documentos in _resultados(tandas, procesos):
+            for dni, datos in documentos:
+                zf.writestr(f"Certificado_{dni}.docx", datos)
+            hechos += len(documentos)
+            if al_avanzar:
+                al_avanzar(hechos, len(tareas))
+    return hechos
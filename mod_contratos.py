@@ -0,0 +1,163 @@
+# ==========================================
+# MÓDULO: LÍNEA DE TIEMPO DE CONTRATOS (CONTRATOS CONSOLIDADOS)
+# ==========================================
+# get_consolidated_contracts fusionaba los contratos de UNA persona con iterrows() cada vez que se abría
+# su ficha o se generaba un certificado. Aquí se fusionan los de todos los DNI de una sola vez:
+#   - se ordena por (dni, f_inicio)
+#   - un contrato continúa el tramo anterior si empieza a más tardar 1 día después del mayor f_fin previo
+#     (máximo acumulado por DNI); un contrato sin fin cierra el tramo: el siguiente empieza uno nuevo
+#   - cada tramo conserva los datos de su primer contrato, el f_fin mayor y el cargo del último
+# La vista de toda la pestaña queda en la caché por versión (CONTRATOS_CONSOLIDADOS) con búsqueda por DNI.
+import numpy as np
+import pandas as pd
+
+import mod_esquema
+
+# Nombre de la vista derivada de CONTRATOS en la caché de pestañas
+CONTRATOS_CONSOLIDADOS = "contratos consolidados"
+
+_UN_DIA = np.int64(86_400 * 10**9)
+_SIN_FIN = np.iinfo(np.int64).max
+
+
+def consolidar(contratos):
+    """Contratos consecutivos (hueco de 1 día o menos) fusionados en tramos, para todos los DNI a la vez."""
+    if contratos.empty or "f_inicio" not in contratos.columns:
+        return contratos
+    df = contratos.copy()
+    df["f_inicio"] = mod_esquema.parsear_fechas(df["f_inicio"])
+    df["f_fin"] = mod_esquema.parsear_fechas(df["f_fin"]) if "f_fin" in df.columns else pd.Series(pd.NaT, index=df.index, dtype="datetime64[ns]")
+    df = df[df["f_inicio"].notna()]
+    if df.empty:
+        return df.reset_index(drop=True)
+
+    # Orden por DNI (alfabético, para buscar luego con searchsorted) y fecha de inicio
+    dnis = df["dni"] if "dni" in df.columns else pd.Series("", index=df.index)
+    codigos, _ = pd.factorize(dnis.astype(str), sort=True)
+    inicio = df["f_inicio"].to_numpy(dtype="datetime64[ns]").view(np.int64)
+    orden = np.lexsort((inicio, codigos))
+    df, codigos, inicio = df.iloc[orden], codigos[orden], inicio[orden]
+    fin_nat = df["f_fin"].isna().to_numpy()
+    fin = np.where(fin_nat, _SIN_FIN, df["f_fin"].to_numpy(dtype="datetime64[ns]").view(np.int64))
+
+    # Segmentos: cambio de DNI o contrato anterior sin fin. Dentro de un segmento, máximo acumulado de f_fin
+    nuevo_dni = np.r_[True, codigos[1:] != codigos[:-1]]
+    segmento = np.cumsum(nuevo_dni | np.r_[True, fin_nat[:-1]])
+    fin_acum = pd.Series(fin).groupby(segmento).cummax().to_numpy()
+    previo = np.r_[_SIN_FIN, fin_acum[:-1]]
+    corte = np.r_[True, segmento[1:] != segmento[:-1]] | (inicio - _UN_DIA > previo)
+
+    primeros = np.flatnonzero(corte)
+    ultimos = np.r_[primeros[1:], len(df)] - 1
+    tramo = np.cumsum(corte) - 1
+    fin_tramo = pd.Series(fin).groupby(tramo).max().to_numpy()
+
+    salida = df.iloc[primeros].copy()
+    fin_tramo = np.where(fin_tramo == _SIN_FIN, np.iinfo(np.int64).min, fin_tramo).view("datetime64[ns]")
+    salida["f_fin"] = pd.Series(fin_tramo, index=salida.index).astype(df["f_fin"].dtype)
+    if "cargo" in df.columns:
+        salida["cargo"] = df["cargo"].to_numpy()[ultimos]
+    return salida.reset_index(drop=True)
+
+
+class VistaConsolidada:
+    """Contratos consolidados de toda la pestaña, ordenados por DNI, con las filas de un DNI por búsqueda binaria."""
+
+    def __init__(self, df):
+        self.df = df
+        self._dnis = df["dni"].astype(str).to_numpy(dtype=object) if "dni" in df.columns else np.array([], dtype=object)
+
+    def __len__(self):
+        return len(self.df)
+
+    def de(self, dni):
+        desde = np.searchsorted(self._dnis, dni, side="left")
+        hasta = np.searchsorted(self._dnis, dni, side="right")
+        return self.df.iloc[desde:hasta]
+
+
+def construir_vista(df):
+    return VistaConsolidada(consolidar(mod_esquema.aplicar_esquema("CONTRATOS", df)))
+
+
+def contratos_consolidados(dfs):
+    """Vista CONTRATOS_CONSOLIDADOS: con el libro de la app se arma una sola vez por versión de CONTRATOS."""
+    if hasattr(dfs, "derivado"):
+        return dfs.derivado("CONTRATOS", CONTRATOS_CONSOLIDADOS, construir_vista)
+    return construir_vista(dfs.get("CONTRATOS", pd.DataFrame()))
+
+
+# ==========================================
+# CONTRATO VIGENTE POR DNI (REPORTES)
+# ==========================================
+# Reporte General, Vencimientos y Vacaciones tomaban el "último contrato" cada uno a su manera y en cada
+# recarga. Regla única: el de mayor f_fin; un contrato sin fin cuenta como el más reciente y, a igual
+# fecha, gana el que está más abajo en la pestaña. Se une con sede, sexo y estado civil de DATOS GENERALES
+# (primera fila de cada DNI). La vista queda en la caché por versión de ambas pestañas y, al guardar
+# CONTRATOS o DATOS GENERALES, solo se recalculan los DNI cuyas filas cambiaron.
+CONTRATO_VIGENTE = "contrato vigente"
+
+# Columnas de DATOS GENERALES que acompañan al contrato vigente
+COLUMNAS_GENERALES = ["sede", "sexo", "estado civil"]
+
+
+def _por_dni(df, columnas=None):
+    if df.empty or "dni" not in df.columns:
+        return pd.DataFrame(index=pd.Index([], name="dni"))
+    return df.set_index("dni") if columnas is None else df.set_index("dni")[[c for c in columnas if c in df.columns]]
+
+
+def construir_vigente(contratos, generales):
+    """
+    Un registro por DNI (índice ordenado): las columnas del contrato vigente tal como están en la pestaña,
+    f_fin_dt (f_fin como fecha), las columnas de DATOS GENERALES y tiene_contrato.
+    """
+    if not contratos.empty and "dni" in contratos.columns:
+        fin = mod_esquema.parsear_fechas(contratos["f_fin"]) if "f_fin" in contratos.columns else pd.Series(pd.NaT, index=contratos.index)
+        contratos = (contratos.drop(columns=[c for c in COLUMNAS_GENERALES if c in contratos.columns])
+                     .assign(f_fin_dt=fin)
+                     .sort_values("f_fin_dt", kind="stable", na_position="last")
+                     .drop_duplicates("dni", keep="last"))
+    if not generales.empty and "dni" in generales.columns:
+        generales = generales.drop_duplicates("dni")
+    vista = _por_dni(contratos).assign(tiene_contrato=True).join(_por_dni(generales, COLUMNAS_GENERALES), how="outer")
+    vista["tiene_contrato"] = vista["tiene_contrato"].fillna(False).astype(bool)
+    vista.index.name = "dni"
+    return vista.sort_index()
+
+
+def _dnis_cambiados(previo, nuevo):
+    """DNI con alguna fila agregada, quitada o modificada entre dos versiones de una pestaña."""
+    if previo is nuevo:
+        return set()
+    # Lo más común al guardar: filas nuevas al final y lo anterior intacto
+    n = len(previo)
+    if len(nuevo) >= n and nuevo.iloc[:n].reset_index(drop=True).equals(previo.reset_index(drop=True)):
+        return set(nuevo["dni"].iloc[n:])
+    h_previo = pd.util.hash_pandas_object(previo, index=False)
+    h_nuevo = pd.util.hash_pandas_object(nuevo, index=False)
+    quitadas = previo["dni"][~h_previo.isin(h_nuevo).to_numpy()]
+    nuevas = nuevo["dni"][~h_nuevo.isin(h_previo).to_numpy()]
+    return set(quitadas) | set(nuevas)
+
+
+def actualizar_vigente(anterior, previas, nuevas):
+    """La vista de la versión nueva a partir de la anterior: solo se rearman los DNI con filas distintas."""
+    tocados = set()
+    for previo, nuevo in zip(previas, nuevas):
+        if "dni" not in previo.columns or "dni" not in nuevo.columns or list(previo.columns) != list(nuevo.columns):
+            return construir_vigente(*nuevas)
+        tocados |= _dnis_cambiados(previo, nuevo)
+    if not tocados:
+        return anterior
+    contratos, generales = nuevas
+    parte = construir_vigente(contratos[contratos["dni"].isin(tocados)], generales[generales["dni"].isin(tocados)])
+    vista = pd.concat([anterior[~anterior.index.isin(tocados)], parte])
+    return vista.sort_index()
+
+
+def contrato_vigente(dfs):
+    """Vista CONTRATO_VIGENTE: con el libro de la app, una vez por versión de CONTRATOS y DATOS GENERALES."""
+    if hasattr(dfs, "derivado"):
+        return dfs.derivado(("CONTRATOS", "DATOS GENERALES"), CONTRATO_VIGENTE, construir_vigente, actualizar_vigente)
+    return construir_vigente(dfs.get("CONTRATOS", pd.DataFrame()), dfs.get("DATOS GENERALES", pd.DataFrame()))
@@ -0,0 +1,180 @@
+# ==========================================
+# MÓDULO: PLANIFICADOR DE PETICIONES A GOOGLE SHEETS (CUOTA)
+# ==========================================
+# Todas las peticiones HTTP de gspread pasan por aquí:
+#   - Cubeta de fichas (token bucket) del tamaño de la cuota por minuto: no esperamos si hay cuota libre.
+#   - Las lecturas (GET) reintentan 429, 5xx y cortes de red/timeouts con espera exponencial con jitter.
+#   - Las escrituras solo reintentan lo que prueba que Google no recibió nada (429, no se pudo conectar):
+#     un 5xx o un timeout de lectura pueden llegar con la escritura ya aplicada, y repetir un append o un
+#     borrado de filas lo duplicaría. Ese error sube a guardar_hoja, que olvida la foto de la pestaña.
+#   - Las lecturas interactivas pasan antes que las escrituras y descargas de fondo.
+import random
+import threading
+import time
+from contextlib import contextmanager
+
+import requests
+from gspread.exceptions import APIError
+from urllib3.exceptions import ConnectTimeoutError
+from gspread.http_client import HTTPClient
+
+# Cuota de Sheets por usuario de servicio: 60 peticiones por minuto
+PETICIONES_POR_MINUTO = 60
+MAX_REINTENTOS = 6
+ESPERA_BASE = 1.0
+ESPERA_MAXIMA = 64.0
+
+# Prioridades: menor número = pasa primero
+INTERACTIVA = 0
+FONDO = 1
+
+_local = threading.local()
+
+
+@contextmanager
+def prioridad(nivel):
+    """Marca las peticiones de este hilo (por ejemplo la cola de escritura usa FONDO)."""
+    anterior = getattr(_local, "prioridad", None)
+    _local.prioridad = nivel
+    try:
+        yield
+    finally:
+        _local.prioridad = anterior
+
+
+def prioridad_actual():
+    nivel = getattr(_local, "prioridad", None)
+    return INTERACTIVA if nivel is None else nivel
+
+
+def es_reintentable(error):
+    if isinstance(error, APIError):
+        codigo = getattr(error, "code", None)
+        return codigo == 429 or (codigo is not None and codigo >= 500)
+    # La sesión HTTP de gspread lanza las de requests, que no heredan de las nativas de Python
+    return isinstance(error, (ConnectionError, TimeoutError,
+                              requests.exceptions.ConnectionError, requests.exceptions.Timeout))
+
+
+def sin_envio(error):
+    """True si el error prueba que la petición no llegó a aplicarse (se puede repetir aunque sea una escritura)."""
+    if isinstance(error, APIError):
+        return getattr(error, "code", None) == 429
+    if isinstance(error, (requests.exceptions.ConnectTimeout, ConnectionRefusedError)):
+        return True
+    # requests envuelve el fallo de urllib3: NewConnectionError (hereda de ConnectTimeoutError) = no hubo conexión
+    if isinstance(error, requests.exceptions.ConnectionError):
+        causa = error.args[0] if error.args else None
+        return isinstance(getattr(causa, "reason", causa), ConnectTimeoutError)
+    return False
+
+
+class Planificador:
+    def __init__(self, por_minuto=PETICIONES_POR_MINUTO, max_reintentos=MAX_REINTENTOS,
+                 espera_base=ESPERA_BASE, espera_maxima=ESPERA_MAXIMA):
+        self.capacidad = float(por_minuto)
+        self.tasa = por_minuto / 60.0
+        self.max_reintentos = max_reintentos
+        self.espera_base = espera_base
+        self.espera_maxima = espera_maxima
+
+        self._fichas = self.capacidad
+        self._ultima_recarga = time.monotonic()
+        self._esperando = {INTERACTIVA: 0, FONDO: 0}
+        self._cond = threading.Condition()
+
+        self._metricas = {
+            "peticiones": 0, "reintentos": 0, "errores": 0,
+            "segundos_esperando_cuota": 0.0, "segundos_en_backoff": 0.0,
+            "cola_maxima": 0,
+        }
+
+    # ---------- Cubeta de fichas ----------
+    def _recargar(self):
+        ahora = time.monotonic()
+        self._fichas = min(self.capacidad, self._fichas + (ahora - self._ultima_recarga) * self.tasa)
+        self._ultima_recarga = ahora
+
+    def adquirir(self, nivel=INTERACTIVA):
+        """Bloquea hasta tener una ficha libre y no haber nadie más prioritario esperando."""
+        inicio = time.monotonic()
+        with self._cond:
+            self._esperando[nivel] += 1
+            self._metricas["cola_maxima"] = max(self._metricas["cola_maxima"], sum(self._esperando.values()))
+            try:
+                while True:
+                    self._recargar()
+                    hay_prioritarios = any(n for p, n in self._esperando.items() if p < nivel)
+                    if self._fichas >= 1 and not hay_prioritarios:
+                        self._fichas -= 1
+                        break
+                    falta = (1 - self._fichas) / self.tasa if self._fichas < 1 else 0.05
+                    self._cond.wait(max(falta, 0.01))
+            finally:
+                self._esperando[nivel] -= 1
+                self._metricas["segundos_esperando_cuota"] += time.monotonic() - inicio
+                self._cond.notify_all()
+
+    def _vaciar_cubeta(self):
+        # Google ya dijo 429: nuestra cuenta de fichas iba adelantada, empezamos de cero
+        with self._cond:
+            self._fichas = 0
+            self._ultima_recarga = time.monotonic()
+
+    # ---------- Ejecución con reintentos ----------
+    def ejecutar(self, operacion, nivel=None, idempotente=True):
+        """Ejecuta operacion() dentro de la cuota; si no es idempotente solo se repite cuando no llegó a enviarse."""
+        nivel = prioridad_actual() if nivel is None else nivel
+        reintentable = es_reintentable if idempotente else sin_envio
+        intento = 0
+        while True:
+            self.adquirir(nivel)
+            try:
+                resultado = operacion()
+                with self._cond:
+                    self._metricas["peticiones"] += 1
+                return resultado
+            except Exception as e:
+                with self._cond:
+                    self._metricas["peticiones"] += 1
+                    if not reintentable(e) or intento >= self.max_reintentos:
+                        self._metricas["errores"] += 1
+                        raise
+                    self._metricas["reintentos"] += 1
+                if getattr(e, "code", None) == 429:
+                    self._vaciar_cubeta()
+                # Backoff exponencial con "full jitter" para que varios usuarios no reintenten a la vez
+                espera = random.uniform(0, min(self.espera_maxima, self.espera_base * 2 ** intento))
+                time.sleep(espera)
+                with self._cond:
+                    self._metricas["segundos_en_backoff"] += espera
+                intento += 1
+
+    def metricas(self):
+        with self._cond:
+            self._recargar()
+            datos = dict(self._metricas)
+            datos["en_cola"] = sum(self._esperando.values())
+            datos["en_cola_interactiva"] = self._esperando[INTERACTIVA]
+            datos["en_cola_fondo"] = self._esperando[FONDO]
+            datos["fichas_libres"] = round(self._fichas, 2)
+            return datos
+
+
+# Un solo planificador para todo el proceso (todas las sesiones comparten la cuota)
+PLANIFICADOR = Planificador()
+
+
+def configurar(por_minuto):
+    global PLANIFICADOR
+    PLANIFICADOR = Planificador(por_minuto=por_minuto)
+    return PLANIFICADOR
+
+
+class HTTPClientConCuota(HTTPClient):
+    """HTTPClient de gspread que pide permiso al planificador antes de cada petición."""
+
+    def request(self, *args, **kwargs):
+        metodo = kwargs.get("method", args[0] if args else "")
+        return PLANIFICADOR.ejecutar(lambda: super(HTTPClientConCuota, self).request(*args, **kwargs),
+                                     idempotente=str(metodo).upper() == "GET")
@@ -0,0 +1,341 @@
+# ==========================================
+# MÓDULO: CAPA DE DATOS (LECTURA Y ESCRITURA DEL LIBRO)
+# ==========================================
+import threading
+import pandas as pd
+from difflib import SequenceMatcher
+from gspread.utils import numericise_all, rowcol_to_a1
+
+import mod_edad
+import mod_esquema
+
+# Cantidad máxima de pestañas que pedimos en una sola llamada batchGet.
+# Con 15-20 pestañas basta una sola petición; el corte evita URLs gigantes.
+MAX_RANGOS_POR_LOTE = 40
+
+
+def limpiar_columnas(columnas):
+    """Limpieza agresiva de encabezados: quitamos espacios, tildes y guiones bajos."""
+    return [str(c).strip().lower()
+            .replace('á', 'a').replace('é', 'e')
+            .replace('í', 'i').replace('ó', 'o')
+            .replace('ú', 'u').replace('_', ' ')
+            for c in columnas]
+
+
+def normalizar_hoja(titulo, df):
+    """Aplica la limpieza estándar a una pestaña recién descargada."""
+    if df.empty:
+        return pd.DataFrame()
+
+    df.columns = limpiar_columnas(df.columns)
+
+    # ---> 🛡️ ELIMINA COLUMNAS DUPLICADAS <---
+    df = df.loc[:, ~df.columns.duplicated()].copy()
+
+    # Arreglo especial para CONTRATOS (Evita el error f_inicio)
+    if titulo == "CONTRATOS":
+        # Mapeamos cualquier variante a 'f_inicio'
+        for col in df.columns:
+            if 'inicio' in col: df.rename(columns={col: 'f_inicio'}, inplace=True)
+            if 'termino' in col or 'fin' in col: df.rename(columns={col: 'f_fin'}, inplace=True)
+
+    # Limpieza de DNI
+    if "dni" in df.columns:
+        df["dni"] = mod_esquema.normalizar_dni(df["dni"])
+
+    # =======================================================
+    # 🚀 CÁLCULO GLOBAL DE EDAD EN TIEMPO REAL
+    # =======================================================
+    col_fecha = next((c for c in df.columns if "fecha de nacimiento" in c or "fecha nacimiento" in c), None)
+    if col_fecha:
+        # Sobreescribimos la columna 'edad' (o la creamos si no existe) con el cálculo exacto de hoy,
+        # para toda la columna de una vez (fechas ilegibles => 0)
+        df["edad"] = mod_edad.edades(df[col_fecha])
+
+    return df
+
+
+def df_desde_valores(valores):
+    """Arma el DataFrame igual que worksheet.get_all_records(), pero desde la matriz cruda."""
+    if not valores or valores == [[]]:
+        return pd.DataFrame()
+
+    # La API recorta las celdas vacías al final de cada fila: rellenamos como pad_values=True
+    ancho = max(len(fila) for fila in valores)
+    valores = [list(fila) + [""] * (ancho - len(fila)) for fila in valores]
+
+    encabezados = valores[0]
+    filas = [numericise_all(fila, default_blank="") for fila in valores[1:]]
+    if not filas:
+        return pd.DataFrame()
+
+    # Igual que to_records(): las celdas sin encabezado se descartan
+    filas = [fila[:len(encabezados)] for fila in filas]
+    return pd.DataFrame(filas, columns=encabezados)
+
+
+def rango_hoja(titulo):
+    """Rango A1 que abarca toda la pestaña (las comillas simples se duplican)."""
+    return "'" + str(titulo).replace("'", "''") + "'"
+
+
+def descargar_valores(spreadsheet, titulos, tamano_lote=MAX_RANGOS_POR_LOTE):
+    """Trae la matriz de valores de varias pestañas con values_batch_get (una petición por lote)."""
+    valores = {}
+    # Anotamos en qué guardado iba cada pestaña: si se guarda mientras descargamos, esta foto ya nació vieja
+    secuencias = {t: secuencia_escritura(t) for t in titulos}
+    for i in range(0, len(titulos), tamano_lote):
+        lote = titulos[i:i + tamano_lote]
+        resp = spreadsheet.values_batch_get([rango_hoja(t) for t in lote])
+        # La API devuelve los rangos en el mismo orden en que se pidieron
+        for titulo, rango in zip(lote, resp.get("valueRanges", [])):
+            valores[titulo] = rango.get("values", [])
+            registrar_instantanea(titulo, _rellenar(valores[titulo]), secuencia=secuencias[titulo])
+    return valores
+
+
+def cargar_libro_batch(spreadsheet, titulos=None, tamano_lote=MAX_RANGOS_POR_LOTE):
+    """
+    Descarga todas las pestañas en una (o pocas) llamadas y arma los DataFrames localmente.
+    Devuelve (dfs, errores) donde errores es {titulo: mensaje} para las hojas que fallaron.
+    """
+    if titulos is None:
+        titulos = [ws.title for ws in spreadsheet.worksheets()]
+
+    valores = descargar_valores(spreadsheet, list(titulos), tamano_lote)
+
+    dfs, errores = {}, {}
+    for titulo in titulos:
+        try:
+            dfs[titulo] = normalizar_hoja(titulo, df_desde_valores(valores.get(titulo, [])))
+        except Exception as e:
+            errores[titulo] = str(e)
+            dfs[titulo] = pd.DataFrame()
+    return dfs, errores
+
+
+# ==========================================
+# ESCRITURA POR DIFERENCIAS (DELTA)
+# ==========================================
+FANTASMAS = ["nan", "NaN", "NaT", "nat", "None", "<NA>"]
+
+# Última foto conocida de cada pestaña tal como está en Google Sheets: {titulo: [encabezado, fila1, ...]}
+# Se llena al descargar y se actualiza después de cada guardado exitoso.
+_INSTANTANEAS = {}
+_LOCK_INSTANTANEAS = threading.Lock()
+# Contador por pestaña que sube al empezar y al terminar cada guardado
+_SECUENCIAS = {}
+
+
+def secuencia_escritura(titulo):
+    with _LOCK_INSTANTANEAS:
+        return _SECUENCIAS.get(titulo, 0)
+
+
+def _avanzar_secuencia(titulo):
+    with _LOCK_INSTANTANEAS:
+        _SECUENCIAS[titulo] = _SECUENCIAS.get(titulo, 0) + 1
+
+
+def registrar_instantanea(titulo, matriz, secuencia=None):
+    with _LOCK_INSTANTANEAS:
+        # Una descarga que se cruzó con un guardado no puede pisar la foto que dejó ese guardado
+        if secuencia is not None and _SECUENCIAS.get(titulo, 0) != secuencia:
+            return False
+        _INSTANTANEAS[titulo] = [list(fila) for fila in matriz]
+        return True
+
+
+def obtener_instantanea(titulo):
+    with _LOCK_INSTANTANEAS:
+        matriz = _INSTANTANEAS.get(titulo)
+        return [list(fila) for fila in matriz] if matriz is not None else None
+
+
+def olvidar_instantanea(titulo):
+    with _LOCK_INSTANTANEAS:
+        _INSTANTANEAS.pop(titulo, None)
+
+
+def matriz_para_guardar(df):
+    """Convierte el DataFrame en la matriz de textos que se sube a Sheets (encabezado en MAYÚSCULAS)."""
+    df_s = df.copy()
+
+    # Escudo anti-duplicados y limpieza de fantasmas
+    df_s = df_s.loc[:, ~df_s.columns.duplicated()]
+    df_s = df_s.fillna("")
+    df_s = df_s.astype(str)
+
+    for fantasma in FANTASMAS:
+        df_s = df_s.replace(fantasma, "")
+
+    df_s.columns = [str(c).upper() for c in df_s.columns]
+    return [df_s.columns.values.tolist()] + df_s.values.tolist()
+
+
+def _rellenar(matriz):
+    ancho = max((len(f) for f in matriz), default=0)
+    return [[str(v) for v in f] + [""] * (ancho - len(f)) for f in matriz]
+
+
+def calcular_delta(vieja, nueva):
+    """
+    Compara la foto anterior de la hoja con la matriz nueva y devuelve las operaciones mínimas:
+      - completa: True si no se puede hacer por diferencias (cambió el ancho de la tabla)
+      - estructura: [("borrar", inicio, fin) | ("insertar", inicio, fin)] en índices 0-based de la hoja,
+        ya ordenadas de abajo hacia arriba para aplicarse en una sola batchUpdate
+      - celdas: [(fila, columna, [valores])] 1-based, en coordenadas finales
+      - anexar: filas nuevas que van al final de la tabla
+    """
+    vieja, nueva = _rellenar(vieja), _rellenar(nueva)
+    if not vieja or not nueva or len(vieja[0]) != len(nueva[0]):
+        return {"completa": True, "estructura": [], "celdas": [], "anexar": []}
+
+    delta = {"completa": False, "estructura": [], "celdas": [], "anexar": []}
+
+    def celdas_cambiadas(fila_hoja, antes, despues):
+        # Agrupamos columnas contiguas modificadas en un solo rango
+        col = 0
+        while col < len(despues):
+            if antes[col] == despues[col]:
+                col += 1
+                continue
+            ini = col
+            while col < len(despues) and antes[col] != despues[col]:
+                col += 1
+            delta["celdas"].append((fila_hoja, ini + 1, despues[ini:col]))
+
+    # Encabezado (fila 1 de la hoja)
+    celdas_cambiadas(1, vieja[0], nueva[0])
+
+    filas_v = [tuple(f) for f in vieja[1:]]
+    filas_n = [tuple(f) for f in nueva[1:]]
+    total_v = len(filas_v)
+
+    # Las filas de datos viven en la fila de hoja índice+2 (la 1 es el encabezado)
+    for tag, i1, i2, j1, j2 in reversed(SequenceMatcher(None, filas_v, filas_n, autojunk=False).get_opcodes()):
+        if tag == "equal":
+            continue
+        comunes = min(i2 - i1, j2 - j1) if tag == "replace" else 0
+
+        for k in range(comunes):
+            celdas_cambiadas(j1 + k + 2, filas_v[i1 + k], filas_n[j1 + k])
+
+        if i2 - i1 > comunes:
+            delta["estructura"].append(("borrar", i1 + comunes + 1, i2 + 1))
+
+        if j2 - j1 > comunes:
+            nuevas = [list(f) for f in filas_n[j1 + comunes:j2]]
+            if i2 == total_v:
+                # Van al final de la tabla: se anexan
+                delta["anexar"] = nuevas + delta["anexar"]
+            else:
+                inicio = i1 + comunes + 1
+                delta["estructura"].append(("insertar", inicio, inicio + len(nuevas)))
+                for k, fila in enumerate(nuevas):
+                    delta["celdas"].append((j1 + comunes + k + 2, 1, fila))
+
+    return delta
+
+
+def _columna_a(matriz):
+    # Como la devuelve la API: sin celdas vacías al final
+    columna = ["" if not fila or fila[0] is None else str(fila[0]) for fila in matriz]
+    while columna and columna[-1] == "":
+        columna.pop()
+    return columna
+
+
+def hoja_coincide(worksheet, vieja):
+    """
+    Comprueba con una lectura barata (la columna A, el DNI en casi todas las pestañas) que la hoja sigue
+    como en la foto. Si alguien la editó a mano, otro proceso la guardó o la foto quedó vieja, los índices
+    del delta apuntarían a otras filas.
+    """
+    return _columna_a([[v] for v in worksheet.col_values(1)]) == _columna_a(vieja)
+
+
+def delta_vacio(delta):
+    return not (delta["estructura"] or delta["celdas"] or delta["anexar"])
+
+
+def aplicar_delta(spreadsheet, worksheet, delta, alto):
+    """
+    Envía el delta a la hoja: una batchUpdate de estructura, una de valores y un append.
+    alto es el número de filas de la tabla nueva (encabezado incluido).
+    """
+    if delta["estructura"]:
+        peticiones = []
+        for op, inicio, fin in delta["estructura"]:
+            rango = {"sheetId": worksheet.id, "dimension": "ROWS", "startIndex": inicio, "endIndex": fin}
+            if op == "borrar":
+                peticiones.append({"deleteDimension": {"range": rango}})
+            else:
+                peticiones.append({"insertDimension": {"range": rango, "inheritFromBefore": True}})
+        spreadsheet.batch_update({"requests": peticiones})
+
+    if delta["celdas"]:
+        worksheet.batch_update([
+            {"range": f"{rowcol_to_a1(fila, col)}:{rowcol_to_a1(fila, col + len(valores) - 1)}", "values": [valores]}
+            for fila, col, valores in delta["celdas"]
+        ], value_input_option="RAW")
+
+    if delta["anexar"]:
+        # Se anexa detrás de la última fila conocida e insertando filas: nunca pisa lo que haya debajo
+        worksheet.append_rows(delta["anexar"], value_input_option="RAW", insert_data_option="INSERT_ROWS",
+                              table_range=f"A{alto - len(delta['anexar'])}")
+
+
+def guardar_hoja(spreadsheet, titulo, df, worksheet=None):
+    """Guarda una pestaña enviando solo las diferencias contra la última foto conocida."""
+    matriz = matriz_para_guardar(df)
+    if worksheet is None:
+        worksheet = spreadsheet.worksheet(titulo)
+
+    vieja = obtener_instantanea(titulo)
+    delta = calcular_delta(vieja, matriz) if vieja is not None else None
+
+    _avanzar_secuencia(titulo)
+    try:
+        if delta is not None and not delta["completa"] and not delta_vacio(delta) and not hoja_coincide(worksheet, vieja):
+            delta = dict(delta, completa=True)
+        if delta is None or delta["completa"]:
+            # Sin foto previa, cambió el ancho o la hoja ya no es la de la foto: reescritura completa como antes
+            worksheet.clear()
+            worksheet.update(matriz)
+        elif not delta_vacio(delta):
+            aplicar_delta(spreadsheet, worksheet, delta, len(matriz))
+    except Exception:
+        # Si algo falló a medias ya no sabemos qué hay en la hoja: el próximo guardado será completo
+        olvidar_instantanea(titulo)
+        raise
+    finally:
+        _avanzar_secuencia(titulo)
+
+    registrar_instantanea(titulo, matriz)
+    return delta
+
+
+def pestanas_a_guardar(dfs, pestana_especifica=None):
+    """
+    Si le decimos qué pestaña guardar, solo esa. Si no, todas las que están en memoria
+    (con el libro perezoso, las que nadie abrió no pueden haber cambiado). Se saltan las vacías.
+    """
+    if pestana_especifica:
+        listado = [pestana_especifica]
+    else:
+        listado = dfs.cargadas() if hasattr(dfs, "cargadas") else list(dfs.keys())
+    return [h for h in listado if h in dfs and not dfs[h].empty and len(dfs[h].columns) > 0]
+
+
+def guardar_libro(spreadsheet, dfs, pestana_especifica=None, hojas=None):
+    # hojas: mapa opcional {titulo: worksheet} ya conocido, para no pedir los metadatos de cada pestaña
+    # Las pestañas que no cambiaron no generan peticiones.
+    for h in pestanas_a_guardar(dfs, pestana_especifica):
+        guardar_hoja(spreadsheet, h, dfs[h], (hojas or {}).get(h))
+
+
+def releer_como_guardado(titulo, df):
+    """Devuelve la pestaña tal como quedaría al volver a descargarla después de guardarla."""
+    return normalizar_hoja(titulo, df_desde_valores(matriz_para_guardar(df)))
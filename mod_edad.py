@@ -0,0 +1,37 @@
+# ==========================================
+# MÓDULO: MOTOR DE EDAD
+# ==========================================
+# Edad "viva" (cumplida a una fecha) calculada para columnas enteras de una sola vez:
+# se parsean las fechas una vez (mod_esquema.parsear_fechas) y la edad sale con aritmética de arreglos.
+# Lo usan la carga de pestañas (columna 'edad'), el reporte de cumpleaños y los formularios de edición.
+from datetime import date, datetime
+
+import pandas as pd
+
+import mod_esquema
+
+
+def edades(fechas, hoy=None):
+    """
+    Edad cumplida a la fecha 'hoy' (por defecto, hoy) para cada fecha de nacimiento de la serie.
+    Acepta texto o datetime; las fechas vacías o ilegibles dan 0, como el cálculo fila por fila anterior.
+    """
+    hoy = hoy or date.today()
+    fnac = mod_esquema.parsear_fechas(pd.Series(fechas))
+    # Aún no llega su cumpleaños este año si (mes, día) de nacimiento es posterior a (mes, día) de hoy
+    falta_cumplir = (fnac.dt.month * 100 + fnac.dt.day) > (hoy.month * 100 + hoy.day)
+    edad = hoy.year - fnac.dt.year - falta_cumplir.astype(int)
+    return edad.fillna(0).astype(int)
+
+
+def edad(fecha, hoy=None):
+    """Edad de una sola fecha (texto, date o datetime) con la misma regla que edades()."""
+    if not isinstance(fecha, (date, datetime)) and pd.isna(fecha):
+        return 0
+    return int(edades(pd.Series([fecha], dtype=object), hoy=hoy).iloc[0])
+
+
+def edades_a_cumplir(fechas, anio=None):
+    """Edad que cada persona cumple en el año indicado (la edad al 31 de diciembre)."""
+    anio = anio or date.today().year
+    return edades(fechas, hoy=date(anio, 12, 31))
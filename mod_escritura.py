@@ -0,0 +1,153 @@
+# ==========================================
+# MÓDULO: COLA DE ESCRITURA EN SEGUNDO PLANO (WRITE-BEHIND)
+# ==========================================
+# save_data() ya no espera a la red: deja las pestañas en esta cola y vuelve al instante.
+# Un hilo trabajador junta todo lo pendiente (si una pestaña se guardó dos veces, va solo la última),
+# lo escribe de una sola pasada en el backend, reintenta los errores de cuota y avisa el resultado.
+# Si aun así falla, el lote vuelve a la cola y se intenta otra vez más tarde: nada se descarta.
+import atexit
+import random
+import threading
+import time
+from datetime import datetime
+
+import mod_cuota
+import mod_datos
+
+# Pausa corta antes de escribir para agrupar ráfagas (por ejemplo USUARIOS y luego AUDITORIA)
+ESPERA_AGRUPAR = 0.3
+# Las lecturas ya se reintentan en mod_cuota; las escrituras que fallaron sin prueba de no haberse aplicado
+# suben hasta aquí. Repetir el lote es seguro: guardar_hoja olvidó la foto de esa pestaña y la reescribe completa
+MAX_REINTENTOS = 3
+ESPERA_MAXIMA = 60
+# Tras un lote fallido, cuánto esperar antes de volver a intentarlo con lo que siga pendiente
+ESPERA_TRAS_FALLO = 30
+
+
+class ColaEscritura:
+    def __init__(self, backend, al_escribir=None, espera_agrupar=ESPERA_AGRUPAR, max_reintentos=MAX_REINTENTOS,
+                 espera_tras_fallo=ESPERA_TRAS_FALLO):
+        self.backend = backend
+        # al_escribir(titulos, error): se llama después de cada vaciado, con error=None si todo salió bien
+        self.al_escribir = al_escribir
+        self.espera_agrupar = espera_agrupar
+        self.max_reintentos = max_reintentos
+        self.espera_tras_fallo = espera_tras_fallo
+
+        self._pendientes = {}
+        self._en_curso = set()
+        self._proximo_intento = 0.0
+        self._cond = threading.Condition()
+        self._hilo = None
+
+        self.ultimo_ok = None
+        self.ultimo_error = None
+        self.reintentos = 0
+        self.escrituras = 0
+
+        atexit.register(self.vaciar)
+
+    # ---------- API para save_data ----------
+    def encolar(self, dfs, pestana_especifica=None):
+        """Copia las pestañas a guardar y vuelve de inmediato. Devuelve la lista de pestañas encoladas."""
+        hojas = {h: dfs[h].copy() for h in mod_datos.pestanas_a_guardar(dfs, pestana_especifica)}
+        if not hojas:
+            return []
+
+        with self._cond:
+            # Coalescencia: la versión más reciente de cada pestaña reemplaza a la anterior
+            self._pendientes.update(hojas)
+            self._asegurar_hilo()
+            self._cond.notify_all()
+        return list(hojas)
+
+    def hay_pendientes(self):
+        with self._cond:
+            return bool(self._pendientes or self._en_curso)
+
+    def estado(self):
+        with self._cond:
+            return {
+                "pendientes": sorted(self._pendientes),
+                "en_curso": sorted(self._en_curso),
+                "ultimo_ok": self.ultimo_ok,
+                "ultimo_error": self.ultimo_error,
+                "reintentos": self.reintentos,
+                "escrituras": self.escrituras,
+            }
+
+    def vaciar(self, timeout=30):
+        """Espera a que todo lo pendiente llegue al backend (se usa al apagar el proceso)."""
+        limite = time.monotonic() + timeout
+        with self._cond:
+            # Al apagar no se espera la pausa tras un fallo: se intenta ya
+            self._proximo_intento = 0.0
+            if self._pendientes:
+                self._asegurar_hilo()
+                self._cond.notify_all()
+            while self._pendientes or self._en_curso:
+                restante = limite - time.monotonic()
+                if restante <= 0:
+                    return False
+                self._cond.wait(restante)
+        return True
+
+    # ---------- Hilo trabajador ----------
+    def _asegurar_hilo(self):
+        if self._hilo is None or not self._hilo.is_alive():
+            self._hilo = threading.Thread(target=self._trabajar, name="cola-escritura", daemon=True)
+            self._hilo.start()
+
+    def _trabajar(self):
+        while True:
+            with self._cond:
+                while not self._pendientes or time.monotonic() < self._proximo_intento:
+                    self._cond.wait(self._proximo_intento - time.monotonic() if self._pendientes else None)
+            time.sleep(self.espera_agrupar)
+
+            with self._cond:
+                lote, self._pendientes = self._pendientes, {}
+                self._en_curso = set(lote)
+
+            error = self._escribir_con_reintentos(lote)
+
+            with self._cond:
+                self._en_curso = set()
+                if error is None:
+                    self.ultimo_ok = datetime.now()
+                    self.ultimo_error = None
+                else:
+                    self.ultimo_error = f"{', '.join(sorted(lote))}: {error}"
+                    # El lote vuelve a la cola (si ya llegó una versión más nueva de una pestaña, gana esa)
+                    for titulo, df in lote.items():
+                        self._pendientes.setdefault(titulo, df)
+                    self._proximo_intento = time.monotonic() + self.espera_tras_fallo
+                self._cond.notify_all()
+
+            if self.al_escribir:
+                try:
+                    self.al_escribir(list(lote), error)
+                except Exception:
+                    pass
+
+    def _escribir_con_reintentos(self, lote):
+        intento = 0
+        while True:
+            try:
+                # Una sola pasada por el backend para todas las pestañas del lote (detrás de las lecturas interactivas)
+                with mod_cuota.prioridad(mod_cuota.FONDO):
+                    self.backend.guardar(lote)
+                self.escrituras += 1
+                return None
+            except Exception as e:
+                if not mod_cuota.es_reintentable(e) or intento >= self.max_reintentos:
+                    return e
+                self.reintentos += 1
+                time.sleep(min(ESPERA_MAXIMA, 2 ** intento) + random.uniform(0, 1))
+                intento += 1
+
+                # Si mientras esperábamos llegó una versión más nueva de alguna pestaña, esa gana
+                with self._cond:
+                    for titulo in [h for h in lote if h in self._pendientes]:
+                        lote[titulo] = self._pendientes.pop(titulo)
+                    self._en_curso = set(lote)
@@ -0,0 +1,98 @@
+# ==========================================
+# MÓDULO: ESQUEMA DE PESTAÑAS (COLUMNAS Y TIPOS)
+# ==========================================
+# COLUMNAS: columnas por defecto de cada pestaña (para armar tablas vacías).
+# TIPOS: qué columnas son fechas, DNI o números. Se aplican una sola vez por versión de la pestaña
+# (vista tipada en caché), así los reportes ya no repiten pd.to_datetime / zfill / to_numeric en cada recarga.
+# La pestaña original se conserva como texto: es la que se edita y se guarda en Sheets sin perder formato.
+import pandas as pd
+
+COLUMNAS = {
+    "PERSONAL": ["dni", "apellidos y nombres", "link"],
+    "DATOS GENERALES": ["dni", "sede", "sexo", "apellidos y nombres", "dirección", "estado civil", "fecha de nacimiento", "edad"],
+    "DATOS FAMILIARES": ["parentesco", "apellidos y nombres", "dni", "fecha de nacimiento", "edad", "estudios", "telefono"],
+    "EXP. LABORAL": ["dni", "tipo de experiencia", "lugar", "puesto", "fecha de inicio", "fecha de fin", "motivo de cese"],
+    "FORM. ACADEMICA": ["dni", "tipo de estudio", "institución educativa", "mención (especialidad / carrera / etc)", "año", "estado", "horas académicas", "grado o título obtenido"],
+    "INVESTIGACION": ["id", "dni", "tipo de registro", "enlace cti vitae", "codigo renacyt", "nivel renacyt", "titulo de publicacion", "base de datos", "nombre de revista", "cuartil", "año de publicacion", "doi o url", "nombre del proyecto", "entidad financiadora", "rol en el proyecto", "monto adjudicado", "estado del proyecto", "nombre del semillero", "resolucion", "rol en el semillero", "estado del semillero"],
+    # NUEVAS COLUMNAS DE CONTRATOS APLICADAS:
+    "CONTRATOS": ["dni", "cargo", "AREA", "f_inicio", "f_fin", "tipo de trabajador", "modalidad", "temporalidad", "tipo contrato", "estado", "LINK"],
+    "VACACIONES": ["periodo", "fecha de inicio", "fecha de fin", "días generados", "dias gozados", "saldo", "link"],
+    "OTROS BENEFICIOS": ["periodo", "tipo de beneficio", "link"],
+    "MERITOS Y DEMERITOS": ["periodo", "merito o demerito", "motivo", "link"],
+    "EVALUACION DEL DESEMPEÑO": ["periodo", "merito o demerito", "motivo", "link"],
+    "LIQUIDACIONES": ["periodo", "firmo", "link"]
+}
+
+# Tipos por pestaña, con los nombres de columna ya limpios (minúsculas, sin tildes). "*" aplica a todas.
+TIPOS = {
+    "*": {"dni": "dni"},
+    "CONTRATOS": {"f_inicio": "fecha", "f_fin": "fecha"},
+    "DATOS GENERALES": {"fecha de nacimiento": "fecha", "edad": "numero"},
+    "DATOS FAMILIARES": {"fecha de nacimiento": "fecha", "edad": "numero"},
+    "EXP. LABORAL": {"fecha de inicio": "fecha", "fecha de fin": "fecha"},
+    "VACACIONES": {"fecha de inicio": "fecha", "fecha de fin": "fecha", "dias generados": "numero", "dias gozados": "numero", "saldo": "numero"},
+    "EVALUACIONES": {"promedio general": "numero"},
+}
+
+
+def normalizar_dni(serie):
+    """DNI como texto de 8 dígitos: sin espacios, sin el '.0' que deja Sheets en los números."""
+    return serie.astype(str).str.strip().str.replace(r'\.0$', '', regex=True).str.zfill(8)
+
+
+def parsear_fechas(serie):
+    """
+    Convierte una columna de fechas en texto a datetime64 de forma vectorizada.
+    Primero ISO (como las guarda el sistema), luego dd/mm/aaaa (como se escriben a mano)
+    y lo que quede con el parser flexible de pandas (día primero). Lo ilegible queda NaT.
+    """
+    if pd.api.types.is_datetime64_any_dtype(serie):
+        return serie
+    texto = serie.astype(str).str.strip()
+    fechas = pd.Series(pd.NaT, index=serie.index, dtype="datetime64[ns]")
+
+    # Cada formato solo recibe las celdas que tienen su forma: pd.to_datetime con un formato
+    # que no calza es lento (falla celda por celda), con uno que calza es vectorizado.
+    iso = texto.str.match(r"\d{4}-\d{1,2}-\d{1,2}")
+    if iso.any():
+        fechas[iso] = pd.to_datetime(texto[iso].str.slice(0, 10), format="%Y-%m-%d", errors="coerce")
+    dmy = texto.str.match(r"\d{1,2}/\d{1,2}/\d{4}$")
+    if dmy.any():
+        fechas[dmy] = pd.to_datetime(texto[dmy], format="%d/%m/%Y", errors="coerce")
+
+    # Texto sin dígitos ("INDETERMINADO", "-") no es fecha: no pasa por el parser lento
+    faltan = fechas.isna() & ~iso & ~dmy & texto.str.contains(r"\d", regex=True)
+    if faltan.any():
+        fechas[faltan] = pd.to_datetime(texto[faltan], format="mixed", dayfirst=True, errors="coerce")
+    return fechas
+
+
+def tipos_de(titulo):
+    tipos = dict(TIPOS["*"])
+    tipos.update(TIPOS.get(titulo, {}))
+    return tipos
+
+
+def aplicar_esquema(titulo, df):
+    """Devuelve una copia de la pestaña con las columnas tipadas según TIPOS."""
+    df = df.copy()
+    for col, tipo in tipos_de(titulo).items():
+        if col not in df.columns:
+            continue
+        if tipo == "fecha":
+            df[col] = parsear_fechas(df[col])
+        elif tipo == "dni":
+            df[col] = normalizar_dni(df[col])
+        elif tipo == "numero":
+            df[col] = pd.to_numeric(df[col], errors="coerce")
+    return df
+
+
+def tipada(dfs, titulo):
+    """
+    Vista tipada de una pestaña. Con el libro de la app sale de la caché (se calcula una vez por versión);
+    con un diccionario simple (scripts, CLI) se calcula en el momento.
+    """
+    if hasattr(dfs, "tipada"):
+        return dfs.tipada(titulo)
+    return aplicar_esquema(titulo, dfs.get(titulo, pd.DataFrame()))
@@ -0,0 +1,129 @@
+# ==========================================
+# MÓDULO: EXPORTACIÓN DE REPORTES (EXCEL / CSV / PARQUET)
+# ==========================================
+# Antes cada reporte armaba un libro openpyxl completo en un BytesIO en cada recarga, solo para que
+# st.download_button tuviera los bytes listos aunque nadie descargara. Ahora:
+#   - el archivo se arma recién al pulsar "Exportar" (st.download_button con data diferida)
+#   - el Excel se escribe fila por fila en modo write_only (no guarda todo el libro en memoria)
+#   - los bytes quedan en ARCHIVOS por (reporte, filtros, versión de los datos, formato)
+#   - además de Excel se puede bajar CSV (abre con tildes en Excel) y Parquet
+from io import BytesIO
+
+import streamlit as st
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font
+from openpyxl.utils import get_column_letter
+
+import mod_memo
+
+FORMATOS = {
+    "Excel": ("xlsx", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"),
+    "CSV": ("csv", "text/csv"),
+    "Parquet": ("parquet", "application/vnd.apache.parquet"),
+}
+
+# Archivos ya generados; la versión de los datos va en la clave, lo viejo sale solo
+ARCHIVOS = mod_memo.MemoLRU(capacidad=32)
+
+
+def _filas(df):
+    """Filas como tuplas de Python, con None en lugar de NaN/NaT/NA (celdas vacías en Excel)."""
+    return df.astype(object).where(df.notna(), None).itertuples(index=False, name=None)
+
+
+def _anchos(df, muestra=200):
+    """Ancho de cada columna según el encabezado y las primeras filas (tope de 60 caracteres)."""
+    for col in df.columns:
+        largos = df[col].head(muestra).dropna().astype(str).str.len()
+        yield min(max(len(str(col)), int(largos.max()) if len(largos) else 0) + 2, 60)
+
+
+def hojas_excel(hojas):
+    """
+    Libro .xlsx en modo write_only con {nombre de hoja: DataFrame}: encabezados en negrita,
+    fila de encabezados fija y columnas con ancho según su contenido (el mismo formato en todas las hojas).
+    """
+    wb = Workbook(write_only=True)
+    negrita = Font(bold=True)
+    for nombre, df in hojas.items():
+        ws = wb.create_sheet(str(nombre)[:31])
+        # En write_only el formato de la hoja va antes de la primera fila
+        ws.freeze_panes = "A2"
+        for i, ancho in enumerate(_anchos(df), start=1):
+            ws.column_dimensions[get_column_letter(i)].width = ancho
+        encabezado = []
+        for col in df.columns:
+            celda = WriteOnlyCell(ws, value=str(col))
+            celda.font = negrita
+            encabezado.append(celda)
+        ws.append(encabezado)
+        for fila in _filas(df):
+            ws.append(fila)
+    buf = BytesIO()
+    wb.save(buf)
+    return buf.getvalue()
+
+
+def a_excel(df, hoja="Reporte"):
+    return hojas_excel({hoja: df})
+
+
+def a_csv(df):
+    # utf-8 con BOM: Excel lo abre con tildes y ñ correctas
+    return df.to_csv(index=False).encode("utf-8-sig")
+
+
+def a_parquet(df):
+    # Columnas de texto mezclado (números y letras en la misma columna) como texto
+    mixtas = {c: "string" for c in df.columns if df[c].dtype == object}
+    buf = BytesIO()
+    df.astype(mixtas).to_parquet(buf, index=False)
+    return buf.getvalue()
+
+
+def convertir(df, formato, hoja="Reporte"):
+    if formato == "CSV":
+        return a_csv(df)
+    if formato == "Parquet":
+        return a_parquet(df)
+    return a_excel(df, hoja)
+
+
+def version_datos(dfs, hojas):
+    """Versiones de las pestañas del reporte (None si dfs no es el libro con versiones: sin caché)."""
+    return tuple(dfs.version(t) for t in hojas) if hasattr(dfs, "version") else None
+
+
+def _congelar(valor):
+    if isinstance(valor, dict):
+        return tuple(sorted((k, _congelar(v)) for k, v in valor.items()))
+    if isinstance(valor, (list, tuple, set)):
+        return tuple(_congelar(v) for v in valor)
+    return valor
+
+
+def archivo(reporte, filtros, version, formato, construir, hoja="Reporte"):
+    """Bytes del reporte en el formato pedido; construir() entrega la tabla y solo se llama si no está en caché."""
+    if version is None:
+        return convertir(construir(), formato, hoja)
+    clave = (reporte, _congelar(filtros), version, formato)
+    return ARCHIVOS.obtener(clave, lambda: convertir(construir(), formato, hoja))
+
+
+def boton_exportar(tabla, reporte, filtros, version, nombre, hoja="Reporte", key="exportar"):
+    """
+    Selector de formato + botón de descarga. El archivo se genera al pulsar el botón.
+    tabla: DataFrame o función que lo devuelve (así ni siquiera se arma la tabla si nadie exporta).
+    """
+    construir = tabla if callable(tabla) else (lambda: tabla)
+    formato = st.radio("Formato", list(FORMATOS), horizontal=True, key=f"{key}_formato", label_visibility="collapsed")
+    extension, mime = FORMATOS[formato]
+    st.download_button(
+        label=f"📥 Exportar a {formato}",
+        data=lambda: archivo(reporte, filtros, version, formato, construir, hoja),
+        file_name=f"{nombre}.{extension}",
+        mime=mime,
+        key=key,
+        type="primary"
+    )
@@ -0,0 +1,170 @@
+# ==========================================
+# MÓDULO: FICHA DEL COLABORADOR (EmployeeDossier)
+# ==========================================
+# Antes cada pestaña de Consulta, el certificado y la papeleta recalculaban por su cuenta lo mismo
+# a partir de las filas del colaborador: contratos fusionados, si fue docente o locador, meses de
+# experiencia, grados, conteos de investigación, saldo de vacaciones, cargo actual...
+# Aquí se calcula todo una sola vez por (dni, versión de las pestañas, día) y queda en FICHAS (LRU).
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+import mod_contratos
+import mod_esquema
+import mod_memo
+import mod_vacaciones
+
+PALABRAS_DOCENTE = ("docente", "profesor", "catedra")
+PALABRAS_LOCACION = ("locacion", "honorarios", "servicios terceros")
+
+AUTOMATICO = "Automático (Detectar por último contrato)"
+OPCIONES_CERTIFICADO = [
+    AUTOMATICO,
+    "Certificado de Trabajo - Planilla Administrativo",
+    "Constancia de Servicios - Locación Administrativo",
+    "Certificado de Trabajo - Planilla Docente",
+    "Constancia de Servicios - Locación Docente",
+]
+
+
+def get_consolidated_contracts(df_c):
+    # Fusiona contratos consecutivos (ahora vectorizado en mod_contratos, sirve para uno o muchos DNI)
+    return mod_contratos.consolidar(df_c)
+
+
+def _texto(fila):
+    return " ".join(str(v).lower() for v in fila.values)
+
+
+def _contiene(texto, palabras):
+    return any(p in texto for p in palabras)
+
+
+def _columna_texto(df, col):
+    if col not in df.columns:
+        return pd.Series([""] * len(df), index=df.index)
+    return df[col].astype(str)
+
+
+def _meses(inicio, fin):
+    """Meses enteros entre dos columnas de fechas (días / 30.44), 0 si falta alguna fecha."""
+    meses = np.floor((fin - inicio).dt.days / 30.44)
+    return int(meses.clip(lower=0).fillna(0).sum())
+
+
+class HistorialContratos:
+    """Contratos fusionados de una persona y lo que dicen de ella para el certificado (docente / locación)."""
+
+    def __init__(self, consolidados):
+        self.contratos_consolidados = consolidados
+        textos = [_texto(fila) for _, fila in consolidados.iterrows()]
+        docentes = [_contiene(t, PALABRAS_DOCENTE) for t in textos]
+        locaciones = [_contiene(t, PALABRAS_LOCACION + ("terceros",)) for t in textos]
+        self.ha_sido_docente = any(docentes)
+        self.ha_sido_administrativo = not all(docentes)
+        self.ha_tenido_locacion = any(locaciones)
+        self.ha_tenido_planilla = not all(locaciones)
+        self.ultimo_es_docente = bool(textos) and _contiene(textos[-1], PALABRAS_DOCENTE)
+        self.ultimo_es_locacion = bool(textos) and _contiene(textos[-1], PALABRAS_LOCACION)
+        self.opciones_certificado = self._opciones_certificado()
+
+    def _opciones_certificado(self):
+        opciones = [AUTOMATICO]
+        if self.ha_sido_administrativo and self.ha_tenido_planilla:
+            opciones.append("Certificado de Trabajo - Planilla Administrativo")
+        if self.ha_sido_administrativo and self.ha_tenido_locacion:
+            opciones.append("Constancia de Servicios - Locación Administrativo")
+        if self.ha_sido_docente and self.ha_tenido_planilla:
+            opciones.append("Certificado de Trabajo - Planilla Docente")
+        if self.ha_sido_docente and self.ha_tenido_locacion:
+            opciones.append("Constancia de Servicios - Locación Docente")
+        # Si no se reconoce ningún texto conocido se muestran todas, para no bloquear el flujo
+        return opciones if len(opciones) > 1 else list(OPCIONES_CERTIFICADO)
+
+    def tipo_certificado(self, tipo_seleccionado):
+        """(es_docente, es_locacion) del certificado: según el último contrato o la opción forzada en el menú."""
+        if tipo_seleccionado.startswith("Automático"):
+            return self.ultimo_es_docente, self.ultimo_es_locacion
+        return "Docente" in tipo_seleccionado, "Locación" in tipo_seleccionado
+
+
+class EmployeeDossier(HistorialContratos):
+    """Valores derivados de un colaborador que comparten las pestañas, el certificado y la papeleta."""
+
+    def __init__(self, dni, filas, hoy=None, consolidados=None):
+        self.dni = dni
+        self.hoy = hoy or date.today()
+        vacio = pd.DataFrame()
+        contratos = mod_esquema.aplicar_esquema("CONTRATOS", filas.get("CONTRATOS", vacio))
+        exp = mod_esquema.aplicar_esquema("EXP. LABORAL", filas.get("EXP. LABORAL", vacio))
+        acad = filas.get("FORM. ACADEMICA", vacio)
+        inv = filas.get("INVESTIGACION", vacio)
+        vacaciones = mod_esquema.aplicar_esquema("VACACIONES", filas.get("VACACIONES", vacio))
+        self.contratos = contratos
+        # Filas propias del colaborador que usa el análisis de especialidad docente
+        self.formacion_academica = acad
+        self.experiencia_externa = exp
+
+        # --- Contratos fusionados y filtro de certificados ---
+        # (si llegan de la vista CONTRATOS_CONSOLIDADOS no se vuelven a fusionar)
+        if consolidados is None:
+            consolidados = get_consolidated_contracts(contratos) if "f_inicio" in contratos.columns else vacio
+        super().__init__(consolidados)
+
+        # --- Experiencia: contratos internos + experiencia externa registrada ---
+        self.meses_docente = 0
+        self.meses_admin = 0
+        if {"f_inicio", "f_fin"} <= set(contratos.columns):
+            docente = _columna_texto(contratos, "tipo de trabajador").str.lower().str.contains("docente")
+            self.meses_docente += _meses(contratos["f_inicio"][docente], contratos["f_fin"][docente])
+            self.meses_admin += _meses(contratos["f_inicio"][~docente], contratos["f_fin"][~docente])
+        if {"fecha de inicio", "fecha de fin"} <= set(exp.columns):
+            docente = _columna_texto(exp, "tipo de experiencia").str.lower().str.contains("docente")
+            self.meses_docente += _meses(exp["fecha de inicio"][docente], exp["fecha de fin"][docente])
+            self.meses_admin += _meses(exp["fecha de inicio"][~docente], exp["fecha de fin"][~docente])
+
+        # --- Grados académicos ---
+        grados = _columna_texto(acad, "grado o titulo obtenido").str.upper()
+        self.es_doctor = bool(grados.str.contains("DOCTOR").any())
+        self.es_maestro = bool(grados.str.contains("MAGISTER|MAESTRO|MAESTRIA").any())
+
+        # --- Investigación ---
+        tipos = _columna_texto(inv, "tipo de registro").str.strip()
+        niveles = inv["nivel renacyt"].astype(str) if "nivel renacyt" in inv.columns else pd.Series(["No tiene"] * len(inv), index=inv.index)
+        self.tiene_renacyt = bool((tipos.str.contains("Datos Generales", regex=False) & (niveles != "No tiene")).any())
+        self.conteo_publicaciones = int((tipos == "Publicación Científica").sum())
+        self.conteo_fondos = int((tipos == "Fondo Concursable").sum())
+        self.conteo_semilleros = int((tipos == "Semillero de Investigación").sum())
+
+        # --- Vacaciones (motor compartido con repvacaciones) ---
+        detalle, totales = mod_vacaciones.calcular(contratos, vacaciones, self.hoy)
+        # Consulta siempre sumó los periodos ya redondeados (el reporte suma sin redondear)
+        self.dias_generados = sum(detalle["generados"].tolist())
+        detalle = detalle[(detalle["generados"] > 0) | (detalle["gozados"] > 0)]
+        self.vacaciones_detalle = [
+            {"Periodo": d.periodo, "Del": d.desde.strftime("%d/%m/%Y"), "Al": d.hasta.strftime("%d/%m/%Y"),
+             "Días Generados": d.generados, "Dias Gozados": d.gozados, "Saldo": d.saldo}
+            for d in detalle.itertuples(index=False)
+        ]
+        self.dias_gozados = totales["gozados"].sum()
+        self.saldo_vacaciones = round(self.dias_generados - self.dias_gozados, 2)
+
+        # --- Datos para la papeleta: cargo del último contrato e ingreso (primer contrato de planilla) ---
+        self.cargo_actual = "TRABAJADOR"
+        self.fecha_ingreso = ""
+        if not contratos.empty and "f_fin" in contratos.columns:
+            self.cargo_actual = contratos.sort_values("f_fin", kind="stable").iloc[-1].get("cargo", "TRABAJADOR")
+            planilla = contratos[_columna_texto(contratos, "tipo contrato").str.lower().str.contains("planilla", na=False)]
+            f_min = planilla["f_inicio"].min() if "f_inicio" in planilla.columns else pd.NaT
+            if pd.notnull(f_min):
+                self.fecha_ingreso = f_min.date()
+
+# Fichas por (dni, versión de las pestañas, día): el saldo de vacaciones depende de la fecha de hoy
+FICHAS = mod_memo.MemoLRU(capacidad=128)
+
+
+def obtener_ficha(dni, filas, version, hoy=None, consolidados=None):
+    """Ficha del colaborador desde la memoria LRU, o recién calculada si cambió la versión o el día."""
+    hoy = hoy or date.today()
+    return FICHAS.obtener((dni, version, hoy), lambda: EmployeeDossier(dni, filas, hoy, consolidados))
@@ -0,0 +1,88 @@
+# ==========================================
+# MÓDULO: MOTOR DE FILTROS POR MAPAS DE BITS
+# ==========================================
+# Antes Reporte General copiaba la tabla maestra y le aplicaba hasta ocho isin() seguidos en cada cambio
+# de un multiselect (cada uno creaba otro DataFrame). Ahora, una vez por versión de las pestañas:
+#   - cada columna filtrable se codifica como categorías (factorize)
+#   - por cada valor se guarda un mapa de bits empaquetado (1 bit por fila)
+# Un filtro es un OR de los mapas de los valores elegidos en cada columna y un AND entre columnas;
+# el resultado son las posiciones de las filas. Los conteos de cada opción salen de los mismos mapas.
+import numpy as np
+import pandas as pd
+
+# Bits encendidos de cada byte (conteo de filas sin desempaquetar)
+_BITS = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+
+class MotorFiltros:
+    """Tabla + mapas de bits por valor de cada columna filtrable."""
+
+    def __init__(self, df, columnas):
+        self.df = df
+        self.n = len(df)
+        self._todas = np.packbits(np.ones(self.n, dtype=bool))
+        self._valores = {}
+        self._mapas = {}
+        for col in columnas:
+            if col not in df.columns:
+                continue
+            codigos, valores = pd.factorize(df[col], sort=True)
+            # Un mapa por valor, con 1 donde la tabla tiene ese valor (las vacías, código -1, no entran)
+            mapas = np.zeros((len(valores), len(self._todas)), dtype=np.uint8)
+            for i in range(len(valores)):
+                mapas[i] = np.packbits(codigos == i)
+            self._valores[col] = {v: i for i, v in enumerate(valores.tolist())}
+            self._mapas[col] = mapas
+
+    def opciones(self, col):
+        """Valores distintos de la columna (ordenados), sin vacíos."""
+        return list(self._valores.get(col, {}))
+
+    def _mascara(self, seleccion, salvo=None):
+        mascara = self._todas.copy()
+        for col, elegidos in seleccion.items():
+            if col == salvo or not elegidos:
+                continue
+            if col not in self._mapas:
+                # Filtro sobre una columna que la tabla no tiene: como antes, no se aplica
+                continue
+            filas = [self._valores[col][v] for v in elegidos if v in self._valores[col]]
+            if not filas:
+                return np.zeros_like(mascara)
+            np.bitwise_and(mascara, np.bitwise_or.reduce(self._mapas[col][filas], axis=0), out=mascara)
+        return mascara
+
+    def filtrar(self, seleccion):
+        """Posiciones de las filas que cumplen {columna: valores elegidos} (lista vacía = sin filtro)."""
+        mascara = self._mascara(seleccion)
+        return np.flatnonzero(np.unpackbits(mascara, count=self.n))
+
+    def conteos(self, col, seleccion=None):
+        """
+        {valor: filas} de la columna con los demás filtros aplicados (los de la propia columna no cuentan,
+        así se ve cuántas filas sumaría cada opción).
+        """
+        if col not in self._mapas:
+            return {}
+        mascara = self._mascara(seleccion or {}, salvo=col)
+        totales = _BITS[np.bitwise_and(self._mapas[col], mascara)].sum(axis=1, dtype=np.int64)
+        return dict(zip(self._valores[col], totales.tolist()))
+
+
+def motor(dfs, nombre, hojas, construir, columnas):
+    """
+    MotorFiltros de la tabla construir(dfs), armado una sola vez por versión de las pestañas del reporte
+    (vista derivada del libro, como el índice de búsqueda o el contrato vigente). Si la sesión tiene
+    cambios sin guardar en alguna de esas pestañas, se arma sobre su copia y no se guarda.
+    """
+    # construir recibe el libro y no las pestañas sueltas: así sigue usando las vistas tipadas y el
+    # contrato vigente de la caché. derivado solo lo guarda cuando la sesión está en la versión de la caché.
+    armar = lambda *_: MotorFiltros(construir(dfs), columnas)
+    if hasattr(dfs, "derivado"):
+        return dfs.derivado(tuple(hojas), f"filtros {nombre}", armar)
+    return armar()
+
+
+def etiqueta(conteos):
+    """format_func para st.multiselect: 'valor (filas)'."""
+    return lambda valor: f"{valor} ({conteos.get(valor, 0)})"
@@ -0,0 +1,78 @@
+# ==========================================
+# MÓDULO: ÍNDICE POR DNI ENTRE PESTAÑAS
+# ==========================================
+# La ficha de Consulta filtraba cada pestaña con dfs[h][dfs[h]["dni"] == dni] (un barrido completo
+# por pestaña y por recarga). Aquí cada pestaña tiene un índice {dni: posiciones de fila} que se arma
+# una vez por versión (CacheHojas.indice) y, cuando un guardado solo agrega filas, se extiende en el lugar.
+import numpy as np
+import pandas as pd
+
+import mod_esquema
+
+_SIN_FILAS = np.array([], dtype=np.intp)
+
+
+def _agrupar(dnis):
+    """{dni: posiciones} con factorize + un solo argsort (bastante más rápido que groupby().indices)."""
+    if not len(dnis):
+        return {}
+    codigos, unicos = pd.factorize(dnis)
+    orden = np.argsort(codigos, kind="stable")
+    cortes = np.flatnonzero(np.diff(codigos[orden])) + 1
+    return dict(zip(unicos[codigos[orden[np.r_[0, cortes]]]], np.split(orden, cortes)))
+
+
+class IndiceDni:
+    """Posiciones (iloc) de las filas de cada DNI en una pestaña."""
+
+    def __init__(self, dnis):
+        self._dnis = np.asarray(dnis, dtype=object)
+        self._posiciones = _agrupar(self._dnis)
+
+    def __len__(self):
+        return len(self._dnis)
+
+    def posiciones(self, dni):
+        return self._posiciones.get(dni, _SIN_FILAS)
+
+    def actualizado(self, dnis):
+        """
+        Índice para la nueva versión de la pestaña. Si solo se agregaron filas al final (lo habitual
+        al guardar un registro nuevo) se extiende este mismo índice; si no, se arma uno nuevo.
+        """
+        dnis = np.asarray(dnis, dtype=object)
+        n = len(self._dnis)
+        if len(dnis) < n or not np.array_equal(dnis[:n], self._dnis):
+            return IndiceDni(dnis)
+        nuevas = dnis[n:]
+        if len(nuevas):
+            for dni, pos in _agrupar(nuevas).items():
+                previas = self._posiciones.get(dni, _SIN_FILAS)
+                self._posiciones[dni] = np.concatenate([previas, pos + n])
+            self._dnis = dnis
+        return self
+
+
+def dnis_de(df):
+    """Columna DNI tal como se indexa (texto normalizado), o None si la pestaña no tiene DNI."""
+    if df is None or "dni" not in df.columns:
+        return None
+    return mod_esquema.normalizar_dni(df["dni"]).to_numpy(dtype=object)
+
+
+def filas_de(df, dni):
+    """Barrido simple para DataFrames sueltos (sin índice): mismas filas que devolvería el índice."""
+    if df is None or df.empty or "dni" not in df.columns:
+        return pd.DataFrame(columns=[] if df is None else df.columns)
+    return df[mod_esquema.normalizar_dni(df["dni"]) == dni]
+
+
+def get_employee(dfs, dni, titulos):
+    """
+    {pestaña: filas del DNI} para todas las pestañas pedidas de una sola vez.
+    Con el libro de la app sale del índice en caché; con un diccionario simple se filtra en el momento.
+    """
+    dni = mod_esquema.normalizar_dni(pd.Series([dni])).iloc[0]
+    if hasattr(dfs, "get_employee"):
+        return dfs.get_employee(dni, titulos)
+    return {t: filas_de(dfs.get(t), dni) for t in titulos}
@@ -0,0 +1,53 @@
+# ==========================================
+# MÓDULO: MEMORIA LRU DE RESULTADOS CALCULADOS
+# ==========================================
+# Guarda resultados caros (legajos de Consulta, documentos generados...) por una clave
+# que incluye la versión de los datos: cuando una pestaña cambia de versión, la clave cambia sola
+# y lo viejo termina saliendo por el extremo menos usado. Compartida por todas las sesiones del proceso.
+import threading
+from collections import OrderedDict
+
+
+class MemoLRU:
+    def __init__(self, capacidad=256):
+        self.capacidad = capacidad
+        self._datos = OrderedDict()
+        self._lock = threading.Lock()
+        self.aciertos = 0
+        self.fallos = 0
+        self.descartes = 0
+
+    def obtener(self, clave, calcular):
+        """Devuelve el valor guardado para la clave o lo calcula (fuera del candado) y lo guarda."""
+        with self._lock:
+            if clave in self._datos:
+                self._datos.move_to_end(clave)
+                self.aciertos += 1
+                return self._datos[clave]
+            self.fallos += 1
+
+        valor = calcular()
+        with self._lock:
+            self._datos[clave] = valor
+            self._datos.move_to_end(clave)
+            while len(self._datos) > self.capacidad:
+                self._datos.popitem(last=False)
+                self.descartes += 1
+        return valor
+
+    def limpiar(self):
+        with self._lock:
+            self._datos.clear()
+
+    def estadisticas(self):
+        with self._lock:
+            total = self.aciertos + self.fallos
+            return {
+                "entradas": len(self._datos),
+                "capacidad": self.capacidad,
+                "aciertos": self.aciertos,
+                "fallos": self.fallos,
+                "descartes": self.descartes,
+                "tasa_aciertos": round(self.aciertos / total, 3) if total else None,
+            }
+
@@ -1,18 +1,28 @@
 import streamlit as st
 import pandas as pd
 
+import mod_busqueda
+
+# Pestañas que usa este módulo (app.py las descarga juntas antes de mostrarlo)
+HOJAS_REQUERIDAS = ["PERSONAL"]
+
 def mostrar(dfs, save_data):
     st.markdown("<h2 style='color: #FFD700;'>👥 Trabajadores registrados en el sistema</h2>", unsafe_allow_html=True)
     
-    busqueda_nom = st.text_input("🔍 Buscar por apellidos, nombres o DNI (Nómina):").strip().lower()
+    busqueda_nom = st.text_input("🔍 Buscar por apellidos, nombres o DNI (Nómina):").strip()
     df_nom = dfs.get("PERSONAL", pd.DataFrame()).copy()
     
     if not df_nom.empty and busqueda_nom: 
-        # Convertimos todo a String de forma segura antes de buscar para evitar caídas de tipos de datos
-        mask_ape = df_nom['apellidos'].fillna("").astype(str).str.lower().str.contains(busqueda_nom, na=False)
-        mask_nom = df_nom['nombres'].fillna("").astype(str).str.lower().str.contains(busqueda_nom, na=False)
-        mask_dni = df_nom['dni'].fillna("").astype(str).str.strip().str.contains(busqueda_nom, na=False)
-        df_nom = df_nom[mask_ape | mask_nom | mask_dni]
+        # Filtro literal de siempre (apellidos, nombres o DNI que contienen el texto), en el orden de la pestaña,
+        # sobre los textos ya preparados del índice de Consulta
+        indice = mod_busqueda.indice_personal(dfs)
+        filas = indice.contiene(busqueda_nom)
+        if not filas:
+            # Sin coincidencia literal: los nombres parecidos (errores de tipeo), del más parecido al menos
+            filas = indice.buscar(busqueda_nom, limite=None)
+            if filas:
+                st.caption("Sin coincidencias exactas: se muestran nombres parecidos.")
+        df_nom = df_nom.iloc[filas]
         
     df_ver = df_nom.copy()
     
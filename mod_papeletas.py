@@ -0,0 +1,239 @@
+# ==========================================
+# MÓDULO: PAPELETAS DE VACACIONES (PLANTILLA COMPILADA)
+# ==========================================
+# Antes gen_papeleta_vac abría Template_Papeleta.docx en cada llamada y recorría todos los runs de
+# párrafos y celdas buscando cada una de las 11 claves {{...}}; si Word partía una clave en dos runs
+# (por ejemplo "{{F_" + "INICIO}}") no se reemplazaba. Ahora la plantilla se compila una vez por proceso:
+#   - se unen los runs partidos para que cada {{CLAVE}} quede entera en un solo run
+#   - el XML de cada parte con claves se corta en trozos fijos y claves (índice de ubicaciones)
+#   - llenar una papeleta es intercalar los valores entre los trozos y volver a empaquetar el .docx
+# Con eso también se pueden sacar las papeletas de todo un periodo en un ZIP (lote_zip).
+import os
+import re
+import zipfile
+from datetime import date, datetime
+from functools import lru_cache
+from io import BytesIO
+from xml.sax.saxutils import escape
+
+import pandas as pd
+from docx import Document
+
+import mod_contratos
+import mod_esquema
+
+PLANTILLA = "Template_Papeleta.docx"
+
+MESES = ["enero", "febrero", "marzo", "abril", "mayo", "junio", "julio", "agosto", "septiembre", "octubre", "noviembre", "diciembre"]
+
+_CLAVE = re.compile(r"\{\{([A-Z0-9_]+)\}\}")
+
+
+def _parrafos_tabla(tabla):
+    for fila in tabla.rows:
+        for celda in fila.cells:
+            yield from celda.paragraphs
+            for anidada in celda.tables:
+                yield from _parrafos_tabla(anidada)
+
+
+def _parrafos(doc):
+    """Párrafos del cuerpo, de las tablas (también anidadas) y de encabezados y pies."""
+    yield from doc.paragraphs
+    for tabla in doc.tables:
+        yield from _parrafos_tabla(tabla)
+    for seccion in doc.sections:
+        for parte in (seccion.header, seccion.footer):
+            yield from parte.paragraphs
+            for tabla in parte.tables:
+                yield from _parrafos_tabla(tabla)
+
+
+def _unir_runs(parrafo):
+    """Deja cada {{CLAVE}} entera en el run donde empieza (el formato de ese run es el que queda)."""
+    runs = parrafo.runs
+    textos = [r.text for r in runs]
+    inicios, pos = [], 0
+    for t in textos:
+        inicios.append(pos)
+        pos += len(t)
+    largos = [len(t) for t in textos]
+
+    def run_de(i):
+        return next(k for k, ini in enumerate(inicios) if ini <= i < ini + largos[k])
+
+    # De atrás hacia adelante: lo que se cambia en un run nunca mueve una clave anterior
+    for m in reversed(list(_CLAVE.finditer("".join(textos)))):
+        a, b = run_de(m.start()), run_de(m.end() - 1)
+        if a == b:
+            continue
+        textos[a] = textos[a][:m.start() - inicios[a]] + m.group(0)
+        for k in range(a + 1, b):
+            textos[k] = ""
+        textos[b] = textos[b][m.end() - inicios[b]:]
+        for k in range(a, b + 1):
+            runs[k].text = textos[k]
+
+
+class PlantillaCompilada:
+    """Plantilla .docx lista para llenar: partes del paquete en bytes y el XML con claves ya cortado."""
+
+    def __init__(self, ruta):
+        doc = Document(ruta)
+        for parrafo in _parrafos(doc):
+            if "{{" in parrafo.text:
+                _unir_runs(parrafo)
+        buf = BytesIO()
+        doc.save(buf)
+
+        self.partes = []    # (ZipInfo, bytes fijos o None si tiene claves)
+        self.trozos = {}    # nombre de la parte -> [texto, clave, texto, clave, ..., texto]
+        self.claves = set()
+        with zipfile.ZipFile(buf) as zf:
+            for info in zf.infolist():
+                datos = zf.read(info)
+                if info.filename.endswith(".xml") and b"{{" in datos:
+                    trozos = _CLAVE.split(datos.decode("utf-8"))
+                    self.trozos[info.filename] = trozos
+                    self.claves.update(trozos[1::2])
+                    datos = None
+                self.partes.append((info, datos))
+
+    def llenar(self, valores):
+        """Bytes del .docx con cada {{CLAVE}} reemplazada por valores[CLAVE] (las que falten quedan tal cual)."""
+        salida = BytesIO()
+        with zipfile.ZipFile(salida, "w", zipfile.ZIP_DEFLATED) as zf:
+            for info, datos in self.partes:
+                if datos is None:
+                    trozos = self.trozos[info.filename]
+                    piezas = list(trozos)
+                    for i in range(1, len(trozos), 2):
+                        clave = trozos[i]
+                        piezas[i] = escape(str(valores[clave])) if clave in valores else "{{" + clave + "}}"
+                    datos = "".join(piezas).encode("utf-8")
+                zf.writestr(info, datos)
+        return salida.getvalue()
+
+
+@lru_cache(maxsize=4)
+def _compilada(ruta, modificada):
+    return PlantillaCompilada(ruta)
+
+
+def plantilla(ruta=PLANTILLA):
+    """Plantilla compilada una vez por proceso (se vuelve a compilar si el archivo cambia)."""
+    return _compilada(ruta, os.path.getmtime(ruta))
+
+
+def _fecha(valor):
+    return valor.strftime("%d/%m/%Y") if isinstance(valor, (date, datetime)) else str(valor)
+
+
+def fecha_firma(hoy=None):
+    hoy = hoy or date.today()
+    return f"Huancayo, {hoy.day} de {MESES[hoy.month - 1]} de {hoy.year}"
+
+
+def fecha_retorno(end_d):
+    """Día siguiente al fin de las vacaciones; si cae domingo, el lunes."""
+    fin_dt = pd.to_datetime(end_d, errors='coerce')
+    if pd.isnull(fin_dt):
+        return ""
+    retorno_dt = fin_dt + pd.Timedelta(days=1)
+    if retorno_dt.weekday() == 6:  # Si cae Domingo (6), pasa a Lunes
+        retorno_dt += pd.Timedelta(days=1)
+    return retorno_dt.strftime("%d/%m/%Y")
+
+
+def valores_papeleta(apellidos, nombres, dni_b, position, f_ingreso, period, start_d, end_d, days, hoy=None):
+    return {
+        "APELLIDOS": str(apellidos).upper(),
+        "NOMBRES": str(nombres).upper(),
+        "DNI": str(dni_b),
+        "CARGO": str(position).upper(),
+        "F_INGRESO": _fecha(f_ingreso),
+        "PERIODO": str(period),
+        "F_INICIO": _fecha(start_d),
+        "F_FIN": _fecha(end_d),
+        "F_RETORNO": fecha_retorno(end_d),
+        "DIAS": str(days),
+        "FECHA_FIRMA": fecha_firma(hoy),
+    }
+
+
+def gen_papeleta_vac(apellidos, nombres, dni_b, position, f_ingreso, period, start_d, end_d, days):
+    """Papeleta individual (Word duplicado A4) como BytesIO, o None si falta la plantilla."""
+    if not os.path.exists(PLANTILLA):
+        return None
+    datos = plantilla().llenar(valores_papeleta(apellidos, nombres, dni_b, position, f_ingreso, period, start_d, end_d, days))
+    return BytesIO(datos)
+
+
+# ==========================================
+# PAPELETAS EN LOTE (TODOS LOS REGISTROS DE UN PERIODO)
+# ==========================================
+def _texto(df, col, por_defecto=""):
+    return df[col].fillna(por_defecto).astype(str).str.strip() if col in df.columns else pd.Series(por_defecto, index=df.index)
+
+
+def registros_periodo(dfs, periodo):
+    """
+    Un registro por fila de VACACIONES del periodo con fechas válidas, con los datos de la papeleta:
+    nombres de PERSONAL, cargo del contrato vigente (mod_contratos) e ingreso (primer contrato de planilla).
+    """
+    vac = mod_esquema.tipada(dfs, "VACACIONES")
+    if vac.empty or not {"periodo", "fecha de inicio", "fecha de fin"} <= set(vac.columns):
+        return pd.DataFrame()
+    vac = vac[_texto(vac, "periodo").eq(str(periodo).strip()) & vac["fecha de inicio"].notna() & vac["fecha de fin"].notna()]
+    if vac.empty:
+        return pd.DataFrame()
+
+    per = dfs.get("PERSONAL", pd.DataFrame())
+    if not per.empty and "dni" in per.columns:
+        per = per.assign(dni=mod_esquema.normalizar_dni(per["dni"])).drop_duplicates("dni").set_index("dni")
+        if "apellidos" in per.columns:
+            apellidos, nombres = _texto(per, "apellidos"), _texto(per, "nombres")
+        else:
+            apellidos, nombres = _texto(per, "apellidos y nombres"), pd.Series("", index=per.index)
+    else:
+        apellidos = nombres = pd.Series(dtype=object)
+
+    # Cargo del contrato vigente: la misma vista compartida que usan la ficha y los reportes
+    vigente = mod_contratos.contrato_vigente(dfs)
+    cargos = vigente["cargo"] if "cargo" in vigente.columns else pd.Series(dtype=object)
+    ingresos = pd.Series(dtype="datetime64[ns]")
+    con = mod_esquema.tipada(dfs, "CONTRATOS")
+    if not con.empty and "f_inicio" in con.columns:
+        planilla = con[_texto(con, "tipo contrato").str.lower().str.contains("planilla", na=False)]
+        ingresos = planilla.groupby("dni")["f_inicio"].min()
+
+    dnis = vac["dni"]
+    dias = vac["dias gozados"] if "dias gozados" in vac.columns else pd.Series(0, index=vac.index)
+    return pd.DataFrame({
+        "dni": dnis.to_numpy(),
+        "apellidos": apellidos.reindex(dnis).fillna("").to_numpy(),
+        "nombres": nombres.reindex(dnis).fillna("").to_numpy(),
+        "cargo": cargos.reindex(dnis).fillna("TRABAJADOR").to_numpy(),
+        "f_ingreso": [f.date() if pd.notnull(f) else "" for f in ingresos.reindex(dnis)],
+        "periodo": _texto(vac, "periodo").to_numpy(),
+        "inicio": vac["fecha de inicio"].dt.date.to_numpy(),
+        "fin": vac["fecha de fin"].dt.date.to_numpy(),
+        "dias": dias.fillna(0).astype(int).to_numpy(),
+    })
+
+
+def lote_zip(registros, destino, hoy=None, al_avanzar=None):
+    """Papeletas de registros_periodo() en el ZIP destino (ruta o BytesIO). Devuelve cuántas se generaron."""
+    compilada = plantilla()
+    nombres = {}
+    with zipfile.ZipFile(destino, "w", zipfile.ZIP_STORED) as zf:
+        for i, r in enumerate(registros.itertuples(index=False), start=1):
+            datos = compilada.llenar(valores_papeleta(r.apellidos, r.nombres, r.dni, r.cargo, r.f_ingreso,
+                                                      r.periodo, r.inicio, r.fin, r.dias, hoy))
+            # Una persona puede tener varias salidas en el mismo periodo
+            base = f"Papeleta_{r.dni}_{r.periodo}"
+            nombres[base] = nombres.get(base, 0) + 1
+            zf.writestr(f"{base}.docx" if nombres[base] == 1 else f"{base}_{nombres[base]}.docx", datos)
+            if al_avanzar:
+                al_avanzar(i, len(registros))
+    return len(registros)
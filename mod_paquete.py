@@ -0,0 +1,91 @@
+# ==========================================
+# MÓDULO: PAQUETE MENSUAL DE REPORTES
+# ==========================================
+# Cada mes Gerencia pide juntos el Reporte General, los Vencimientos, los Saldos de Vacaciones y los
+# Cumpleañeros. En vez de entrar a cada reporte y exportarlo por separado (cada uno descargaba y unía
+# sus pestañas), el paquete arma las cuatro tablas de una sola pasada sobre el mismo libro:
+#   - las pestañas se traen juntas (un solo batchGet en Sheets)
+#   - la vista de contrato vigente (mod_contratos) y las vistas tipadas se calculan una vez y las
+#     comparten los cuatro reportes
+#   - las cuatro hojas salen en un solo .xlsx con el mismo formato (mod_exportar.hojas_excel)
+# Se usa desde la app (mostrar) y sin Streamlit desde la línea de comandos (tareas.py paquete).
+from datetime import date
+
+import pandas as pd
+import streamlit as st
+
+import mod_cache_hojas
+import mod_exportar
+import repcumpleanos
+import reportegeneral
+import repvacaciones
+import repvencimientos
+
+# Pestañas de los cuatro reportes (se descargan juntas)
+HOJAS_REQUERIDAS = ["PERSONAL", "CONTRATOS", "DATOS GENERALES", "VACACIONES"]
+
+
+def tablas(dfs, hoy=None, estados=("ACTIVO",)):
+    """
+    {hoja: DataFrame} del paquete al día hoy: General (solo los estados pedidos, None = todos),
+    Vencimientos, Saldos_Vacaciones y Cumpleañeros del mes de hoy.
+    dfs puede ser el libro de la app, un backend de mod_almacenamiento o un diccionario de pestañas.
+    """
+    hoy = hoy or date.today()
+    libro = mod_cache_hojas.libro_directo(dfs)
+    libro.precargar(HOJAS_REQUERIDAS)
+
+    return {
+        # 1. Reporte General (la misma vista por defecto de la app: trabajadores activos)
+        "General": reportegeneral.tabla_general(libro, estados),
+        # 2. Vencimientos (ordenados por fecha más próxima a vencer)
+        "Vencimientos": repvencimientos.tabla_reporte(repvencimientos.tabla_vencimientos(libro)).reset_index(drop=True),
+        # 3. Saldos de vacaciones al día hoy
+        "Saldos_Vacaciones": repvacaciones.tabla_saldos(libro, hoy).reset_index(drop=True),
+        # 4. Cumpleañeros del mes
+        "Cumpleañeros": repcumpleanos.tabla_reporte(libro, [hoy.month], hoy.year),
+    }
+
+
+def libro_mensual(dfs, hoy=None, estados=("ACTIVO",)):
+    """Bytes del .xlsx con las cuatro hojas del paquete."""
+    return mod_exportar.hojas_excel(tablas(dfs, hoy, estados))
+
+
+def nombre_archivo(hoy=None):
+    hoy = hoy or date.today()
+    return f"Paquete_Mensual_{hoy.year}_{hoy.month:02d}.xlsx"
+
+
+# ==========================================
+# PANTALLA EN LA APP
+# ==========================================
+def mostrar(dfs):
+    st.markdown("<h2 style='color: #4A0000;'>📦 Paquete Mensual de Reportes</h2>", unsafe_allow_html=True)
+    st.caption("Reporte General (activos), Vencimientos, Saldos de Vacaciones y Cumpleañeros del mes en un solo Excel.")
+
+    if dfs.get("PERSONAL", pd.DataFrame()).empty:
+        st.warning("⚠️ Faltan datos en Personal para generar el paquete.")
+        return
+
+    hoy = st.date_input("Fecha de corte", value=date.today(), format="DD/MM/YYYY", key="paquete_hoy")
+    hojas = tablas(dfs, hoy)
+
+    columnas = st.columns(len(hojas))
+    for col, (nombre, df) in zip(columnas, hojas.items()):
+        col.metric(nombre.replace("_", " "), len(df))
+
+    # El Excel se arma al pulsar el botón y queda en caché mientras no cambien las pestañas ni la fecha
+    version = mod_exportar.version_datos(dfs, HOJAS_REQUERIDAS)
+    if version is None:
+        construir = lambda: mod_exportar.hojas_excel(hojas)
+    else:
+        construir = lambda: mod_exportar.ARCHIVOS.obtener(("paquete mensual", hoy, version), lambda: mod_exportar.hojas_excel(hojas))
+    st.download_button(
+        label="📥 Descargar Paquete Mensual",
+        data=construir,
+        file_name=nombre_archivo(hoy),
+        mime=mod_exportar.FORMATOS["Excel"][1],
+        key="btn_paquete_mensual",
+        type="primary"
+    )
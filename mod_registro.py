@@ -1,6 +1,9 @@
 import streamlit as st
 import pandas as pd
 
+# Pestañas que usa este módulo (app.py las descarga juntas antes de mostrarlo)
+HOJAS_REQUERIDAS = ["PARAMETROS", "PERSONAL", "DATOS GENERALES"]
+
 def mostrar(dfs, save_data):
     st.markdown("<h2 style='color: #FFD700;'>➕ Registro de Nuevo Colaborador</h2>", unsafe_allow_html=True)
     
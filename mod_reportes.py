@@ -3,6 +3,9 @@ import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 
+# Pestañas que usa este módulo (app.py las descarga juntas antes de mostrarlo)
+HOJAS_REQUERIDAS = ["EVALUACIONES"]
+
 # --- Función para limpiar tildes y mala codificación ---
 def limpiar_texto(texto):
     texto = str(texto).strip()
@@ -37,30 +40,80 @@ def obtener_promedios_competencias(df_subset):
                             pass
     return {k: sum(v)/len(v) for k, v in dic_competencias.items()}
 
-def mostrar(dfs):
-    st.markdown("<h2 style='color: #FFD700;'>📊 Dashboard de Desempeño Consolidado</h2>", unsafe_allow_html=True)
+# ==========================================
+# CÁLCULOS (SIN STREAMLIT: LOS USA TAMBIÉN tareas.py)
+# ==========================================
+COLUMNAS_DETALLE = ["NOMBRES Y APELLIDOS", "PERIODO", "AREA", "CARGO", "PROMEDIO GENERAL", "TIPO DE EVALUACION", "TIPO DE TRABAJADORA"]
 
+def preparar_evaluaciones(dfs):
+    """
+    EVALUACIONES con columnas en mayúsculas y PROMEDIO GENERAL numérico (sin las filas que no lo tienen).
+    None si no hay evaluaciones; ValueError si faltan las columnas obligatorias.
+    """
     if "EVALUACIONES" not in dfs or dfs["EVALUACIONES"].empty:
-        st.warning("⚠️ No se encontraron datos en 'EVALUACIONES'. Por favor, sube y procesa un archivo en la pestaña de Evaluaciones.")
-        return
+        return None
 
     df = dfs.get("EVALUACIONES", pd.DataFrame()).copy()
     df.columns = [str(c).strip().upper() for c in df.columns]
 
-    if "PROMEDIO GENERAL" in df.columns:
-        df["PROMEDIO GENERAL"] = df["PROMEDIO GENERAL"].astype(str).str.replace(',', '.').str.strip()
-        df["PROMEDIO GENERAL"] = pd.to_numeric(df["PROMEDIO GENERAL"], errors='coerce')
-        df = df.dropna(subset=["PROMEDIO GENERAL"])
-    else:
-        st.error(f"⚠️ Error: No se encontró 'PROMEDIO GENERAL'. Columnas detectadas: {list(df.columns)}")
-        return
+    if "PROMEDIO GENERAL" not in df.columns:
+        raise ValueError(f"No se encontró 'PROMEDIO GENERAL'. Columnas detectadas: {list(df.columns)}")
+    df["PROMEDIO GENERAL"] = df["PROMEDIO GENERAL"].astype(str).str.replace(',', '.').str.strip()
+    df["PROMEDIO GENERAL"] = pd.to_numeric(df["PROMEDIO GENERAL"], errors='coerce')
+    df = df.dropna(subset=["PROMEDIO GENERAL"])
 
     if "PERIODO" not in df.columns or "NOMBRES Y APELLIDOS" not in df.columns:
-        st.error("⚠️ Faltan las columnas 'PERIODO' o 'NOMBRES Y APELLIDOS'.")
-        return
+        raise ValueError("Faltan las columnas 'PERIODO' o 'NOMBRES Y APELLIDOS'.")
         
     if "AREA" not in df.columns: df["AREA"] = "No registrada"
     if "CARGO" not in df.columns: df["CARGO"] = "No registrado"
+    return df
+
+def ranking(df, col, ascendente=False):
+    """Promedio general por colaborador, área o cargo, ordenado."""
+    return df.groupby(col)["PROMEDIO GENERAL"].mean().reset_index().sort_values(by="PROMEDIO GENERAL", ascending=ascendente)
+
+def competencias_por(df, col):
+    """Promedio de cada competencia (columnas) por valor de col (filas)."""
+    filas = {entidad: obtener_promedios_competencias(grupo) for entidad, grupo in df.groupby(col)}
+    return pd.DataFrame.from_dict(filas, orient="index").rename_axis(col).reset_index()
+
+def mayor_brecha(promedios_por_entidad):
+    """(competencia, brecha) con la mayor diferencia entre las entidades comparadas; ("", 0) si no hay."""
+    mayor, comp_mayor = 0, ""
+    competencias = {c for promedios in promedios_por_entidad.values() for c in promedios}
+    for comp in competencias:
+        puntajes = [p[comp] for p in promedios_por_entidad.values() if comp in p]
+        if len(puntajes) > 1 and max(puntajes) - min(puntajes) > mayor:
+            mayor, comp_mayor = max(puntajes) - min(puntajes), comp
+    return comp_mayor, mayor
+
+def detalle(df):
+    return df[[c for c in COLUMNAS_DETALLE if c in df.columns]]
+
+def tablas_dashboard(dfs):
+    """{hoja: DataFrame} del dashboard sin filtros: registros, rankings y competencias por colaborador."""
+    df = preparar_evaluaciones(dfs)
+    if df is None:
+        return {}
+    return {
+        "Evaluaciones": detalle(df),
+        "Ranking_Colaboradores": ranking(df, "NOMBRES Y APELLIDOS"),
+        "Ranking_Areas": ranking(df, "AREA"),
+        "Competencias": competencias_por(df, "NOMBRES Y APELLIDOS"),
+    }
+
+def mostrar(dfs):
+    st.markdown("<h2 style='color: #FFD700;'>📊 Dashboard de Desempeño Consolidado</h2>", unsafe_allow_html=True)
+
+    try:
+        df = preparar_evaluaciones(dfs)
+    except ValueError as e:
+        st.error(f"⚠️ Error: {e}")
+        return
+    if df is None:
+        st.warning("⚠️ No se encontraron datos en 'EVALUACIONES'. Por favor, sube y procesa un archivo en la pestaña de Evaluaciones.")
+        return
 
     # --- BARRA LATERAL DE FILTROS ---
     st.sidebar.header("🔍 Filtros Dinámicos")
@@ -123,7 +176,6 @@ def mostrar(dfs):
         
         datos_radar = []
         dic_promedios_entidades = {}
-        todas_las_competencias = set()
 
         for entidad in seleccionados_vs:
             df_entidad = df_filtrado[df_filtrado[col_vs] == entidad]
@@ -132,7 +184,6 @@ def mostrar(dfs):
             
             for comp, val in promedios_comp.items():
                 datos_radar.append({"Entidad": entidad, "Competencia": comp, "Puntaje": val})
-                todas_las_competencias.add(comp)
 
         with col_graf_vs:
             if datos_radar:
@@ -191,19 +242,10 @@ def mostrar(dfs):
             html_analisis += "</ul>"
 
             # 2. Encontrar la mayor brecha
-            mayor_brecha = 0
-            comp_mayor_brecha = ""
-
-            for comp in todas_las_competencias:
-                puntajes = [dic_promedios_entidades[ent].get(comp, 0) for ent in seleccionados_vs if comp in dic_promedios_entidades[ent]]
-                if len(puntajes) > 1:
-                    brecha = max(puntajes) - min(puntajes)
-                    if brecha > mayor_brecha:
-                        mayor_brecha = brecha
-                        comp_mayor_brecha = comp
+            comp_mayor_brecha, brecha = mayor_brecha(dic_promedios_entidades)
             
-            if mayor_brecha > 0.3:
-                html_analisis += f"<p style='color: #FFAA00;'><b>⚠️ Brecha Crítica Detectada:</b> La diferencia más drástica entre los evaluados se encuentra en <b>{comp_mayor_brecha}</b>, con una diferencia de <b>{mayor_brecha:.2f} puntos</b>. Es el punto clave a revisar.</p>"
+            if brecha > 0.3:
+                html_analisis += f"<p style='color: #FFAA00;'><b>⚠️ Brecha Crítica Detectada:</b> La diferencia más drástica entre los evaluados se encuentra en <b>{comp_mayor_brecha}</b>, con una diferencia de <b>{brecha:.2f} puntos</b>. Es el punto clave a revisar.</p>"
             else:
                 html_analisis += f"<p style='color: #00FFaa;'><b>🤝 Perfiles Similares:</b> No se detectan brechas críticas mayores a 0.3 puntos. Los evaluados tienen competencias muy parejas.</p>"
 
@@ -233,11 +275,8 @@ def mostrar(dfs):
     if tipo_sel != "Todos" and col_tipo:
         df_rank = df_rank[df_rank[col_tipo] == tipo_sel]
 
-    df_rank_emp = df_rank.groupby("NOMBRES Y APELLIDOS")["PROMEDIO GENERAL"].mean().reset_index()
-    df_rank_emp = df_rank_emp.sort_values(by="PROMEDIO GENERAL", ascending=es_ascendente)
-    
-    df_rank_area = df_rank.groupby("AREA")["PROMEDIO GENERAL"].mean().reset_index()
-    df_rank_area = df_rank_area.sort_values(by="PROMEDIO GENERAL", ascending=es_ascendente)
+    df_rank_emp = ranking(df_rank, "NOMBRES Y APELLIDOS", es_ascendente)
+    df_rank_area = ranking(df_rank, "AREA", es_ascendente)
 
     color_scale = [
         [0.0, "rgb(200, 0, 0)"],   # Rojo
@@ -355,5 +394,4 @@ def mostrar(dfs):
                     st.write(f"- **{cat}:** {val:.2f} ({estado})")
 
     with st.expander("📂 Ver registros históricos detallados"):
-        cols_mostrar = ["NOMBRES Y APELLIDOS", "PERIODO", "AREA", "CARGO", "PROMEDIO GENERAL", "TIPO DE EVALUACION", "TIPO DE TRABAJADORA"]
-        st.dataframe(df_filtrado[[c for c in cols_mostrar if c in df_filtrado.columns]], hide_index=True, use_container_width=True)
+        st.dataframe(detalle(df_filtrado), hide_index=True, use_container_width=True)
@@ -2,6 +2,9 @@ import streamlit as st
 import pandas as pd
 from datetime import datetime
 
+# Pestañas que usa este módulo (app.py las descarga juntas antes de mostrarlo)
+HOJAS_REQUERIDAS = ["USUARIOS", "AUDITORIA"]
+
 def mostrar(dfs, save_data):
     # ==========================================
     # LÓGICA DE AUDITORÍA INTEGRADA
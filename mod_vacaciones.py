@@ -0,0 +1,136 @@
+# ==========================================
+# MÓDULO: MOTOR DE ACUMULACIÓN DE VACACIONES
+# ==========================================
+# La pestaña VACACIONES de Consulta y repvacaciones recorrían año por año (while) y, dentro de cada año,
+# todos los contratos con iterrows(); el reporte además lo repetía trabajador por trabajador.
+# Aquí se arma de una vez la tabla de periodos aniversario de todos los trabajadores y se cruza con los
+# contratos de planilla con aritmética de intervalos (en días enteros):
+#   - los periodos empiezan en el primer contrato de planilla y se repiten cada año mientras empiecen hasta hoy
+#   - días del periodo cubiertos por contratos (un contrato sin fin cuenta hasta hoy)
+#   - generados = días cubiertos / días del periodo * 30 (30 días por año completo, proporcional si no)
+#   - el detalle muestra cada periodo redondeado a 2 decimales (como la pestaña de Consulta) y el total
+#     suma los valores sin redondear, en orden de periodo, y redondea solo el saldo (como el reporte)
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+DIAS_POR_ANIO = 30
+
+COLUMNAS_DETALLE = ["dni", "periodo", "desde", "hasta", "generados", "gozados", "saldo"]
+
+
+def _dias(fechas):
+    """Fechas -> número de día (entero), para restar sin pasar por Timedelta."""
+    return np.asarray(fechas, dtype="datetime64[D]").astype(np.int64)
+
+
+def _fechas(anios, meses, dias):
+    """Arma fechas desde arreglos de año, mes y día sin pasar por objetos date."""
+    return ((anios - 1970).astype("datetime64[Y]") + (meses - 1).astype("timedelta64[M]")
+            + (dias - 1).astype("timedelta64[D]"))
+
+
+def contratos_planilla(contratos):
+    """Contratos de planilla con fecha de inicio (los únicos que generan vacaciones)."""
+    if contratos.empty or "f_inicio" not in contratos.columns or "tipo contrato" not in contratos.columns:
+        return pd.DataFrame(columns=["dni", "f_inicio", "f_fin"])
+    planilla = contratos["tipo contrato"].astype(str).str.lower().str.contains("planilla", na=False)
+    return contratos[planilla & contratos["f_inicio"].notna()]
+
+
+def periodos(inicios, hoy):
+    """
+    Periodos aniversario de cada DNI a partir de su primer contrato (Serie dni -> fecha).
+    Igual que sumar pd.DateOffset(years=1) repetidamente: quien empezó un 29 de febrero pasa al 28 y ahí se queda.
+    """
+    inicios = pd.to_datetime(inicios.dropna())
+    if inicios.empty:
+        return pd.DataFrame(columns=["dni", "inicio", "fin", "periodo"])
+    y0, m0, d0 = inicios.dt.year.to_numpy(), inicios.dt.month.to_numpy(), inicios.dt.day.to_numpy()
+    bisiesto = (m0 == 2) & (d0 == 29)
+    d_aniv = np.where(bisiesto, 28, d0)
+
+    # Cantidad de periodos: aniversarios que ya llegaron (incluido el propio inicio)
+    falta = (m0 * 100 + d_aniv) > (hoy.month * 100 + hoy.day)
+    n = hoy.year - y0 + 1 - falta.astype(int)
+    n = np.where(inicios.to_numpy() > np.datetime64(hoy), 0, np.clip(n, 0, None))
+
+    fila = np.repeat(np.arange(len(inicios)), n)
+    k = np.arange(len(fila)) - np.repeat(np.cumsum(n) - n, n)
+    anios = y0[fila] + k
+    inicio = _fechas(anios, m0[fila], np.where(bisiesto[fila] & (k > 0), 28, d0[fila]))
+    fin = _fechas(anios + 1, m0[fila], d_aniv[fila]) - np.timedelta64(1, "D")
+    return pd.DataFrame({
+        "dni": inicios.index.to_numpy()[fila],
+        "inicio": inicio.astype("datetime64[ns]"),
+        "fin": fin.astype("datetime64[ns]"),
+        "periodo": pd.Series(anios).astype(str) + "-" + pd.Series(anios + 1).astype(str),
+    })
+
+
+def calcular(contratos, vacaciones, hoy=None):
+    """
+    Acumulación de vacaciones de todos los trabajadores a la vez.
+    Recibe CONTRATOS y VACACIONES tipadas (mod_esquema) y devuelve:
+      - detalle: una fila por (dni, periodo) con días generados, gozados en ese periodo y saldo
+      - totales: por dni, generados (suma de los periodos sin redondear), gozados (todos los registros) y saldo
+    """
+    hoy = hoy or date.today()
+    planilla = contratos_planilla(contratos)
+    per = periodos(planilla.groupby("dni")["f_inicio"].min(), hoy)
+
+    # Contratos x periodos del mismo DNI (los periodos de cada DNI quedan contiguos):
+    # cada contrato se repite una vez por periodo de su DNI y se miden los días que cubre de cada uno
+    codigos, unicos = pd.factorize(per["dni"])
+    primero = np.flatnonzero(np.r_[True, codigos[1:] != codigos[:-1]]) if len(per) else np.array([], dtype=np.intp)
+    cuantos = np.diff(np.r_[primero, len(per)])
+    c_cod = pd.Index(unicos).get_indexer(planilla["dni"])
+    validos = c_cod >= 0
+    c_cod = c_cod[validos]
+    c_ini = _dias(planilla["f_inicio"])[validos]
+    hoy_d = _dias(np.datetime64(hoy))
+    c_fin = _dias(planilla["f_fin"].fillna(pd.Timestamp(hoy)))[validos]
+
+    repeticiones = cuantos[c_cod]
+    contrato = np.repeat(np.arange(len(c_cod)), repeticiones)
+    periodo = np.repeat(primero[c_cod], repeticiones) + (np.arange(len(contrato)) - np.repeat(np.cumsum(repeticiones) - repeticiones, repeticiones))
+    p_ini, p_fin = _dias(per["inicio"]), _dias(per["fin"])
+    desde = np.maximum(p_ini[periodo], c_ini[contrato])
+    hasta = np.minimum(np.minimum(p_fin[periodo], c_fin[contrato]), hoy_d)
+    cubiertos = np.bincount(periodo, weights=np.clip(hasta - desde + 1, 0, None), minlength=len(per))
+
+    largo = p_fin - p_ini + 1
+    exactos = cubiertos / largo * DIAS_POR_ANIO
+    generados = [round(g, 2) for g in exactos.tolist()]
+
+    # Días gozados por (dni, periodo) y en total
+    if not vacaciones.empty and "dias gozados" in vacaciones.columns:
+        gozados = pd.to_numeric(vacaciones["dias gozados"], errors="coerce")
+        periodo_v = vacaciones["periodo"] if "periodo" in vacaciones.columns else pd.Series("", index=vacaciones.index)
+        periodo_v = periodo_v.astype(str).str.strip()
+        goz_periodo = gozados.groupby([vacaciones["dni"], periodo_v]).sum()
+        goz_total = gozados.groupby(vacaciones["dni"]).sum()
+    else:
+        goz_periodo = pd.Series(dtype=float)
+        goz_total = pd.Series(dtype=float)
+
+    detalle = pd.DataFrame({
+        "dni": per["dni"],
+        "periodo": per["periodo"],
+        "desde": per["inicio"],
+        "hasta": per["fin"],
+        "generados": pd.Series(generados, dtype=float),
+    })
+    claves = pd.MultiIndex.from_arrays([detalle["dni"], detalle["periodo"]])
+    detalle["gozados"] = goz_periodo.reindex(claves).fillna(0).to_numpy() if len(goz_periodo) else 0.0
+    detalle["saldo"] = (detalle["generados"] - detalle["gozados"]).round(2)
+
+    # bincount suma en el orden de los periodos (el mismo del while original): el saldo sale idéntico
+    totales = pd.DataFrame({
+        "generados": pd.Series(np.bincount(codigos, weights=exactos, minlength=len(unicos)), index=unicos),
+        "gozados": goz_total,
+    }).fillna(0)
+    totales["saldo"] = (totales["generados"] - totales["gozados"]).round(2)
+    totales.index.name = "dni"
+    return detalle[COLUMNAS_DETALLE], totales
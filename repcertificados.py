@@ -0,0 +1,83 @@
+# ==========================================
+# MÓDULO: CERTIFICADOS EN LOTE
+# ==========================================
+
+import re
+from datetime import date
+from io import BytesIO
+
+import streamlit as st
+import pandas as pd
+
+import mod_certificados
+import mod_esquema
+import mod_ficha
+
+# Pestañas que usa este módulo (app.py las descarga juntas antes de mostrarlo)
+HOJAS_REQUERIDAS = ["PERSONAL", "CONTRATOS", "DATOS GENERALES"]
+
+def _opciones(df, col):
+    if df.empty or col not in df.columns:
+        return []
+    return sorted({str(x).strip().upper() for x in df[col].dropna() if str(x).strip()})
+
+def mostrar(dfs):
+    st.markdown("<h2 style='color: #4A0000;'>📄 Certificados y Constancias en Lote</h2>", unsafe_allow_html=True)
+
+    df_cont = dfs.get("CONTRATOS", pd.DataFrame())
+    if df_cont.empty:
+        st.warning("⚠️ No hay contratos registrados para generar certificados.")
+        return
+
+    # 1. ¿A quiénes? Lista de DNI pegada o filtros por sede, área y fin de contrato
+    st.markdown("### 🔍 Selección de Colaboradores")
+    modo = st.radio("Seleccionar por", ["Filtros", "Lista de DNI"], horizontal=True, key="cert_lote_modo")
+
+    filtros = {}
+    if modo == "Lista de DNI":
+        texto = st.text_area("DNI (uno por línea o separados por comas)", key="cert_lote_dnis")
+        filtros["dnis"] = re.findall(r"\d+", texto)
+    else:
+        c1, c2, c3, c4 = st.columns(4)
+        with c1:
+            sede = st.selectbox("Sede", ["TODAS"] + _opciones(dfs.get("DATOS GENERALES", pd.DataFrame()), "sede"), key="cert_lote_sede")
+        with c2:
+            area = st.selectbox("Área", ["TODAS"] + _opciones(df_cont, "area"), key="cert_lote_area")
+        with c3:
+            filtros["fin_desde"] = st.date_input("Fin de contrato desde", value=None, format="DD/MM/YYYY", key="cert_lote_desde")
+        with c4:
+            filtros["fin_hasta"] = st.date_input("Fin de contrato hasta", value=None, format="DD/MM/YYYY", key="cert_lote_hasta")
+        filtros["sede"] = None if sede == "TODAS" else sede
+        filtros["area"] = None if area == "TODAS" else area
+
+    tipo = st.selectbox("Tipo de documento", mod_ficha.OPCIONES_CERTIFICADO, key="cert_lote_tipo")
+
+    if modo == "Lista de DNI" and not filtros["dnis"]:
+        st.info("Pegue los DNI de los colaboradores para generar sus documentos.")
+        return
+    seleccion = mod_certificados.cohorte(dfs, **filtros)
+    st.success(f"📋 **{len(seleccion)}** colaboradores con contratos cumplen la selección.")
+    if modo == "Lista de DNI":
+        pedidos = set(mod_esquema.normalizar_dni(pd.Series(filtros["dnis"], dtype=object)))
+        faltan = sorted(pedidos - set(seleccion))
+        if faltan:
+            st.warning(f"⚠️ Sin contratos registrados: {', '.join(faltan)}")
+
+    # 2. Generación en paralelo con barra de avance; el ZIP queda listo para descargar
+    if st.button("📦 Generar ZIP de Documentos", disabled=not seleccion, key="cert_lote_generar"):
+        barra = st.progress(0.0, text=f"0 de {len(seleccion)} documentos")
+        destino = BytesIO()
+        tareas = mod_certificados.tareas_lote(dfs, seleccion, tipo)
+        mod_certificados.lote_zip(tareas, destino,
+                                  al_avanzar=lambda hechos, total: barra.progress(hechos / total, text=f"{hechos} de {total} documentos"))
+        st.session_state["cert_lote_zip"] = destino.getvalue()
+
+    if st.session_state.get("cert_lote_zip"):
+        st.download_button(
+            label="📥 Descargar ZIP",
+            data=st.session_state["cert_lote_zip"],
+            file_name=f"Certificados_{date.today().strftime('%Y%m%d')}.zip",
+            mime="application/zip",
+            key="cert_lote_descargar",
+            type="primary"
+        )
@@ -9,6 +9,98 @@ from io import BytesIO
 import requests
 from PIL import Image, ImageDraw, ImageFont, ImageOps
 
+import mod_edad
+import mod_exportar
+import mod_esquema
+
+# Pestañas que usa este módulo (app.py las descarga juntas antes de mostrarlo)
+HOJAS_REQUERIDAS = ["PERSONAL", "DATOS GENERALES"]
+
+MESES = {1: "Enero", 2: "Febrero", 3: "Marzo", 4: "Abril", 5: "Mayo", 6: "Junio", 7: "Julio", 8: "Agosto", 9: "Septiembre", 10: "Octubre", 11: "Noviembre", 12: "Diciembre"}
+
+# Columnas de la tabla y de la exportación
+COLUMNAS_REPORTE = ["DNI", "Trabajador", "SEDE", "Fecha de cumpleaños", "Años a cumplir"]
+
+def tabla_cumpleanos(dfs, anio=None):
+    """
+    Todos los trabajadores con fecha de nacimiento válida, ordenados por mes y día, con la edad que
+    cumplen en el año indicado. None si DATOS GENERALES no tiene la columna de fecha de nacimiento.
+    """
+    df_per = dfs.get("PERSONAL", pd.DataFrame()).copy()
+    df_gen = dfs.get("DATOS GENERALES", pd.DataFrame()).copy()
+
+    # BLINDAJE: Limpiar nombres de columnas para evitar espacios ocultos
+    df_per.columns = df_per.columns.astype(str).str.strip().str.upper()
+    df_gen.columns = df_gen.columns.astype(str).str.strip().str.upper()
+
+    col_fnac = next((c for c in df_gen.columns if "NACIMIENTO" in c and "FECHA" in c), None)
+    if not col_fnac:
+        return None
+
+    # --- LÓGICA ULTRA SEGURA DE NOMBRES ---
+    col_nombres = next((c for c in df_per.columns if "NOMBRE" in c), None)
+    col_apellidos = next((c for c in df_per.columns if "APELLIDO" in c), None)
+    
+    if col_nombres and col_apellidos:
+        df_per["Trabajador"] = df_per[col_nombres].astype(str).str.strip() + " " + df_per[col_apellidos].astype(str).str.strip()
+    elif col_nombres:
+        df_per["Trabajador"] = df_per[col_nombres].astype(str).str.strip()
+    else:
+        df_per["Trabajador"] = "Nombre no encontrado"
+    
+    # --- LÓGICA PARA LA FOTO Y CONTACTO ---
+    col_foto = next((c for c in df_per.columns if "FOTO" in c), None)
+    col_cel = next((c for c in df_gen.columns if any(x in c for x in ["CELULAR", "TELEFONO", "MÓVIL"])), None)
+    col_em = next((c for c in df_gen.columns if any(x in c for x in ["CORREO", "EMAIL"])), None)
+    col_sede = next((c for c in df_gen.columns if "SEDE" in c), None)
+    
+    if col_foto: df_per.rename(columns={col_foto: "Foto_URL"}, inplace=True)
+    
+    cols_per_a_jalar = ["DNI", "Trabajador"]
+    if col_foto: cols_per_a_jalar.append("Foto_URL")
+    
+    df_cumple = df_per[cols_per_a_jalar].copy()
+    
+    cols_gen_a_jalar = ["DNI", col_fnac]
+    if col_sede: cols_gen_a_jalar.append(col_sede)
+    if col_cel: cols_gen_a_jalar.append(col_cel)
+    if col_em: cols_gen_a_jalar.append(col_em)
+    
+    df_gen_temp = df_gen[cols_gen_a_jalar].copy()
+    # La fecha de nacimiento ya viene convertida en la vista tipada (misma fila, mismo índice)
+    if col_fnac == "FECHA DE NACIMIENTO":
+        df_gen_temp[col_fnac] = mod_esquema.tipada(dfs, "DATOS GENERALES")["fecha de nacimiento"]
+    
+    # Unión segura
+    df_cumple = df_cumple.merge(df_gen_temp, on="DNI", how="inner")
+    if col_sede:
+        df_cumple.rename(columns={col_sede: "SEDE"}, inplace=True)
+    else:
+        df_cumple["SEDE"] = "No registrada"
+    
+    df_cumple[col_fnac] = mod_esquema.parsear_fechas(df_cumple[col_fnac])
+    df_cumple = df_cumple.dropna(subset=[col_fnac])
+    
+    df_cumple["Mes_Num"] = df_cumple[col_fnac].dt.month
+    df_cumple["Dia"] = df_cumple[col_fnac].dt.day
+    df_cumple["Mes"] = df_cumple["Mes_Num"].map(MESES)
+    
+    df_cumple["Años a cumplir"] = mod_edad.edades_a_cumplir(df_cumple[col_fnac], anio or date.today().year)
+    df_cumple["Fecha de cumpleaños"] = df_cumple["Dia"].astype(str) + " de " + df_cumple["Mes"]
+
+    if col_cel: df_cumple.rename(columns={col_cel: "Celular"}, inplace=True)
+    if col_em: df_cumple.rename(columns={col_em: "Email"}, inplace=True)
+    return df_cumple.sort_values(["Mes_Num", "Dia"], kind="stable")
+
+def tabla_reporte(dfs, meses=None, anio=None):
+    """Columnas exportables de los cumpleañeros de los meses indicados (números 1-12; None = todo el año)."""
+    df_cumple = tabla_cumpleanos(dfs, anio)
+    if df_cumple is None:
+        return pd.DataFrame(columns=COLUMNAS_REPORTE)
+    if meses:
+        df_cumple = df_cumple[df_cumple["Mes_Num"].isin(list(meses))]
+    return df_cumple[COLUMNAS_REPORTE].reset_index(drop=True)
+
 def mostrar(dfs):
     st.markdown("<h2 style='color: #4A0000;'>🎂 Reporte de Cumpleañeros</h2>", unsafe_allow_html=True)
     
@@ -16,63 +108,10 @@ def mostrar(dfs):
     df_gen = dfs.get("DATOS GENERALES", pd.DataFrame())
     
     if not df_per.empty and not df_gen.empty:
-        # BLINDAJE: Limpiar nombres de columnas para evitar espacios ocultos
-        df_per.columns = df_per.columns.astype(str).str.strip().str.upper()
-        df_gen.columns = df_gen.columns.astype(str).str.strip().str.upper()
-
-        col_fnac = next((c for c in df_gen.columns if "NACIMIENTO" in c and "FECHA" in c), None)
+        df_cumple = tabla_cumpleanos(dfs)
         
-        if col_fnac:
-            # --- LÓGICA ULTRA SEGURA DE NOMBRES ---
-            col_nombres = next((c for c in df_per.columns if "NOMBRE" in c), None)
-            col_apellidos = next((c for c in df_per.columns if "APELLIDO" in c), None)
-            
-            if col_nombres and col_apellidos:
-                df_per["Trabajador"] = df_per[col_nombres].astype(str).str.strip() + " " + df_per[col_apellidos].astype(str).str.strip()
-            elif col_nombres:
-                df_per["Trabajador"] = df_per[col_nombres].astype(str).str.strip()
-            else:
-                df_per["Trabajador"] = "Nombre no encontrado"
-            
-            # --- LÓGICA PARA LA FOTO Y CONTACTO ---
-            col_foto = next((c for c in df_per.columns if "FOTO" in c), None)
-            col_cel = next((c for c in df_gen.columns if any(x in c for x in ["CELULAR", "TELEFONO", "MÓVIL"])), None)
-            col_em = next((c for c in df_gen.columns if any(x in c for x in ["CORREO", "EMAIL"])), None)
-            col_sede = next((c for c in df_gen.columns if "SEDE" in c), None)
-            
-            if col_foto: df_per.rename(columns={col_foto: "Foto_URL"}, inplace=True)
-            
-            cols_per_a_jalar = ["DNI", "Trabajador"]
-            if col_foto: cols_per_a_jalar.append("Foto_URL")
-            
-            df_cumple = df_per[cols_per_a_jalar].copy()
-            
-            cols_gen_a_jalar = ["DNI", col_fnac]
-            if col_sede: cols_gen_a_jalar.append(col_sede)
-            if col_cel: cols_gen_a_jalar.append(col_cel)
-            if col_em: cols_gen_a_jalar.append(col_em)
-            
-            df_gen_temp = df_gen[cols_gen_a_jalar].copy()
-            
-            # Unión segura
-            df_cumple = df_cumple.merge(df_gen_temp, on="DNI", how="inner")
-            if col_sede:
-                df_cumple.rename(columns={col_sede: "SEDE"}, inplace=True)
-            else:
-                df_cumple["SEDE"] = "No registrada"
-            
-            df_cumple[col_fnac] = pd.to_datetime(df_cumple[col_fnac], errors="coerce")
-            df_cumple = df_cumple.dropna(subset=[col_fnac])
-            
-            meses = {1: "Enero", 2: "Febrero", 3: "Marzo", 4: "Abril", 5: "Mayo", 6: "Junio", 7: "Julio", 8: "Agosto", 9: "Septiembre", 10: "Octubre", 11: "Noviembre", 12: "Diciembre"}
-            df_cumple["Mes_Num"] = df_cumple[col_fnac].dt.month
-            df_cumple["Dia"] = df_cumple[col_fnac].dt.day
-            df_cumple["Mes"] = df_cumple["Mes_Num"].map(meses)
-            
-            año_actual = date.today().year
-            df_cumple["Años a cumplir"] = año_actual - df_cumple[col_fnac].dt.year
-            df_cumple["Fecha de cumpleaños"] = df_cumple["Dia"].astype(str) + " de " + df_cumple["Mes"]
-            
+        if df_cumple is not None:
+            meses = MESES
             # --- Filtros ---
             st.markdown("### 🔍 Filtros")
             col1, col2 = st.columns(2)
@@ -82,12 +121,9 @@ def mostrar(dfs):
             with col2:
                 f_mes = st.multiselect("Mes", options=list(meses.values()), default=[meses[date.today().month]])
             
+            # La tabla ya viene ordenada por mes y día
             if f_sede: df_cumple = df_cumple[df_cumple["SEDE"].isin(f_sede)]
             if f_mes: df_cumple = df_cumple[df_cumple["Mes"].isin(f_mes)]
-            df_cumple = df_cumple.sort_values(["Mes_Num", "Dia"])
-
-            if col_cel: df_cumple.rename(columns={col_cel: "Celular"}, inplace=True)
-            if col_em: df_cumple.rename(columns={col_em: "Email"}, inplace=True)
 
             st.markdown("### ✨ Celebraciones Visuales")
             
@@ -205,12 +241,13 @@ def mostrar(dfs):
             st.markdown("---")
             
             # Tabla y Exportación a Excel intactas
-            st.dataframe(df_cumple[["DNI", "Trabajador", "SEDE", "Fecha de cumpleaños", "Años a cumplir"]], hide_index=True)
+            st.dataframe(df_cumple[COLUMNAS_REPORTE], hide_index=True)
             
-            output_cump = BytesIO()
-            with pd.ExcelWriter(output_cump, engine='openpyxl') as writer:
-                df_cumple[["DNI", "Trabajador", "SEDE", "Fecha de cumpleaños", "Años a cumplir"]].to_excel(writer, index=False, sheet_name='Cumpleañeros')
-            st.download_button(label="📥 Exportar a Excel", data=output_cump.getvalue(), file_name="Reporte_Cumpleañeros.xlsx", key="btn_exp_cump", type="primary")
+            # El archivo se arma recién al pulsar "Exportar" ("Años a cumplir" depende del año en curso)
+            mod_exportar.boton_exportar(df_cumple[COLUMNAS_REPORTE], "cumpleaños",
+                                        {"sede": f_sede, "mes": f_mes, "anio": date.today().year},
+                                        mod_exportar.version_datos(dfs, HOJAS_REQUERIDAS),
+                                        "Reporte_Cumpleañeros", hoja="Cumpleañeros", key="btn_exp_cump")
 
         else:
             st.warning("⚠️ No se encontró la columna de 'Fecha de nacimiento'.")
@@ -2,58 +2,76 @@
  # MÓDULO: REPORTE DE SALDO DE VACACIONES
  # ==========================================
 
+import os
+from datetime import date
+
 import streamlit as st
 import pandas as pd
-from datetime import date
 from io import BytesIO
 
+import mod_contratos
+import mod_exportar
+import mod_esquema
+import mod_papeletas
+import mod_vacaciones
+
+# Pestañas que usa este módulo (app.py las descarga juntas antes de mostrarlo)
+HOJAS_REQUERIDAS = ["PERSONAL", "DATOS GENERALES", "CONTRATOS", "VACACIONES"]
+
+# Columnas de la tabla y de la exportación
+COLUMNAS_REPORTE = ["DNI", "TRABAJADOR", "SEDE", "AREA", "SALDO DE VACACIONES"]
+
+def tabla_saldos(dfs, hoy=None):
+    """Saldo de vacaciones al día hoy de todos los trabajadores de PERSONAL, con SEDE y AREA del contrato vigente."""
+    df_per = dfs.get("PERSONAL", pd.DataFrame())
+    df_cont = dfs.get("CONTRATOS", pd.DataFrame())
+    df_vac = dfs.get("VACACIONES", pd.DataFrame())
+    if df_per.empty:
+        return pd.DataFrame(columns=COLUMNAS_REPORTE)
+
+    # 1. Preparar la base (DNI y Nombres)
+    df_per_calc = df_per.copy()
+    df_per_calc.columns = [str(c).upper().strip() for c in df_per_calc.columns]
+    col_n_p = next((c for c in df_per_calc.columns if "APELLIDO" in c or "NOMBRE" in c), "TRABAJADOR")
+    
+    df_rep = df_per_calc[["DNI", col_n_p]].copy()
+    
+    # 2-3. SEDE y AREA del contrato vigente (la misma vista en caché que Reporte General y Vencimientos)
+    vigente = mod_contratos.contrato_vigente(dfs)
+    dnis_rep = df_rep["DNI"].astype(str).str.strip()
+    for col in ["sede", "area"]:
+        if col in vigente.columns:
+            df_rep[col.upper()] = vigente[col].reindex(dnis_rep).to_numpy()
+    
+    # Limpiar columnas y forzar mayúsculas
+    if "SEDE" not in df_rep.columns: df_rep["SEDE"] = "NO REGISTRADA"
+    if "AREA" not in df_rep.columns: df_rep["AREA"] = "NO REGISTRADA"
+    
+    df_rep["SEDE"] = df_rep["SEDE"].fillna("NO REGISTRADA").astype(str).str.upper()
+    df_rep["AREA"] = df_rep["AREA"].fillna("NO REGISTRADA").astype(str).str.upper()
+
+    # 4. Saldo de vacaciones de todos los trabajadores de una vez (mod_vacaciones, el mismo motor de Consulta).
+    #    El DNI ya llega normalizado desde la carga y las fechas/días desde la vista tipada.
+    vacio = pd.DataFrame()
+    c_df = mod_esquema.tipada(dfs, "CONTRATOS") if not df_cont.empty else vacio
+    v_df = mod_esquema.tipada(dfs, "VACACIONES") if not df_vac.empty else vacio
+    _, totales = mod_vacaciones.calcular(c_df, v_df, hoy)
+    df_rep["SALDO DE VACACIONES"] = totales["saldo"].reindex(dnis_rep).fillna(0).to_numpy()
+    df_rep.rename(columns={col_n_p: "TRABAJADOR"}, inplace=True)
+    return df_rep[COLUMNAS_REPORTE]
+
 def mostrar(dfs):
     st.markdown("<h2 style='color: #4A0000;'>🏖️ Reporte de Saldo de Vacaciones</h2>", unsafe_allow_html=True)
     
     df_per = dfs.get("PERSONAL", pd.DataFrame())
-    df_gen = dfs.get("DATOS GENERALES", pd.DataFrame())
-    df_cont = dfs.get("CONTRATOS", pd.DataFrame())
     df_vac = dfs.get("VACACIONES", pd.DataFrame())
     
     if df_per.empty:
         st.warning("⚠️ Faltan datos en Personal para generar este reporte.")
     else:
-        # 1. Preparar la base (DNI y Nombres)
-        df_per_calc = df_per.copy()
-        df_per_calc.columns = [str(c).upper().strip() for c in df_per_calc.columns]
-        df_per_calc["DNI"] = df_per_calc["DNI"].astype(str).str.strip().str.replace(".0", "", regex=False).str.zfill(8)
-        col_n_p = next((c for c in df_per_calc.columns if "APELLIDO" in c or "NOMBRE" in c), "TRABAJADOR")
-        
-        df_rep = df_per_calc[["DNI", col_n_p]].copy()
-        
-        # 2. Obtener SEDE (De Datos Generales)
-        if not df_gen.empty:
-            df_g_calc = df_gen.copy()
-            df_g_calc.columns = [str(c).upper().strip() for c in df_g_calc.columns]
-            df_g_calc["DNI"] = df_g_calc["DNI"].astype(str).str.strip().str.replace(".0", "", regex=False).str.zfill(8)
-            if "SEDE" in df_g_calc.columns:
-                df_rep = df_rep.merge(df_g_calc[["DNI", "SEDE"]].drop_duplicates("DNI"), on="DNI", how="left")
-        
-        # 3. Obtener AREA (De Contratos - Tomando el más reciente)
-        if not df_cont.empty:
-            df_c_calc = df_cont.copy()
-            # Quitamos tildes a las columnas por si acaso dice "ÁREA"
-            df_c_calc.columns = [str(c).upper().strip().replace("Á", "A") for c in df_c_calc.columns]
-            df_c_calc["DNI"] = df_c_calc["DNI"].astype(str).str.strip().str.replace(".0", "", regex=False).str.zfill(8)
-            
-            if "AREA" in df_c_calc.columns:
-                # Sort index descending asume que los últimos agregados están al final, así tomamos el área actual
-                df_area = df_c_calc.sort_index(ascending=False).drop_duplicates("DNI")[["DNI", "AREA"]]
-                df_rep = df_rep.merge(df_area, on="DNI", how="left")
+        df_rep = tabla_saldos(dfs)
         
-        # Limpiar columnas y forzar mayúsculas
-        if "SEDE" not in df_rep.columns: df_rep["SEDE"] = "NO REGISTRADA"
-        if "AREA" not in df_rep.columns: df_rep["AREA"] = "NO REGISTRADA"
-        
-        df_rep["SEDE"] = df_rep["SEDE"].fillna("NO REGISTRADA").astype(str).str.upper()
-        df_rep["AREA"] = df_rep["AREA"].fillna("NO REGISTRADA").astype(str).str.upper()
-        
-        # 4. FILTROS VISUALES
+        # FILTROS VISUALES
         st.markdown("### 🔍 Filtros")
         c1, c2 = st.columns(2)
         with c1:
@@ -67,79 +85,36 @@ def mostrar(dfs):
         if sel_sede != "TODAS": df_rep = df_rep[df_rep["SEDE"] == sel_sede]
         if sel_area != "TODAS": df_rep = df_rep[df_rep["AREA"] == sel_area]
         
-        saldos_finales = []
-        
-        # 5. Cálculo del Saldo de Vacaciones para los DNI filtrados
-        for dni in df_rep["DNI"]:
-            dni_str = str(dni).strip()
-            dias_generados_totales = 0
-            dias_gozados_totales = 0
-            
-            # --- A. Dias Gozados ---
-            if not df_vac.empty:
-                v_df = df_vac.copy()
-                v_df.columns = [str(c).upper().strip() for c in v_df.columns]
-                v_df["DNI"] = v_df["DNI"].astype(str).str.strip().str.replace(".0", "", regex=False).str.zfill(8)
-                v_df_filtro = v_df[v_df["DNI"] == dni_str]
-                
-                if not v_df_filtro.empty:
-                    col_goz = next((c for c in v_df_filtro.columns if "GOZADO" in c), None)
-                    if col_goz:
-                        dias_gozados_totales = pd.to_numeric(v_df_filtro[col_goz], errors='coerce').sum()
-
-            # --- B. Días Generados (Contratos Planilla) ---
-            if not df_cont.empty:
-                c_df = df_cont.copy()
-                c_df.columns = [str(c).upper().strip() for c in c_df.columns]
-                c_df["DNI"] = c_df["DNI"].astype(str).str.strip().str.replace(".0", "", regex=False).str.zfill(8)
-                c_df_filtro = c_df[c_df["DNI"] == dni_str]
-                
-                if not c_df_filtro.empty and "TIPO CONTRATO" in c_df_filtro.columns:
-                    df_tc = c_df_filtro[c_df_filtro["TIPO CONTRATO"].astype(str).str.upper().str.contains("PLANILLA", na=False)]
-                    
-                    if not df_tc.empty and "F_INICIO" in df_tc.columns:
-                        df_tc['F_INICIO_DT'] = pd.to_datetime(df_tc['F_INICIO'], errors='coerce')
-                        start_global = df_tc['F_INICIO_DT'].min()
-                        
-                        if pd.notnull(start_global):
-                            curr_start = start_global.date()
-                            while curr_start <= date.today():
-                                curr_end = (pd.to_datetime(curr_start) + pd.DateOffset(years=1) - pd.Timedelta(days=1)).date()
-                                days_in_p = 0
-                                for _, r in df_tc.iterrows():
-                                    c_s = r['F_INICIO_DT'].date() if pd.notnull(r['F_INICIO_DT']) else None
-                                    c_e_val = r.get('F_FIN')
-                                    c_e = pd.to_datetime(c_e_val, errors='coerce').date() if pd.notnull(c_e_val) else date.today()
-                                    
-                                    if c_s:
-                                        o_s, o_e = max(curr_start, c_s), min(curr_end, c_e, date.today())
-                                        if o_s <= o_e: days_in_p += (o_e - o_s).days + 1
-                                
-                                total_days = (curr_end - curr_start).days + 1
-                                gen_p = (days_in_p / total_days) * 30
-                                dias_generados_totales += gen_p
-                                curr_start = (pd.to_datetime(curr_start) + pd.DateOffset(years=1)).date()
-            
-            # --- C. Saldo ---
-            saldo = round(dias_generados_totales - dias_gozados_totales, 2)
-            saldos_finales.append(saldo)
-        
-        # 6. Agregar resultados y mostrar
-        df_rep["SALDO DE VACACIONES"] = saldos_finales
-        df_rep.rename(columns={col_n_p: "TRABAJADOR"}, inplace=True)
-        
         st.success(f"📋 **Resultados:** {len(df_rep)} registros calculados con éxito.")
-        st.dataframe(df_rep[["DNI", "TRABAJADOR", "SEDE", "AREA", "SALDO DE VACACIONES"]], hide_index=True, use_container_width=True)
+        st.dataframe(df_rep, hide_index=True, use_container_width=True)
         
-        # 7. Exportar a Excel
-        output_vac = BytesIO()
-        with pd.ExcelWriter(output_vac, engine='openpyxl') as writer:
-            df_rep[["DNI", "TRABAJADOR", "SEDE", "AREA", "SALDO DE VACACIONES"]].to_excel(writer, index=False, sheet_name='Saldos_Vacaciones')
-        st.download_button(
-            label="📥 Exportar a Excel", 
-            data=output_vac.getvalue(), 
-            file_name="Reporte_Saldos_Vacaciones.xlsx", 
-            mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-            key="btn_exp_vac_nuevo",
-            type="primary"
-        )
+        # Exportar (el archivo se arma recién al pulsarlo; el saldo cambia con el día)
+        mod_exportar.boton_exportar(df_rep, "vacaciones",
+                                    {"sede": sel_sede, "area": sel_area, "hoy": date.today()},
+                                    mod_exportar.version_datos(dfs, HOJAS_REQUERIDAS),
+                                    "Reporte_Saldos_Vacaciones", hoja="Saldos_Vacaciones", key="btn_exp_vac_nuevo")
+
+        # Papeletas de todos los registros de un periodo (plantilla compilada una vez en mod_papeletas)
+        v_df = mod_esquema.tipada(dfs, "VACACIONES") if not df_vac.empty else pd.DataFrame()
+        if not v_df.empty and "periodo" in v_df.columns:
+            st.markdown("### 🖨️ Papeletas del Periodo")
+            periodos = sorted({str(p).strip() for p in v_df["periodo"].dropna() if str(p).strip()}, reverse=True)
+            sel_periodo = st.selectbox("PERIODO", periodos, key="papeletas_periodo")
+            registros = mod_papeletas.registros_periodo(dfs, sel_periodo) if sel_periodo else pd.DataFrame()
+            st.caption(f"{len(registros)} registros de vacaciones con fechas válidas en el periodo.")
+            if st.button("📦 Generar Papeletas (ZIP)", disabled=registros.empty, key="btn_papeletas_lote"):
+                if not os.path.exists(mod_papeletas.PLANTILLA):
+                    st.error(f"⚠️ No se encontró la plantilla en: {mod_papeletas.PLANTILLA}.")
+                else:
+                    barra = st.progress(0.0)
+                    destino = BytesIO()
+                    mod_papeletas.lote_zip(registros, destino, al_avanzar=lambda hechos, total: barra.progress(hechos / total))
+                    st.session_state["papeletas_zip"] = (sel_periodo, destino.getvalue())
+            if st.session_state.get("papeletas_zip", (None,))[0] == sel_periodo:
+                st.download_button(
+                    label="📥 Descargar Papeletas",
+                    data=st.session_state["papeletas_zip"][1],
+                    file_name=f"Papeletas_{sel_periodo}.zip",
+                    mime="application/zip",
+                    key="btn_papeletas_descargar"
+                )
@@ -0,0 +1,241 @@
+# ==========================================
+# TAREAS SIN INTERFAZ (LÍNEA DE COMANDOS)
+# ==========================================
+# Los reportes y documentos pesados sin abrir la app ni tener una sesión de Streamlit: se conecta al
+# almacenamiento configurado (mod_almacenamiento), arma las tablas con las mismas funciones puras que
+# usan las pantallas (tabla_* de cada reporte) y escribe los archivos en disco. Sirve para dejar
+# precalculado de noche lo que Gerencia pide por la mañana.
+#
+# Uso:
+#   python tareas.py paquete [--fecha 2026-10-31] [--salida reportes/]
+#   python tareas.py reporte general vencimientos [--formato csv] [--salida reportes/]
+#   python tareas.py reporte todos --formato parquet
+#   python tareas.py certificados [--sede "LOCAL LINCE"] [--hasta 2026-12-31] [--dni 12345678 ...]
+#   python tareas.py papeletas --periodo 2025-2026
+#   python tareas.py --backend xlsx reporte todos          (libro local DB_SISTEMA_GTH.xlsx)
+#
+# Por ejemplo en cron, todas las noches a las 2:
+#   0 2 * * *  cd /srv/gth && python tareas.py reporte todos --salida /srv/gth/reportes
+#
+# Configuración (las mismas variables GTH_* que lee la app):
+#   GTH_BACKEND            sheets | xlsx | sqlite (por defecto sheets)
+#   GTH_RUTA_XLSX / GTH_RUTA_SQLITE
+#   GTH_GOOGLE_JSON        JSON de la cuenta de servicio; si no está, se usa credenciales.json
+#   GTH_CUOTA_POR_MINUTO   peticiones por minuto a Sheets
+import argparse
+import os
+import sys
+import time
+from datetime import date
+
+CARPETA = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(CARPETA)
+
+import mod_almacenamiento
+import mod_cache_hojas
+import mod_certificados
+import mod_cuota
+import mod_exportar
+import mod_ficha
+import mod_paquete
+import mod_papeletas
+import repcertificados
+import repcumpleanos
+import reportegeneral
+import repvacaciones
+import repvencimientos
+
+# Tipos de documento por nombre corto (el mismo orden de mod_ficha.OPCIONES_CERTIFICADO)
+TIPOS_CERTIFICADO = dict(zip(
+    ["automatico", "planilla-administrativo", "locacion-administrativo", "planilla-docente", "locacion-docente"],
+    mod_ficha.OPCIONES_CERTIFICADO,
+))
+
+# Formato por extensión (mod_exportar.FORMATOS va por nombre: Excel, CSV, Parquet)
+FORMATOS = {extension: nombre for nombre, (extension, _) in mod_exportar.FORMATOS.items()}
+
+
+def obtener_credenciales():
+    return mod_almacenamiento.credenciales_servicio(os.environ.get("GTH_GOOGLE_JSON"))
+
+
+def abrir_libro(args):
+    """LibroDatos sobre el backend elegido: las pestañas se traen juntas y las vistas se comparten."""
+    cuota = os.environ.get("GTH_CUOTA_POR_MINUTO")
+    if cuota:
+        mod_cuota.configurar(int(cuota))
+    backend = mod_almacenamiento.crear_backend(
+        args.backend,
+        obtener_credenciales=obtener_credenciales,
+        nombre_libro=mod_almacenamiento.NOMBRE_LIBRO,
+        ruta_xlsx=args.ruta_xlsx,
+        ruta_sqlite=args.ruta_sqlite,
+    )
+    return mod_cache_hojas.libro_directo(backend, al_error=lambda titulo, error: print(f"⚠️ Error en {titulo}: {error}", file=sys.stderr))
+
+
+def _escribir(ruta, datos):
+    os.makedirs(os.path.dirname(ruta) or ".", exist_ok=True)
+    with open(ruta, "wb") as f:
+        f.write(datos)
+    print(f"✅ {ruta} ({len(datos) / 1024:.0f} KB)")
+
+
+def _avance(hechos, total):
+    print(f"\r   {hechos} de {total}", end="\n" if hechos == total else "", flush=True)
+
+
+# ==========================================
+# REPORTES: nombre -> (pestañas, archivo, función que devuelve {hoja: DataFrame})
+# ==========================================
+def _dashboard(dfs, args):
+    # plotly solo hace falta para las gráficas de la pantalla, pero mod_reportes lo importa al cargarse
+    import mod_reportes
+    return mod_reportes.tablas_dashboard(dfs)
+
+
+REPORTES = {
+    "general": (reportegeneral.HOJAS_REQUERIDAS, "Reporte_General",
+                lambda dfs, args: {"General": reportegeneral.tabla_general(dfs, None if args.todos_estados else ("ACTIVO",))}),
+    "vencimientos": (repvencimientos.HOJAS_REQUERIDAS, "Reporte_Vencimientos",
+                     lambda dfs, args: {"Vencimientos": repvencimientos.tabla_reporte(repvencimientos.tabla_vencimientos(dfs))}),
+    "vacaciones": (repvacaciones.HOJAS_REQUERIDAS, "Reporte_Saldos_Vacaciones",
+                   lambda dfs, args: {"Saldos_Vacaciones": repvacaciones.tabla_saldos(dfs, args.fecha)}),
+    "cumpleanos": (repcumpleanos.HOJAS_REQUERIDAS, "Reporte_Cumpleañeros",
+                   lambda dfs, args: {"Cumpleañeros": repcumpleanos.tabla_reporte(dfs, args.mes, args.fecha.year)}),
+    "dashboard": (["EVALUACIONES"], "Dashboard_Desempeno", _dashboard),
+}
+
+
+def cmd_reporte(args):
+    nombres = list(REPORTES) if "todos" in args.reportes else list(dict.fromkeys(args.reportes))
+    dfs = abrir_libro(args)
+    # Todas las pestañas de los reportes pedidos en una sola descarga
+    dfs.precargar(sorted({h for n in nombres for h in REPORTES[n][0]}))
+    formato = FORMATOS[args.formato]
+    sufijo = args.fecha.strftime("%Y%m%d")
+    fallidos = []
+    for nombre in nombres:
+        _, archivo, construir = REPORTES[nombre]
+        t0 = time.perf_counter()
+        # Un reporte que falla no detiene a los demás (en cron se ve en el código de salida)
+        try:
+            hojas = construir(dfs, args)
+        except Exception as e:
+            print(f"⚠️ {nombre}: {e}", file=sys.stderr)
+            fallidos.append(nombre)
+            continue
+        if not hojas:
+            print(f"⚠️ {nombre}: sin datos", file=sys.stderr)
+            continue
+        if formato == "Excel":
+            _escribir(os.path.join(args.salida, f"{archivo}_{sufijo}.xlsx"), mod_exportar.hojas_excel(hojas))
+        else:
+            # CSV y Parquet tienen una sola tabla: un archivo por hoja
+            for hoja, df in hojas.items():
+                base = archivo if len(hojas) == 1 else f"{archivo}_{hoja}"
+                _escribir(os.path.join(args.salida, f"{base}_{sufijo}.{args.formato}"), mod_exportar.convertir(df, formato, hoja))
+        print(f"   {nombre}: {sum(len(df) for df in hojas.values())} filas en {time.perf_counter() - t0:.1f} s")
+    return 1 if fallidos else 0
+
+
+def cmd_paquete(args):
+    dfs = abrir_libro(args)
+    t0 = time.perf_counter()
+    hojas = mod_paquete.tablas(dfs, args.fecha, estados=None if args.todos_estados else ("ACTIVO",))
+    for nombre, df in hojas.items():
+        print(f"   {nombre:<20}{len(df):>7} filas")
+    _escribir(os.path.join(args.salida, mod_paquete.nombre_archivo(args.fecha)), mod_exportar.hojas_excel(hojas))
+    print(f"   listo en {time.perf_counter() - t0:.1f} s")
+
+
+def cmd_certificados(args):
+    dfs = abrir_libro(args)
+    dfs.precargar(repcertificados.HOJAS_REQUERIDAS)
+    seleccion = mod_certificados.cohorte(dfs, dnis=args.dni, sede=args.sede, area=args.area,
+                                         fin_desde=args.desde, fin_hasta=args.hasta)
+    if not seleccion:
+        print("⚠️ Ningún colaborador con contratos cumple la selección.", file=sys.stderr)
+        return 1
+    print(f"   {len(seleccion)} colaboradores")
+    tareas = mod_certificados.tareas_lote(dfs, seleccion, TIPOS_CERTIFICADO[args.tipo], args.fecha)
+    ruta = os.path.join(args.salida, f"Certificados_{args.fecha.strftime('%Y%m%d')}.zip")
+    os.makedirs(args.salida, exist_ok=True)
+    t0 = time.perf_counter()
+    mod_certificados.lote_zip(tareas, ruta, procesos=args.procesos, al_avanzar=_avance)
+    print(f"✅ {ruta} en {time.perf_counter() - t0:.1f} s")
+
+
+def cmd_papeletas(args):
+    if not os.path.exists(mod_papeletas.PLANTILLA):
+        print(f"⚠️ No se encontró la plantilla en: {mod_papeletas.PLANTILLA}.", file=sys.stderr)
+        return 1
+    dfs = abrir_libro(args)
+    dfs.precargar(["PERSONAL", "CONTRATOS", "VACACIONES"])
+    registros = mod_papeletas.registros_periodo(dfs, args.periodo)
+    if registros.empty:
+        print(f"⚠️ No hay registros de vacaciones con fechas válidas en el periodo {args.periodo}.", file=sys.stderr)
+        return 1
+    ruta = os.path.join(args.salida, f"Papeletas_{args.periodo}.zip")
+    os.makedirs(args.salida, exist_ok=True)
+    t0 = time.perf_counter()
+    mod_papeletas.lote_zip(registros, ruta, hoy=args.fecha, al_avanzar=_avance)
+    print(f"✅ {ruta} en {time.perf_counter() - t0:.1f} s")
+
+
+# ==========================================
+# ARGUMENTOS
+# ==========================================
+def _fecha(texto):
+    return date.fromisoformat(texto)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Reportes y documentos de GTH sin abrir la app.")
+    parser.add_argument("--backend", default=os.environ.get("GTH_BACKEND", mod_almacenamiento.BACKEND_POR_DEFECTO),
+                        help="sheets, xlsx o sqlite")
+    parser.add_argument("--ruta-xlsx", default=os.environ.get("GTH_RUTA_XLSX", mod_almacenamiento.RUTA_XLSX))
+    parser.add_argument("--ruta-sqlite", default=os.environ.get("GTH_RUTA_SQLITE", mod_almacenamiento.RUTA_SQLITE))
+    sub = parser.add_subparsers(dest="comando", required=True)
+
+    comun = argparse.ArgumentParser(add_help=False)
+    comun.add_argument("--fecha", type=_fecha, default=date.today(), help="fecha de corte / emisión AAAA-MM-DD (por defecto hoy)")
+    comun.add_argument("--salida", default=".", help="carpeta de destino")
+
+    p = sub.add_parser("reporte", parents=[comun], help="Reportes como archivos (Excel, CSV o Parquet)")
+    p.add_argument("reportes", nargs="+", choices=list(REPORTES) + ["todos"])
+    p.add_argument("--formato", choices=list(FORMATOS), default="xlsx")
+    p.add_argument("--todos-estados", action="store_true", help="Reporte General con todos los estados (por defecto solo ACTIVO)")
+    p.add_argument("--mes", type=int, nargs="*", choices=range(1, 13), help="cumpleañeros solo de estos meses (1-12)")
+    p.set_defaults(funcion=cmd_reporte)
+
+    p = sub.add_parser("paquete", parents=[comun], help="Paquete mensual: General, Vencimientos, Saldos de Vacaciones y Cumpleañeros en un Excel")
+    p.add_argument("--todos-estados", action="store_true", help="Reporte General con todos los estados (por defecto solo ACTIVO)")
+    p.set_defaults(funcion=cmd_paquete)
+
+    p = sub.add_parser("certificados", parents=[comun], help="Certificados y constancias en lote (ZIP)")
+    p.add_argument("--dni", nargs="*", help="DNI de los colaboradores (por defecto todos los que cumplan los filtros)")
+    p.add_argument("--sede")
+    p.add_argument("--area")
+    p.add_argument("--desde", type=_fecha, help="fin de contrato desde AAAA-MM-DD")
+    p.add_argument("--hasta", type=_fecha, help="fin de contrato hasta AAAA-MM-DD")
+    p.add_argument("--tipo", choices=list(TIPOS_CERTIFICADO), default="automatico")
+    p.add_argument("--procesos", type=int, help="procesos de trabajo (por defecto uno por CPU)")
+    p.set_defaults(funcion=cmd_certificados)
+
+    p = sub.add_parser("papeletas", parents=[comun], help="Papeletas de vacaciones de un periodo (ZIP)")
+    p.add_argument("--periodo", required=True)
+    p.set_defaults(funcion=cmd_papeletas)
+
+    args = parser.parse_args(argv)
+    # Las imágenes y plantillas (header.png, Template_Papeleta.docx) se buscan junto a la app,
+    # así que las rutas del usuario se fijan antes de cambiar de carpeta
+    for ruta in ("salida", "ruta_xlsx", "ruta_sqlite"):
+        if getattr(args, ruta, None):
+            setattr(args, ruta, os.path.abspath(getattr(args, ruta)))
+    os.chdir(CARPETA)
+    return args.funcion(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
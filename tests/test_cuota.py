@@ -0,0 +1,95 @@
+import os
+import sys
+
+import pytest
+import requests
+from gspread.exceptions import APIError
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import mod_cuota
+
+
+@pytest.mark.parametrize("error", [
+    requests.exceptions.ConnectionError("conexión reiniciada"),
+    requests.exceptions.ReadTimeout("tiempo agotado"),
+    requests.exceptions.ConnectTimeout("tiempo agotado"),
+    ConnectionError(),
+    TimeoutError(),
+])
+def test_errores_de_red_son_reintentables(error):
+    assert mod_cuota.es_reintentable(error)
+
+
+@pytest.mark.parametrize("error", [ValueError(), KeyError("x"), requests.exceptions.InvalidURL("url")])
+def test_otros_errores_no_se_reintentan(error):
+    assert not mod_cuota.es_reintentable(error)
+
+
+def test_planificador_reintenta_un_corte_de_requests():
+    planificador = mod_cuota.Planificador(por_minuto=600, espera_base=0, espera_maxima=0)
+    intentos = []
+
+    def operacion():
+        intentos.append(1)
+        if len(intentos) < 3:
+            raise requests.exceptions.ConnectionError("conexión reiniciada")
+        return "ok"
+
+    assert planificador.ejecutar(operacion) == "ok"
+    assert len(intentos) == 3
+    assert planificador.metricas()["reintentos"] == 2
+
+
+class RespuestaError:
+    def __init__(self, codigo):
+        self.status_code = codigo
+        self.text = ""
+
+    def json(self):
+        return {"error": {"code": self.status_code, "message": "error", "status": "ERROR"}}
+
+
+def _conexion_rechazada():
+    try:
+        requests.get("http://127.0.0.1:1", timeout=1)
+    except requests.exceptions.ConnectionError as e:
+        return e
+
+
+@pytest.mark.parametrize("error,repetir", [
+    (APIError(RespuestaError(429)), True),
+    (_conexion_rechazada(), True),
+    (APIError(RespuestaError(503)), False),
+    (requests.exceptions.ReadTimeout("tiempo agotado"), False),
+    (requests.exceptions.ConnectionError("conexión reiniciada"), False),
+])
+def test_escritura_solo_se_repite_si_no_llego(error, repetir):
+    planificador = mod_cuota.Planificador(por_minuto=600, espera_base=0, espera_maxima=0)
+    intentos = []
+
+    def operacion():
+        intentos.append(1)
+        if len(intentos) < 2:
+            raise error
+        return "ok"
+
+    if repetir:
+        assert planificador.ejecutar(operacion, idempotente=False) == "ok"
+        assert len(intentos) == 2
+    else:
+        with pytest.raises(type(error)):
+            planificador.ejecutar(operacion, idempotente=False)
+        assert len(intentos) == 1
+
+
+def test_cliente_http_solo_reintenta_lecturas(monkeypatch):
+    llamadas = []
+    monkeypatch.setattr(mod_cuota, "PLANIFICADOR", mod_cuota.Planificador(por_minuto=600))
+    monkeypatch.setattr(mod_cuota.PLANIFICADOR, "ejecutar",
+                        lambda operacion, nivel=None, idempotente=True: llamadas.append(idempotente))
+    cliente = mod_cuota.HTTPClientConCuota.__new__(mod_cuota.HTTPClientConCuota)
+    cliente.request("get", "https://sheets/valores")
+    cliente.request("post", "https://sheets/valores:append")
+    cliente.request(method="put", endpoint="https://sheets/valores")
+    assert llamadas == [True, False, False]
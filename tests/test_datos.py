@@ -0,0 +1,133 @@
+import os
+import sys
+
+import pandas as pd
+import pytest
+from gspread.utils import a1_to_rowcol
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import mod_datos
+
+TITULO = "PRUEBA DELTA"
+
+
+class HojaFalsa:
+    """Worksheet que guarda sus filas en memoria y anota cada petición que recibe."""
+
+    id = 7
+
+    def __init__(self, falla_en=None):
+        self.filas = []
+        self.peticiones = []
+        self.falla_en = falla_en
+
+    def _anotar(self, tipo, dato):
+        self.peticiones.append((tipo, dato))
+        if tipo == self.falla_en:
+            raise TimeoutError("sin respuesta")
+
+    def _poner(self, fila, col, valores):
+        while len(self.filas) < fila:
+            self.filas.append([])
+        destino = self.filas[fila - 1]
+        destino.extend([""] * (col - 1 + len(valores) - len(destino)))
+        destino[col - 1:col - 1 + len(valores)] = valores
+
+    # --- API de gspread que usa mod_datos ---
+    def col_values(self, col):
+        self._anotar("leer columna", col)
+        return mod_datos._columna_a(self.filas)
+
+    def clear(self):
+        self._anotar("limpiar", None)
+        self.filas = []
+
+    def update(self, matriz):
+        self._anotar("reescribir", len(matriz))
+        self.filas = [list(f) for f in matriz]
+
+    def batch_update(self, datos, value_input_option=None):
+        self._anotar("celdas", [d["range"] for d in datos])
+        for d in datos:
+            fila, col = a1_to_rowcol(d["range"].split(":")[0])
+            self._poner(fila, col, d["values"][0])
+
+    def append_rows(self, filas, value_input_option=None, insert_data_option=None, table_range=None):
+        self._anotar("anexar", (insert_data_option, table_range, len(filas)))
+        despues_de = a1_to_rowcol(table_range)[0]
+        self.filas[despues_de:despues_de] = [list(f) for f in filas]
+
+
+class LibroFalso:
+    def __init__(self, hoja):
+        self.hoja = hoja
+
+    def batch_update(self, cuerpo):
+        self.hoja._anotar("estructura", [next(iter(p)) for p in cuerpo["requests"]])
+        for p in cuerpo["requests"]:
+            op, datos = next(iter(p.items()))
+            ini, fin = datos["range"]["startIndex"], datos["range"]["endIndex"]
+            if op == "deleteDimension":
+                del self.hoja.filas[ini:fin]
+            else:
+                self.hoja.filas[ini:ini] = [[] for _ in range(fin - ini)]
+
+
+def _personas(*dnis):
+    return pd.DataFrame({"dni": list(dnis), "nombre": [f"N{d}" for d in dnis]})
+
+
+@pytest.fixture
+def hoja():
+    mod_datos.olvidar_instantanea(TITULO)
+    hoja = HojaFalsa()
+    # Primer guardado sin foto: reescritura completa, y queda la foto
+    mod_datos.guardar_hoja(LibroFalso(hoja), TITULO, _personas("1", "2", "3", "4"), hoja)
+    hoja.peticiones.clear()
+    yield hoja
+    mod_datos.olvidar_instantanea(TITULO)
+
+
+def _guardar(hoja, df):
+    mod_datos.guardar_hoja(LibroFalso(hoja), TITULO, df, hoja)
+    assert mod_datos._rellenar(hoja.filas) == mod_datos.matriz_para_guardar(df)
+    return [tipo for tipo, _ in hoja.peticiones]
+
+
+def test_insertar_en_medio(hoja):
+    assert _guardar(hoja, _personas("1", "2", "9", "3", "4")) == ["leer columna", "estructura", "celdas"]
+    assert hoja.peticiones[1][1] == ["insertDimension"]
+
+
+def test_borrar_en_medio(hoja):
+    assert _guardar(hoja, _personas("1", "3", "4")) == ["leer columna", "estructura"]
+    assert hoja.peticiones[1][1] == ["deleteDimension"]
+
+
+def test_anexar_al_final(hoja):
+    assert _guardar(hoja, _personas("1", "2", "3", "4", "5", "6")) == ["leer columna", "anexar"]
+    # Inserta filas detrás de la última fila conocida, no donde Sheets crea que termina la tabla
+    assert hoja.peticiones[1][1] == ("INSERT_ROWS", "A5", 2)
+
+
+def test_cambio_de_columnas_reescribe_todo(hoja):
+    df = _personas("1", "2", "3", "4").assign(area="TI")
+    assert _guardar(hoja, df) == ["limpiar", "reescribir"]
+
+
+def test_hoja_editada_fuera_reescribe_todo(hoja):
+    # Alguien borró una fila a mano en Sheets: la foto ya no vale y el delta borraría a otra persona
+    del hoja.filas[2]
+    assert _guardar(hoja, _personas("1", "3", "4")) == ["leer columna", "limpiar", "reescribir"]
+
+
+def test_fallo_olvida_la_foto(hoja):
+    hoja.falla_en = "estructura"
+    with pytest.raises(TimeoutError):
+        mod_datos.guardar_hoja(LibroFalso(hoja), TITULO, _personas("1", "3", "4"), hoja)
+    assert mod_datos.obtener_instantanea(TITULO) is None
+
+    hoja.falla_en = None
+    hoja.peticiones.clear()
+    assert _guardar(hoja, _personas("1", "3", "4")) == ["limpiar", "reescribir"]
@@ -0,0 +1,50 @@
+import os
+import sys
+
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import mod_escritura
+
+
+class BackendQueFalla:
+    """Falla las primeras `fallos` escrituras con un error que no se reintenta dentro del lote."""
+
+    def __init__(self, fallos):
+        self.fallos = fallos
+        self.guardados = []
+
+    def guardar(self, dfs, pestana_especifica=None):
+        if self.fallos:
+            self.fallos -= 1
+            raise ValueError("sin conexión")
+        self.guardados.append({t: df.copy() for t, df in dfs.items()})
+
+
+def test_lote_fallido_vuelve_a_la_cola_y_se_guarda_despues():
+    backend = BackendQueFalla(fallos=1)
+    cola = mod_escritura.ColaEscritura(backend, espera_agrupar=0, espera_tras_fallo=0.2)
+    cola.encolar({"PERSONAL": pd.DataFrame({"dni": ["1"]})}, "PERSONAL")
+
+    # El primer intento falla, el lote vuelve a la cola y el siguiente lo escribe: nada se pierde
+    assert cola.vaciar(timeout=5)
+    assert len(backend.guardados) == 1
+    assert backend.guardados[0]["PERSONAL"]["dni"].tolist() == ["1"]
+    assert cola.estado()["ultimo_error"] is None
+
+
+def test_version_mas_nueva_gana_al_reencolar():
+    backend = BackendQueFalla(fallos=1)
+    cola = mod_escritura.ColaEscritura(backend, espera_agrupar=0, espera_tras_fallo=0.5)
+    cola.encolar({"PERSONAL": pd.DataFrame({"dni": ["1"]})}, "PERSONAL")
+    # Esperar a que el primer intento falle y el lote vuelva a la cola
+    for _ in range(100):
+        if cola.estado()["ultimo_error"]:
+            break
+        mod_escritura.time.sleep(0.01)
+    assert cola.estado()["pendientes"] == ["PERSONAL"]
+    cola.encolar({"PERSONAL": pd.DataFrame({"dni": ["1", "2"]})}, "PERSONAL")
+
+    assert cola.vaciar(timeout=5)
+    assert backend.guardados[-1]["PERSONAL"]["dni"].tolist() == ["1", "2"]
@@ -0,0 +1,27 @@
+import os
+import sys
+from datetime import date
+
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import mod_vacaciones
+
+HOY = date(2026, 10, 18)
+
+
+def test_saldo_suma_los_periodos_sin_redondear():
+    # Dos periodos con 102 de 365 días cubiertos: 8.3836... cada uno
+    contratos = pd.DataFrame({
+        "dni": ["1", "1"],
+        "f_inicio": pd.to_datetime(["2022-01-01", "2023-01-01"]),
+        "f_fin": pd.to_datetime(["2022-04-12", "2023-04-12"]),
+        "tipo contrato": "Planilla",
+    })
+    vacaciones = pd.DataFrame({"dni": ["1"], "periodo": ["2022-2023"], "dias gozados": [0]})
+    detalle, totales = mod_vacaciones.calcular(contratos, vacaciones, HOY)
+
+    # El detalle se redondea por periodo; el saldo redondea solo el total (16.767 -> 16.77, no 8.38 + 8.38)
+    assert detalle["generados"].tolist()[:2] == [8.38, 8.38]
+    assert totales.loc["1", "saldo"] == 16.77